@@ -1,8 +1,10 @@
 import logging
+from typing import Optional
 
 from .syntax_tree import SyntaxTree
 from .config import Config
 from .parser import parse as parse_sql
+from .checker import Budget
 from .checker import check as check_sql
 from .formatter import format as format_sql
 
@@ -33,9 +35,17 @@ def parse(sql: str):
     logger.info(tokens_list)
 
 
-def check(sql: str):
+def check(sql: str, max_violations: Optional[int] = None, fail_fast: bool = False):
+    """Prints violations in sql statement
+
+    Args:
+        sql: sql statement
+        max_violations: the number of violations checking is stopped after
+        fail_fast: If this is True, checking is stopped at the first violation.
+    """
     tree = SyntaxTree.sqlptree(sql)
-    for v in sorted(check_sql(tree, Config())):
+    budget = Budget(1 if fail_fast else max_violations)
+    for v in sorted(check_sql(tree, Config(), budget)):
         logger.info(v)
 
 
@@ -0,0 +1,138 @@
+import hashlib
+import os
+import sys
+from array import array
+from typing import Dict, List, Optional, Set
+
+from .checker import Violation
+
+# header of baseline file
+MAGIC = b'SQLINTB1'
+
+
+def fingerprint(violations: List[Violation], occurrences: Optional[Dict[str, int]] = None) -> List[str]:
+    """Returns fingerprints of violations in a file.
+
+    Fingerprint is made from code, normalized text of the line and occurrence counter of them,
+    so that it stays stable when lines are shifted by editing other lines.
+
+    Args:
+        violations: sorted violations in a file
+        occurrences: occurrence counters which are carried over, when violations of a file are passed
+                     in several calls. (e.g. streaming mode)
+
+    Returns:
+        fingerprints corresponding to violations
+    """
+
+    result: List[str] = []
+    if occurrences is None:
+        occurrences = {}
+
+    for v in violations:
+        # normalizes whitespaces, which are often modified by formatting
+        text = ' '.join(v.tree.text.split())
+        source = f'{v.code.code}\0{text}'
+        occurrence = occurrences.get(source, 0)
+        occurrences[source] = occurrence + 1
+
+        result.append(
+            hashlib.blake2b(f'{source}\0{occurrence}'.encode('utf-8'), digest_size=8).hexdigest())
+
+    return result
+
+
+class Baseline:
+    """Set of known violations, which are not reported.
+
+    Each violation is stored as 64bit hash of file path and its fingerprint.
+    Baseline file consists of MAGIC header and sorted unsigned 64bit integers (little endian),
+    so that it is compact, stable for diff and loaded without parsing each entry.
+    """
+
+    def __init__(self, keys: Optional[Set[int]] = None):
+        if keys is None:
+            keys = set()
+
+        self.keys: Set[int] = keys
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    @staticmethod
+    def key(file: str, fingerprint: str) -> int:
+        """Returns key of the violation
+
+        Args:
+            file: path to the file
+            fingerprint: fingerprint of violation
+
+        Returns:
+            64bit hash value
+        """
+        path = os.path.normpath(file).replace(os.sep, '/')
+        digest = hashlib.blake2b(f'{path}\0{fingerprint}'.encode('utf-8'), digest_size=8).digest()
+
+        return int.from_bytes(digest, 'little')
+
+    def add(self, file: str, violations: List[Dict]):
+        """Adds violations of a file
+
+        Args:
+            file: path to the file
+            violations: violations having fingerprint
+        """
+        for v in violations:
+            self.keys.add(self.key(file, v['fingerprint']))
+
+    def filter(self, file: str, violations: List[Dict]) -> List[Dict]:
+        """Returns violations not in baseline
+
+        Args:
+            file: path to the file
+            violations: violations having fingerprint
+
+        Returns:
+            new violations
+        """
+        if not self.keys:
+            return violations
+
+        return [v for v in violations if self.key(file, v['fingerprint']) not in self.keys]
+
+    @classmethod
+    def load(cls, path: str) -> 'Baseline':
+        """Loads baseline file
+
+        Args:
+            path: path to the baseline file
+
+        Returns:
+            Baseline instance
+        """
+        with open(path, 'rb') as fp:
+            data = fp.read()
+
+        if not data.startswith(MAGIC):
+            raise ValueError(f'{path} is not sqlint baseline file')
+
+        keys = array('Q')
+        keys.frombytes(data[len(MAGIC):])
+        if sys.byteorder != 'little':
+            keys.byteswap()
+
+        return cls(set(keys))
+
+    def save(self, path: str):
+        """Writes baseline file
+
+        Args:
+            path: path to the baseline file
+        """
+        keys = array('Q', sorted(self.keys))
+        if sys.byteorder != 'little':
+            keys.byteswap()
+
+        with open(path, 'wb') as fp:
+            fp.write(MAGIC)
+            fp.write(keys.tobytes())
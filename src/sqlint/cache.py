@@ -0,0 +1,173 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+from typing import Dict, Iterator, List, Optional
+
+from . import __version__
+from .config import Config
+
+logger = logging.getLogger(__name__)
+
+# default limits of cache directory
+DEFAULT_MAX_AGE = 30 * 24 * 60 * 60  # seconds
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024  # bytes
+
+# suffix of cache entry files
+ENTRY_SUFFIX = '.json'
+# version of entry layout, which must be incremented when contents of entries are changed
+ENTRY_VERSION = 3
+
+# names of sub directories and entry files, which are the only files pruned in cache directory
+SUB_DIR_NAME = re.compile(r'[0-9a-f]{2}')
+ENTRY_NAME = re.compile(r'[0-9a-f]{64}' + re.escape(ENTRY_SUFFIX))
+
+
+class ResultCache:
+    """On-disk cache of checking and formatting results.
+
+    Each entry is a json file keyed by hash of (sqlint version, kind of result, effective config,
+    enabled rules, versions of plugins, file content). Entries are written to a temporary file and renamed atomically,
+    so cache directory can be shared by parallel workers and kept as CI artifact.
+
+    Layout:
+    ----
+    {cache_dir}/
+        {key[0:2]}/
+            {key}.json
+    ----
+    """
+
+    def __init__(self, cache_dir: str, config: Config, rules: List[str], plugins: Optional[List[str]] = None):
+        """
+
+        Args:
+            cache_dir: path to the cache directory
+            config: effective config
+            rules: names of enabled rules
+            plugins: names and versions of plugin distributions. e.g.) ['sqlint-shop==1.0.2']
+        """
+        if plugins is None:
+            plugins = []
+
+        self.cache_dir: str = cache_dir
+        self.salt: str = '\n'.join(
+            [__version__, str(ENTRY_VERSION), config.digest, ','.join(rules), ','.join(sorted(plugins))])
+
+    def key(self, sql: str, kind: str) -> str:
+        """Returns cache key of the result
+
+        Args:
+            sql: sql statement, which is content of file
+            kind: kind of result, 'check', 'format' or 'formatted' (fingerprint of sql which formatting does not change)
+
+        Returns:
+            cache key
+        """
+        content_hash = hashlib.sha256(sql.encode('utf-8')).hexdigest()
+
+        return hashlib.sha256(f'{self.salt}\n{kind}\n{content_hash}'.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[0:2], f'{key}{ENTRY_SUFFIX}')
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Returns cached result, or None if it is not cached
+
+        Args:
+            key: cache key
+
+        Returns:
+            cached result
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as fp:
+                value = json.load(fp)
+        except (OSError, ValueError):
+            # not cached, or broken entry which will be overwritten.
+            return None
+
+        # updates mtime to keep recently used entries in pruning
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        return value
+
+    def put(self, key: str, value: Dict):
+        """Stores result to cache
+
+        Args:
+            key: cache key
+            value: serializable result
+        """
+        path = self._path(key)
+        dir_name = os.path.dirname(path)
+
+        try:
+            os.makedirs(dir_name, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=dir_name, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as fp:
+                    json.dump(value, fp)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.remove(tmp_path)
+                raise
+        except OSError as e:
+            logger.warning(f'failed to write cache: {e}')
+
+    def prune(self, max_age: float = DEFAULT_MAX_AGE, max_size: int = DEFAULT_MAX_SIZE):
+        """Evicts stale entries
+
+        Entries older than max_age are removed, and then least recently used entries are removed
+        until total size becomes less than max_size. Only files in the layout of entries are removed,
+        so that other files in cache directory and temporary files written by other workers are kept.
+
+        Args:
+            max_age: max age of entries in seconds
+            max_size: max total size of entries in bytes
+        """
+        if not os.path.isdir(self.cache_dir):
+            return
+
+        now = time.time()
+        entries = []
+        for path in self._iter_entries():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                # removed by other worker
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        # older entries first
+        entries.sort()
+        total_size = sum([size for _, size, _ in entries])
+
+        for mtime, size, path in entries:
+            if now - mtime <= max_age and total_size <= max_size:
+                break
+
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total_size -= size
+
+    def _iter_entries(self) -> Iterator[str]:
+        """Yields paths of entry files, which are {cache_dir}/{key[0:2]}/{key}.json"""
+
+        for sub_dir in os.listdir(self.cache_dir):
+            sub_path = os.path.join(self.cache_dir, sub_dir)
+            if not SUB_DIR_NAME.fullmatch(sub_dir) or not os.path.isdir(sub_path):
+                continue
+
+            for name in os.listdir(sub_path):
+                if ENTRY_NAME.fullmatch(name) and name.startswith(sub_dir):
+                    yield os.path.join(sub_path, name)
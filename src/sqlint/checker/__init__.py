@@ -1,7 +1,22 @@
-from .base import check
-from .violation import Violation
+from .base import check, check_stream, get_checkers
+from .budget import Budget
+from .checker import Checker, TokenLocalChecker
+from .plugin import get_versions as get_plugin_versions
+from .plugin import register
+from .prefilter import Prefilter, SourceIndex
+from .violation import PluginCode, Violation
 
 __all__ = [
     'check',
+    'check_stream',
+    'get_checkers',
+    'get_plugin_versions',
+    'register',
+    'Budget',
+    'Checker',
+    'TokenLocalChecker',
+    'Prefilter',
+    'SourceIndex',
+    'PluginCode',
     'Violation'
 ]
@@ -1,41 +1,206 @@
-from typing import List
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 from . import checker as chk
+from .budget import Budget
+from .plugin import load_plugins
+from .prefilter import SourceIndex
 from .violation import Violation
-from sqlint.syntax_tree import SyntaxTree
+from sqlint.syntax_tree import Node, SyntaxTree
 from sqlint.config import Config
+from sqlint.parser import StreamingSuppressionIndex, parse_lines
+from sqlint.profiler import profiler
 
+CHECKER_LIST = [
+    # Check whether indent steps are N times.
+    chk.IndentStepsChecker,
+    # Check whitespaces
+    # 1. Check whether a whitespace exists after comma and not before .
+    chk.WhitespaceChecker,
+    # Check whether reserved keywords is capital or not (default: not capital).
+    chk.KeywordStyleChecker,
+    # Check whether comma, which connects some columns or conditions, is head(end) of line.
+    chk.CommaChecker,
+    # Check about join context
+    chk.JoinChecker,
+    # Check whether line-breaking before or after specified keywords.
+    chk.LineChecker
+]
 
-def check(tree: SyntaxTree, config: Config) -> List[Violation]:
+
+def get_checkers() -> List:
+    """Returns built-in checkers and plugin checkers"""
+    return CHECKER_LIST + load_plugins()
+
+
+def check(tree: SyntaxTree, config: Config, budget: Optional[Budget] = None) -> List[Violation]:
     """Checks syntax tree and returns error messages
 
+    Token-local checkers run in one traversal of lines, and each line is dispatched only to
+    checkers which need its token kinds. The others traverse the tree by themselves.
+    Violations are ordered by checkers as same as running them one by one.
+
+    Examples:
+    ----
+    # stops checking at the first violation
+    violations = check(tree, config, Budget(max_violations=1))
+    ----
+
     Args:
         tree:
         config:
+        budget: budget of violations. If this is exhausted, the rest of checking is cancelled
+                and at most max_violations violations found first are returned.
 
     Returns:
 
     """
 
-    violation_list: List[Violation] = []
-
-    checker_list = [
-        # Check whether indent steps are N times.
-        chk.IndentStepsChecker,
-        # Check whitespaces
-        # 1. Check whether a whitespace exists after comma and not before .
-        chk.WhitespaceChecker,
-        # Check whether reserved keywords is capital or not (default: not capital).
-        chk.KeywordStyleChecker,
-        # Check whether comma, which connects some columns or conditions, is head(end) of line.
-        chk.CommaChecker,
-        # Check about join context
-        chk.JoinChecker,
-        # Check whether line-breaking before or after specified keywords.
-        chk.LineChecker
-    ]
-
-    for checker in checker_list:
-        violation_list.extend(checker.check(tree, config))
+    index = SourceIndex(tree)
+    suppressions = chk.Checker.get_suppressions(tree)
+    if budget is None:
+        budget = Budget()
+
+    checkers = []
+    for checker in get_checkers():
+        # skips checkers which cannot find violations in this file
+        if checker.prefilter is not None and not checker.prefilter.match(index):
+            profiler.count(f'skip.{checker.__name__}')
+            continue
+        checkers.append(checker)
+
+    # violations of each checkers
+    results: List[List[Violation]] = [[] for _ in checkers]
+
+    # 1. token-local checkers
+    states = [(rank, c, c.prepare(config, suppressions, index)) for rank, c in enumerate(checkers) if c.is_token_local]
+    if states:
+        for leaf in tree.walk():
+            for rank, v_list in _dispatch(leaf.node, states):
+                results[rank].extend(v_list)
+                budget.spend(len(v_list))
+
+            if budget.is_cancelled:
+                break
+        else:
+            for rank, checker, state in states:
+                v_list = checker.finish(state)
+                results[rank].extend(v_list)
+                budget.spend(len(v_list))
+
+    # 2. checkers which need syntax tree
+    for rank, checker in enumerate(checkers):
+        if checker.is_token_local:
+            continue
+
+        if budget.is_cancelled:
+            break
+
+        with profiler.timer('check', checker.__name__):
+            results[rank] = checker.check(tree, config, index, budget)
+
+    violation_list: List[Violation] = [v for v_list in results for v in v_list]
+    if budget.max_violations is not None:
+        violation_list = violation_list[:budget.max_violations]
+    profiler.count('violations', len(violation_list))
 
     return violation_list
+
+
+def _dispatch(node: Node, states: List[Tuple[int, Any, Dict]]) -> List[Tuple[int, List[Violation]]]:
+    """Checks a line by token-local checkers which need it
+
+    Args:
+        node: the line
+        states: list of (rank, checker, state made by checker.prepare())
+
+    Returns:
+        list of (rank, violations) of checkers which found violations
+    """
+
+    result: List[Tuple[int, List[Violation]]] = []
+    # token kinds in the line, which are collected only if any checker needs them
+    kinds: Optional[Set[str]] = None
+
+    for rank, checker, state in states:
+        if checker.token_kinds:
+            if kinds is None:
+                kinds = {token.kind for token in node.tokens}
+            if not checker.accepts(kinds):
+                continue
+
+        with profiler.timer('check', checker.__name__):
+            v_list = checker.check_line(node, state)
+        if v_list:
+            result.append((rank, v_list))
+
+    return result
+
+
+def check_stream(lines: Iterable[str],
+                 config: Config,
+                 checkers: Optional[List] = None,
+                 budget: Optional[Budget] = None) -> Iterator[List[Violation]]:
+    """Checks sql statement line by line without building syntax tree.
+
+    Tokens of each line are fed from the parser straight into token-local checkers,
+    so that memory usage does not depend on the size of sql.
+
+    Examples:
+    ----
+    with open('dump.sql') as fp:
+        for violations in check_stream(fp, config):
+            ...
+    ----
+
+    Args:
+        lines: lines of sql statement. e.g.) file object
+        config:
+        checkers: token-local checkers to be run. (default: token-local ones in built-in and plugin checkers)
+        budget: budget of violations. If this is exhausted, the rest of lines are not read.
+
+    Returns:
+        iterator of sorted violations in each lines. The last item has violations found at end of file.
+    """
+
+    if checkers is None:
+        checkers = [c for c in get_checkers() if c.is_token_local]
+
+    if budget is None:
+        budget = Budget()
+
+    suppressions = StreamingSuppressionIndex()
+    states = [(rank, c, c.prepare(config, suppressions)) for rank, c in enumerate(checkers)]
+
+    for line_num, tokens in enumerate(parse_lines(lines, suppressions), start=1):
+        if budget.is_cancelled:
+            return
+
+        node = Node(line_num=line_num, tokens=tokens)
+        violation_list: List[Violation] = []
+
+        for _, v_list in _dispatch(node, states):
+            violation_list.extend(v_list)
+        suppressions.discard(line_num)
+        profiler.count('lines')
+
+        violation_list = sorted(violation_list)
+        if violation_list and budget.spend(len(violation_list)) and budget.max_violations is not None:
+            # drops violations over the budget in this line
+            violation_list = violation_list[:len(violation_list) - (budget.count - budget.max_violations)]
+
+        profiler.count('violations', len(violation_list))
+        yield violation_list
+
+    if budget.is_cancelled:
+        return
+
+    violation_list = []
+    for _, checker, state in states:
+        violation_list.extend(checker.finish(state))
+    violation_list = sorted(violation_list)
+    if budget.max_violations is not None:
+        violation_list = violation_list[:max(budget.max_violations - budget.count, 0)]
+    budget.spend(len(violation_list))
+    profiler.count('violations', len(violation_list))
+
+    yield violation_list
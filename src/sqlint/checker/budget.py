@@ -0,0 +1,50 @@
+from typing import Optional
+
+
+class Budget:
+    """Cooperative cancellation of checking, which is shared by checkers and the caller.
+
+    Checkers spend the budget whenever they find violations in a line, and stop traversing
+    as soon as it is exhausted. The caller can also cancel the rest of checking.
+
+    Examples:
+    ----
+    budget = Budget(max_violations=1)
+    for leaf in tree.walk():
+        ...
+        if budget.spend(len(violations)):
+            break
+    ----
+    """
+
+    def __init__(self, max_violations: Optional[int] = None):
+        """
+
+        Args:
+            max_violations: the number of violations checking is stopped after. If this is None, unlimited.
+        """
+        if max_violations is not None and max_violations < 1:
+            raise ValueError(f'max_violations must be >= 1, but {max_violations}')
+
+        self.max_violations: Optional[int] = max_violations
+        self.count: int = 0
+        self.is_cancelled: bool = False
+
+    def spend(self, value: int = 1) -> bool:
+        """Spends the budget by found violations
+
+        Args:
+            value: the number of found violations
+
+        Returns:
+            True if the budget is exhausted and checking must be stopped
+        """
+        self.count += value
+        if self.max_violations is not None and self.count >= self.max_violations:
+            self.is_cancelled = True
+
+        return self.is_cancelled
+
+    def cancel(self):
+        """Stops the rest of checking"""
+        self.is_cancelled = True
@@ -1,51 +1,182 @@
 from abc import ABCMeta, abstractmethod
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 
 from . import violation
-from .violation import Violation
+from .budget import Budget
+from .prefilter import Prefilter, SourceIndex
+from .violation import Code, PluginCode, Violation
 from sqlint.config import Config
 from sqlint.syntax_tree import SyntaxTree, Node
-from sqlint.parser import Token
+from sqlint.parser import SuppressionIndex, Token
+from sqlint.parser.keywords import BINARY_OPERATORS_ESCAPED
 from sqlint.parser.keywords import format as format_keyword
 
 
 class Checker(metaclass=ABCMeta):
+    # whether the checker needs only tokens of each line, which can be run without syntax tree.
+    is_token_local: bool = False
+    # cheap condition evaluated once per file, and the checker is skipped if it does not match.
+    prefilter: Optional[Prefilter] = None
+    # violation codes defined by the checker, which must be declared by plugin checkers.
+    codes: List[PluginCode] = []
+
     @staticmethod
     @abstractmethod
-    def check(tree: SyntaxTree, config: Config) -> List[Violation]:
+    def check(tree: SyntaxTree,
+              config: Config,
+              index: Optional[SourceIndex] = None,
+              budget: Optional[Budget] = None) -> List[Violation]:
+        """Checks syntax tree
+
+        Args:
+            tree: root of syntax tree
+            config:
+            index: index of the file shared by checkers
+            budget: budget of violations, and checking is stopped as soon as it is exhausted.
+
+        Returns:
+            violations
+        """
         pass
 
-
-class IndentStepsChecker(Checker):
     @staticmethod
-    def check(tree: SyntaxTree, config: Config) -> List[Violation]:
-        # TODO: Enable users to ignore violation cases by config.
+    def get_suppressions(tree: SyntaxTree) -> SuppressionIndex:
+        """Returns suppression index of the tree, which is empty if tree has no one."""
+        if tree.suppressions is None:
+            return SuppressionIndex()
 
-        # Checks whether indent steps are N times.
-        indent_steps = config.indent_steps
+        return tree.suppressions
 
-        return IndentStepsChecker._check(tree, indent_steps)
 
-    @staticmethod
-    def _check(tree: SyntaxTree, indent_steps: int) -> List[Violation]:
+class TokenLocalChecker(Checker):
+    """Checker which needs only tokens of each line and nothing about the tree.
+
+    Lines are checked one by one with per-file state made by prepare(), so that lines streamed
+    from the parser can be checked without building syntax tree.
+
+    Examples:
+    ----
+    state = WhitespaceChecker.prepare(config, suppressions)
+    for node in nodes:
+        violations.extend(WhitespaceChecker.check_line(node, state))
+    violations.extend(WhitespaceChecker.finish(state))
+    ----
+    """
+
+    is_token_local: bool = True
+    # token kinds the checker needs, and lines without any of them are not dispatched to check_line().
+    # If this is empty, all lines are dispatched.
+    token_kinds: Tuple[str, ...] = ()
+
+    @classmethod
+    def check(cls,
+              tree: SyntaxTree,
+              config: Config,
+              index: Optional[SourceIndex] = None,
+              budget: Optional[Budget] = None) -> List[Violation]:
         violation_list: List[Violation] = list()
+        state = cls.prepare(config, Checker.get_suppressions(tree), index)
+        if budget is None:
+            budget = Budget()
 
-        for leaf in tree.leaves:
-            if leaf.indent % indent_steps != 0:
-                v = violation.IndentStepsViolation(
-                    tree=leaf,
-                    index=0,
-                    expected=indent_steps,
-                    actual=leaf.indent)
-                violation_list.append(v)
+        for leaf in tree.walk():
+            if cls.token_kinds and not cls.accepts({token.kind for token in leaf.tokens}):
+                continue
+
+            v_list = cls.check_line(leaf.node, state)
+            violation_list.extend(v_list)
+            if v_list and budget.spend(len(v_list)):
+                return violation_list
 
-            violation_list.extend(
-                IndentStepsChecker._check(leaf, indent_steps))
+        v_list = cls.finish(state)
+        violation_list.extend(v_list)
+        budget.spend(len(v_list))
 
         return violation_list
 
+    @classmethod
+    def accepts(cls, kinds: Set[str]) -> bool:
+        """Returns whether the line is dispatched to check_line()
+
+        Args:
+            kinds: token kinds in the line
+
+        Returns:
+            True if the line has any of token kinds the checker needs
+        """
+        return not cls.token_kinds or not kinds.isdisjoint(cls.token_kinds)
+
+    @staticmethod
+    @abstractmethod
+    def prepare(config: Config, suppressions: SuppressionIndex, index: Optional[SourceIndex] = None) -> Dict:
+        """Returns state used while checking lines of a file
+
+        Args:
+            config:
+            suppressions: suppression index of the file
+            index: index of the file to evaluate prefilters of sub-checks, which is None in streaming mode
+
+        Returns:
+            state of the checker
+        """
+        pass
+
+    @staticmethod
+    @abstractmethod
+    def check_line(node: Node, state: Dict) -> List[Violation]:
+        """Checks tokens of a line
+
+        Args:
+            node: the line
+            state: state made by prepare()
 
-class KeywordStyleChecker(Checker):
+        Returns:
+            violations in the line
+        """
+        pass
+
+    @staticmethod
+    def finish(state: Dict) -> List[Violation]:
+        """Returns violations found after all lines are checked
+
+        Args:
+            state: state made by prepare()
+
+        Returns:
+            violations
+        """
+        return []
+
+
+class IndentStepsChecker(TokenLocalChecker):
+    prefilter = Prefilter(codes=[Code.INDENT_STEPS])
+
+    @staticmethod
+    def prepare(config: Config, suppressions: SuppressionIndex, index: Optional[SourceIndex] = None) -> Dict:
+        # TODO: Enable users to ignore violation cases by config.
+
+        # Checks whether indent steps are N times.
+        return {
+            'indent_steps': config.indent_steps,
+            'code': Code.INDENT_STEPS.code,
+            'suppressions': suppressions,
+        }
+
+    @staticmethod
+    def check_line(node: Node, state: Dict) -> List[Violation]:
+        indent_steps = state['indent_steps']
+
+        if node.indent % indent_steps == 0 or state['suppressions'].is_suppressed(state['code'], node.line_num):
+            return []
+
+        return [violation.IndentStepsViolation(
+            tree=node,
+            index=0,
+            expected=indent_steps,
+            actual=node.indent)]
+
+
+class KeywordStyleChecker(TokenLocalChecker):
     """Checks reserved keywords style.
 
     Whether reserved keywords match one of following formats.
@@ -53,36 +184,43 @@ class KeywordStyleChecker(Checker):
         - upper-all: e.g) SELECT
         - upper-head: e.g) Select
     """
+    prefilter = Prefilter(codes=[Code.KEYWORD_UPPER, Code.KEYWORD_UPPER_HEAD, Code.KEYWORD_LOWER])
+    token_kinds = (Token.KEYWORD, Token.FUNCTION)
+
     @staticmethod
-    def check(tree: SyntaxTree, config: Config) -> List[Violation]:
+    def prepare(config: Config, suppressions: SuppressionIndex, index: Optional[SourceIndex] = None) -> Dict:
         # TODO: Enable users to ignore violation cases by config.
 
         keyword_style = config.keyword_style
 
-        return KeywordStyleChecker._check(tree, keyword_style)
+        return {
+            'keyword_style': keyword_style,
+            'code': violation.KeywordStyleViolation.get_code(keyword_style).code,
+            'suppressions': suppressions,
+        }
 
     @staticmethod
-    def _check(tree: SyntaxTree, keyword_style: str) -> List[Violation]:
+    def check_line(node: Node, state: Dict) -> List[Violation]:
         violation_list: List[Violation] = list()
+        keyword_style = state['keyword_style']
 
-        for leaf in tree.leaves:
-            for idx, token in enumerate(leaf.tokens):
-                if token.kind not in [Token.KEYWORD, Token.FUNCTION]:
-                    continue
+        if state['suppressions'].is_suppressed(state['code'], node.line_num):
+            return violation_list
 
-                word: str = token.word
-                expected: str = format_keyword(word, keyword_style)
-                if word != expected:
-                    params = {'style': keyword_style, 'actual': word, 'expected': expected}
+        for idx, token in enumerate(node.tokens):
+            if token.kind not in [Token.KEYWORD, Token.FUNCTION]:
+                continue
 
-                    v = violation.KeywordStyleViolation(
-                        tree=leaf,
-                        index=idx,
-                        **params)
-                    violation_list.append(v)
+            word: str = token.word
+            expected: str = format_keyword(word, keyword_style)
+            if word != expected:
+                params = {'style': keyword_style, 'actual': word, 'expected': expected}
 
-            violation_list.extend(
-                KeywordStyleChecker._check(leaf, keyword_style))
+                v = violation.KeywordStyleViolation(
+                    tree=node,
+                    index=idx,
+                    **params)
+                violation_list.append(v)
 
         return violation_list
 
@@ -93,27 +231,41 @@ class CommaChecker(Checker):
     1. Whether comma is head or end of a line.(default: head)
     """
 
+    prefilter = Prefilter(words=[','], codes=[Code.COMMA_HEAD, Code.COMMA_END])
+
     @staticmethod
-    def check(tree: SyntaxTree, config: Config) -> List[Violation]:
+    def check(tree: SyntaxTree,
+              config: Config,
+              index: Optional[SourceIndex] = None,
+              budget: Optional[Budget] = None) -> List[Violation]:
         # TODO: Enable users to ignore violation cases by config.
 
         comma_position = config.comma_position
+        if budget is None:
+            budget = Budget()
 
         result: List[Violation] = []
 
         # 1. Whether comma is head or end of a line.(default: head)
-        result.extend(CommaChecker._check_position(tree, comma_position))
+        result.extend(CommaChecker._check_position(tree, comma_position, Checker.get_suppressions(tree), budget))
 
         return result
 
     @staticmethod
-    def _check_position(tree: SyntaxTree, comma_position: str) -> List[Violation]:
+    def _check_position(tree: SyntaxTree,
+                        comma_position: str,
+                        suppressions: SuppressionIndex,
+                        budget: Budget) -> List[Violation]:
         violation_list: List[Violation] = list()
+        code = violation.CommaPositionViolation.get_code(comma_position).code
 
         lb = Token('(', Token.BRACKET_LEFT)
         rb = Token(')', Token.BRACKET_RIGHT)
 
-        for leaf in tree.leaves:
+        for leaf in tree.walk():
+            if suppressions.is_suppressed(code, leaf.line_num):
+                continue
+
             # removes whitespaces and comments at head and end of line.
             ltripped_node: Node = leaf.node.ltrip_kind(Token.WHITESPACE, Token.COMMENT)
             lindex = len(leaf.node) - len(ltripped_node)
@@ -126,6 +278,7 @@ class CommaChecker(Checker):
             elif comma_position == 'end':
                 comma_indexes = [i for i in comma_indexes if i != len(tokens)-1]
 
+            count = len(violation_list)
             for idx in comma_indexes:
                 # If a comma is in brackets, it is appropriate not to break a line at the comma.
                 # Determines that by counting left- and right- brackets at left-right-side.
@@ -139,13 +292,13 @@ class CommaChecker(Checker):
                             index=lindex+idx,
                             comma_position=comma_position))
 
-            violation_list.extend(
-                CommaChecker._check_position(leaf, comma_position))
+            if len(violation_list) > count and budget.spend(len(violation_list) - count):
+                break
 
         return violation_list
 
 
-class WhitespaceChecker(Checker):
+class WhitespaceChecker(TokenLocalChecker):
     """ Checks violations about whitespace.
 
     1. Whether multiple whitespaces exist.
@@ -155,152 +308,180 @@ class WhitespaceChecker(Checker):
 
     """
 
+    prefilter = Prefilter(codes=[
+        Code.WHITESPACE_MULTIPLE,
+        Code.WHITESPACE_AFTER_COMMA,
+        Code.WHITESPACE_BEFORE_COMMA,
+        Code.WHITESPACE_AFTER_BRACKET,
+        Code.WHITESPACE_BEFORE_BRACKET,
+        Code.WHITESPACE_AFTER_OPERATOR,
+        Code.WHITESPACE_BEFORE_OPERATOR,
+    ])
+    token_kinds = (Token.WHITESPACE, Token.COMMA, Token.BRACKET_LEFT, Token.BRACKET_RIGHT, Token.OPERATOR)
+
+    # prefilters of each sub-checks
+    COMMA_PREFILTER = Prefilter(
+        words=[','],
+        codes=[Code.WHITESPACE_AFTER_COMMA, Code.WHITESPACE_BEFORE_COMMA])
+    BRACKET_PREFILTER = Prefilter(
+        words=['(', ')'],
+        codes=[Code.WHITESPACE_AFTER_BRACKET, Code.WHITESPACE_BEFORE_BRACKET])
+    OPERATOR_PREFILTER = Prefilter(
+        words=[op.replace('\\', '') for op in BINARY_OPERATORS_ESCAPED],
+        codes=[Code.WHITESPACE_AFTER_OPERATOR, Code.WHITESPACE_BEFORE_OPERATOR])
+
     @staticmethod
-    def check(tree: SyntaxTree, config: Config) -> List[Violation]:
+    def prepare(config: Config, suppressions: SuppressionIndex, index: Optional[SourceIndex] = None) -> Dict:
         # TODO: Enable users to ignore violation cases by config.
-        result: List[Violation] = []
 
         # 1. Whether comma is head or end of a line.(default: head)
-        result.extend(WhitespaceChecker._check_multiple(tree))
+        checks = [WhitespaceChecker._check_multiple]
 
         # 2. Whether a Whitespace is after a comma and not before it.
-        result.extend(WhitespaceChecker._check_comma(tree))
+        if index is None or WhitespaceChecker.COMMA_PREFILTER.match(index):
+            checks.append(WhitespaceChecker._check_comma)
 
         # 3. Whether a Whitespace is after and before bracket.
-        result.extend(WhitespaceChecker._check_bracket(tree))
+        if index is None or WhitespaceChecker.BRACKET_PREFILTER.match(index):
+            checks.append(WhitespaceChecker._check_bracket)
 
         # 4. Whether a Whitespace is after and before operator.
-        result.extend(WhitespaceChecker._check_operator(tree))
+        if index is None or WhitespaceChecker.OPERATOR_PREFILTER.match(index):
+            checks.append(WhitespaceChecker._check_operator)
+
+        return {'suppressions': suppressions, 'checks': checks}
+
+    @staticmethod
+    def check_line(node: Node, state: Dict) -> List[Violation]:
+        result: List[Violation] = []
+        suppressions = state['suppressions']
+
+        for _check in state['checks']:
+            result.extend(_check(node, suppressions))
 
         return result
 
     @staticmethod
-    def _check_multiple(tree: SyntaxTree) -> List[Violation]:
+    def _check_multiple(node: Node, suppressions: SuppressionIndex) -> List[Violation]:
         violation_list: List[Violation] = list()
 
-        for leaf in tree.leaves:
-            # ignores token at head of a line
-            tokens = leaf.tokens[1:]
+        if suppressions.is_suppressed(Code.WHITESPACE_MULTIPLE.code, node.line_num):
+            return violation_list
 
-            for idx, tk in enumerate(tokens):
-                length = len(tk)
-                # ignores except whitespaces
-                if tk.kind != tk.WHITESPACE:
-                    continue
+        # ignores token at head of a line
+        tokens = node.tokens[1:]
 
-                # 2 spaces before comment is valid
-                if length == 2 and (idx+1 < len(tokens) and tokens[idx+1].kind == Token.COMMENT):
-                    continue
+        for idx, tk in enumerate(tokens):
+            length = len(tk)
+            # ignores except whitespaces
+            if tk.kind != tk.WHITESPACE:
+                continue
 
-                if length > 1:
-                    v = violation.MultiSpacesViolation(tree=leaf, index=idx)
-                    violation_list.append(v)
+            # 2 spaces before comment is valid
+            if length == 2 and (idx+1 < len(tokens) and tokens[idx+1].kind == Token.COMMENT):
+                continue
 
-            violation_list.extend(WhitespaceChecker._check_multiple(leaf))
+            if length > 1:
+                v = violation.MultiSpacesViolation(tree=node, index=idx)
+                violation_list.append(v)
 
         return violation_list
 
     @staticmethod
-    def _check_comma(tree: SyntaxTree) -> List[Violation]:
+    def _check_comma(node: Node, suppressions: SuppressionIndex) -> List[Violation]:
         violation_list: List[Violation] = list()
-
-        for leaf in tree.leaves:
-            # Comma at end of line dose not need to checked
-            for idx, token in enumerate(leaf.tokens[:-1]):
-                if token.kind != Token.COMMA:
-                    continue
-
-                # Checks that a whitespace does not exist before comma.
-                # However, when comma is at head of line, it is allowed that whitespace is before.
-                if idx >= 2 and leaf.tokens[idx-1].kind == Token.WHITESPACE:
-                    params = {'token': Token.COMMA,
-                              'position': 'before'}
-                    violation_list.append(
-                        violation.WhitespaceViolation(
-                            tree=leaf,
-                            index=idx,
-                            **params))
-
-                # checks whether a whitespace exists after comma.
-                if leaf.tokens[idx+1].kind != Token.WHITESPACE:
-                    params = {'token': Token.COMMA,
-                              'position': 'after',
-                              'target': f'{token.word}{leaf.tokens[idx+1].word}'}
-                    violation_list.append(
-                        violation.WhitespaceViolation(
-                            tree=leaf,
-                            index=idx,
-                            **params))
-
-            violation_list.extend(
-                WhitespaceChecker._check_comma(leaf))
+        is_before_suppressed = suppressions.is_suppressed(Code.WHITESPACE_BEFORE_COMMA.code, node.line_num)
+        is_after_suppressed = suppressions.is_suppressed(Code.WHITESPACE_AFTER_COMMA.code, node.line_num)
+
+        # Comma at end of line dose not need to checked
+        for idx, token in enumerate(node.tokens[:-1]):
+            if token.kind != Token.COMMA:
+                continue
+
+            # Checks that a whitespace does not exist before comma.
+            # However, when comma is at head of line, it is allowed that whitespace is before.
+            if not is_before_suppressed and idx >= 2 and node.tokens[idx-1].kind == Token.WHITESPACE:
+                params = {'token': Token.COMMA,
+                          'position': 'before'}
+                violation_list.append(
+                    violation.WhitespaceViolation(
+                        tree=node,
+                        index=idx,
+                        **params))
+
+            # checks whether a whitespace exists after comma.
+            if not is_after_suppressed and node.tokens[idx+1].kind != Token.WHITESPACE:
+                params = {'token': Token.COMMA,
+                          'position': 'after',
+                          'target': f'{token.word}{node.tokens[idx+1].word}'}
+                violation_list.append(
+                    violation.WhitespaceViolation(
+                        tree=node,
+                        index=idx,
+                        **params))
 
         return violation_list
 
     @staticmethod
-    def _check_bracket(tree: SyntaxTree) -> List[Violation]:
+    def _check_bracket(node: Node, suppressions: SuppressionIndex) -> List[Violation]:
         violation_list: List[Violation] = list()
-
-        for leaf in tree.leaves:
-            # Comma at end of line dose not need to checked
-            for idx, token in enumerate(leaf.tokens[:-1]):
-                # Checks whether a whitespace does not exist after left-bracket "( ".
-                if token.kind == Token.BRACKET_LEFT \
-                        and leaf.tokens[idx+1].kind == Token.WHITESPACE:
-                    params = {'token': Token.BRACKET_LEFT,
-                              'position': 'after',
-                              'target': f'{token.word}{leaf.tokens[idx+1].word}'}
-                    violation_list.append(
-                        violation.WhitespaceViolation(tree=leaf, index=idx, **params))
-
-                # Checks whether a whitespace does not exist before right-bracket " )".
-                if token.kind == Token.BRACKET_RIGHT \
-                        and (idx >= 2 and leaf.tokens[idx-1].kind == Token.WHITESPACE):
-                    params = {
-                        'token': Token.BRACKET_RIGHT,
-                        'position': 'before',
-                        'target': f'{leaf.tokens[idx-1].word}{token.word}'}
-                    violation_list.append(
-                        violation.WhitespaceViolation(
-                            tree=leaf,
-                            index=idx,
-                            **params))
-
-            violation_list.extend(
-                WhitespaceChecker._check_bracket(leaf))
+        is_after_suppressed = suppressions.is_suppressed(Code.WHITESPACE_AFTER_BRACKET.code, node.line_num)
+        is_before_suppressed = suppressions.is_suppressed(Code.WHITESPACE_BEFORE_BRACKET.code, node.line_num)
+
+        # Comma at end of line dose not need to checked
+        for idx, token in enumerate(node.tokens[:-1]):
+            # Checks whether a whitespace does not exist after left-bracket "( ".
+            if token.kind == Token.BRACKET_LEFT and not is_after_suppressed \
+                    and node.tokens[idx+1].kind == Token.WHITESPACE:
+                params = {'token': Token.BRACKET_LEFT,
+                          'position': 'after',
+                          'target': f'{token.word}{node.tokens[idx+1].word}'}
+                violation_list.append(
+                    violation.WhitespaceViolation(tree=node, index=idx, **params))
+
+            # Checks whether a whitespace does not exist before right-bracket " )".
+            if token.kind == Token.BRACKET_RIGHT and not is_before_suppressed \
+                    and (idx >= 2 and node.tokens[idx-1].kind == Token.WHITESPACE):
+                params = {
+                    'token': Token.BRACKET_RIGHT,
+                    'position': 'before',
+                    'target': f'{node.tokens[idx-1].word}{token.word}'}
+                violation_list.append(
+                    violation.WhitespaceViolation(
+                        tree=node,
+                        index=idx,
+                        **params))
 
         return violation_list
 
     @staticmethod
-    def _check_operator(tree: SyntaxTree) -> List[Violation]:
+    def _check_operator(node: Node, suppressions: SuppressionIndex) -> List[Violation]:
         violation_list: List[Violation] = list()
-
-        for leaf in tree.leaves:
-            # Comma at end of line dose not need to checked
-            for idx, token in enumerate(leaf.tokens[:-1]):
-                if token.kind != Token.OPERATOR:
-                    continue
-
-                # Checks whether a whitespace exists before operator.
-                if idx >= 2 and leaf.tokens[idx-1].kind != Token.WHITESPACE:
-                    params = {
-                        'token': Token.OPERATOR,
-                        'position': 'before',
-                        'target': f'{leaf.tokens[idx-1].word}{token.word}'}
-                    violation_list.append(
-                        violation.WhitespaceViolation(tree=leaf, index=idx, **params))
-
-                # Checks whether a whitespace exists after operator.
-                if leaf.tokens[idx + 1].kind != Token.WHITESPACE:
-                    params = {
-                        'token': Token.OPERATOR,
-                        'position': 'after',
-                        'target': f'{token.word}{leaf.tokens[idx + 1].word}'}
-                    violation_list.append(
-                        violation.WhitespaceViolation(tree=leaf, index=idx, **params))
-
-            violation_list.extend(
-                WhitespaceChecker._check_operator(leaf))
+        is_before_suppressed = suppressions.is_suppressed(Code.WHITESPACE_BEFORE_OPERATOR.code, node.line_num)
+        is_after_suppressed = suppressions.is_suppressed(Code.WHITESPACE_AFTER_OPERATOR.code, node.line_num)
+
+        # Comma at end of line dose not need to checked
+        for idx, token in enumerate(node.tokens[:-1]):
+            if token.kind != Token.OPERATOR:
+                continue
+
+            # Checks whether a whitespace exists before operator.
+            if not is_before_suppressed and idx >= 2 and node.tokens[idx-1].kind != Token.WHITESPACE:
+                params = {
+                    'token': Token.OPERATOR,
+                    'position': 'before',
+                    'target': f'{node.tokens[idx-1].word}{token.word}'}
+                violation_list.append(
+                    violation.WhitespaceViolation(tree=node, index=idx, **params))
+
+            # Checks whether a whitespace exists after operator.
+            if not is_after_suppressed and node.tokens[idx + 1].kind != Token.WHITESPACE:
+                params = {
+                    'token': Token.OPERATOR,
+                    'position': 'after',
+                    'target': f'{token.word}{node.tokens[idx + 1].word}'}
+                violation_list.append(
+                    violation.WhitespaceViolation(tree=node, index=idx, **params))
 
         return violation_list
 
@@ -313,13 +494,24 @@ class JoinChecker(Checker):
 
     """
 
+    prefilter = Prefilter(words=['JOIN'], codes=[Code.JOIN_TABLE_NOT_EXISIT, Code.JOIN_CONTEXT_OMIT])
+
     @staticmethod
-    def check(tree: SyntaxTree, config: Config) -> List[Violation]:
+    def check(tree: SyntaxTree,
+              config: Config,
+              index: Optional[SourceIndex] = None,
+              budget: Optional[Budget] = None) -> List[Violation]:
         # TODO: Enable users to ignore violation cases by config.
         result: List[Violation] = []
 
+        suppressions = Checker.get_suppressions(tree)
+        if budget is None:
+            budget = Budget()
+
         # 1. Whether join context and table name are same line.
-        result.extend(JoinChecker._check_table_existance(tree))
+        result.extend(JoinChecker._check_table_existance(tree, suppressions, budget))
+        if budget.is_cancelled:
+            return result
 
         # 2. Whether join contexts are described fully, for example [inner join], [left outer join], [right outer join]
         expected_kvs = {
@@ -336,7 +528,7 @@ class JoinChecker(Checker):
             _value = ' '.join([JoinChecker._format_str(v) for v in vs])
             expected_list[_key] = _value
 
-        result.extend(JoinChecker._check_context(tree, expected_list))
+        result.extend(JoinChecker._check_context(tree, expected_list, suppressions, budget))
 
         return result
 
@@ -345,11 +537,16 @@ class JoinChecker(Checker):
         return value.upper()
 
     @staticmethod
-    def _check_table_existance(tree: SyntaxTree) -> List[Violation]:
+    def _check_table_existance(tree: SyntaxTree, suppressions: SuppressionIndex, budget: Budget) -> List[Violation]:
         """Checks the token next to 'Join' is identifier(maybe table_name) or SubQuery """
         violation_list: List[Violation] = list()
+        code = Code.JOIN_TABLE_NOT_EXISIT.code
 
-        for leaf in tree.leaves:
+        for leaf in tree.walk():
+            if suppressions.is_suppressed(code, leaf.line_num):
+                continue
+
+            count = len(violation_list)
             for idx, token in enumerate(leaf.tokens):
                 # ignores token except join
                 if token.word.upper() != 'JOIN':
@@ -378,19 +575,28 @@ class JoinChecker(Checker):
                 v = violation.JoinTableNotExistViolation(tree=leaf, index=idx)
                 violation_list.append(v)
 
-            violation_list.extend(JoinChecker._check_table_existance(leaf))
+            if len(violation_list) > count and budget.spend(len(violation_list) - count):
+                break
 
         return violation_list
 
     @staticmethod
-    def _check_context(tree: SyntaxTree, expected_list: Dict[str, str]) -> List[Violation]:
+    def _check_context(tree: SyntaxTree,
+                       expected_list: Dict[str, str],
+                       suppressions: SuppressionIndex,
+                       budget: Budget) -> List[Violation]:
         """Checks whether join are described fully, for example [inner join], [left outer join], [right outer join] """
         violation_list: List[Violation] = list()
+        code = Code.JOIN_CONTEXT_OMIT.code
 
         # TODO: too deeply nest and complex code
-        for leaf in tree.leaves:
+        for leaf in tree.walk():
+            if suppressions.is_suppressed(code, leaf.line_num):
+                continue
+
             join_indexes = [i for i, x in enumerate(leaf.tokens) if x.word.upper() == 'JOIN']
 
+            count = len(violation_list)
             for idx in join_indexes:
                 token = leaf.tokens[idx]
 
@@ -415,12 +621,13 @@ class JoinChecker(Checker):
                     v = violation.JoinContextOmitViolation(tree=leaf, index=idx, **params)
                     violation_list.append(v)
 
-            violation_list.extend(JoinChecker._check_context(leaf, expected_list))
+            if len(violation_list) > count and budget.spend(len(violation_list) - count):
+                break
 
         return violation_list
 
 
-class LineChecker(Checker):
+class LineChecker(TokenLocalChecker):
     """Checks violations about lines management.
 
     1. Checks whether two or more blank lines exist.
@@ -439,15 +646,23 @@ class LineChecker(Checker):
     ------------
     """
 
+    prefilter = Prefilter(codes=[Code.LINE_BlANK_MULTIPLE, Code.LINE_ONLY_WHITESPACE])
+
+    @staticmethod
+    def prepare(config: Config, suppressions: SuppressionIndex, index: Optional[SourceIndex] = None) -> Dict:
+        return {
+            'suppressions': suppressions,
+            # the number of continuous blank lines until the last line
+            'blank_count': 0,
+            'last_node': None,
+        }
+
     @staticmethod
-    def check(tree: SyntaxTree, config: Config) -> List[Violation]:
+    def check_line(node: Node, state: Dict) -> List[Violation]:
         result: List[Violation] = []
 
         # 1. Checks whether two or more blank lines exist.
-        v_list, blank_count, last_tree = LineChecker._check_blank_line(tree, blank_count=0)
-        if blank_count >= 2:
-            v_list.append(violation.MultiBlankLineViolation(last_tree, index=0))
-        result.extend(v_list)
+        result.extend(LineChecker._check_blank_line(node, state))
 
         # 2. Checks whether breaking line after specified keywords.
         # TODO: Implement
@@ -455,26 +670,35 @@ class LineChecker(Checker):
         return result
 
     @staticmethod
-    def _check_blank_line(tree: SyntaxTree, blank_count: int) -> Tuple[List[Violation], int, SyntaxTree]:
-        violation_list: List[Violation] = []
-        last_tree = tree
+    def finish(state: Dict) -> List[Violation]:
+        # blank lines at end of file
+        last_node = state['last_node']
+        if state['blank_count'] >= 2 \
+                and not state['suppressions'].is_suppressed(Code.LINE_BlANK_MULTIPLE.code, last_node.line_num):
+            return [violation.MultiBlankLineViolation(last_node, index=0)]
+
+        return []
 
-        for leaf in tree.leaves:
-            count = len(leaf.node)
-            is_blank = (count == 0)
+    @staticmethod
+    def _check_blank_line(node: Node, state: Dict) -> List[Violation]:
+        violation_list: List[Violation] = []
+        suppressions = state['suppressions']
 
-            if count == 1 and leaf.tokens[0].kind == Token.WHITESPACE:
-                violation_list.append(violation.OnlyWhitespaceViolation(tree=leaf, index=0))
+        count = len(node)
+        is_blank = (count == 0)
 
-            # If this line is not blank and 2 or more previous lines are blank, stack violation.
-            if is_blank:
-                blank_count += 1
-            else:
-                if blank_count >= 2:
-                    violation_list.append(violation.MultiBlankLineViolation(tree=leaf, index=0))
-                blank_count = 0
+        if count == 1 and node.tokens[0].kind == Token.WHITESPACE \
+                and not suppressions.is_suppressed(Code.LINE_ONLY_WHITESPACE.code, node.line_num):
+            violation_list.append(violation.OnlyWhitespaceViolation(tree=node, index=0))
 
-            v_list, blank_count, last_tree = LineChecker._check_blank_line(leaf, blank_count)
-            violation_list.extend(v_list)
+        # If this line is not blank and 2 or more previous lines are blank, stack violation.
+        if is_blank:
+            state['blank_count'] += 1
+        else:
+            if state['blank_count'] >= 2 \
+                    and not suppressions.is_suppressed(Code.LINE_BlANK_MULTIPLE.code, node.line_num):
+                violation_list.append(violation.MultiBlankLineViolation(tree=node, index=0))
+            state['blank_count'] = 0
+        state['last_node'] = node
 
-        return violation_list, blank_count, last_tree
+        return violation_list
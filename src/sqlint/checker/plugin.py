@@ -0,0 +1,139 @@
+import logging
+from typing import List, Optional, Union
+
+from .checker import Checker
+from .violation import Code, PluginCode
+
+logger = logging.getLogger(__name__)
+
+# entry point group which plugin checkers are registered to
+ENTRY_POINT_GROUP = 'sqlint.checkers'
+
+# checkers loaded from entry points and registered by register()
+_plugins: Optional[List[type]] = None
+
+
+def _iter_entry_points(group: str) -> List:
+    """Returns entry points in the group, which have name and load()"""
+
+    try:
+        from importlib.metadata import entry_points  # python 3.8+
+    except ImportError:
+        try:
+            from importlib_metadata import entry_points
+        except ImportError:
+            entry_points = None
+
+    if entry_points is not None:
+        eps = entry_points()
+        if hasattr(eps, 'select'):
+            return list(eps.select(group=group))
+        return list(eps.get(group, []))
+
+    try:
+        import pkg_resources
+    except ImportError:
+        return []
+
+    return list(pkg_resources.iter_entry_points(group))
+
+
+def get_versions() -> List[str]:
+    """Returns names and versions of distributions which register plugin checkers
+
+    Cached results depend on them, because a plugin may report other violations after it is upgraded.
+
+    Returns:
+        list of "name==version". e.g.) ['sqlint-shop==1.0.2']
+    """
+
+    try:
+        from importlib.metadata import distributions  # python 3.8+
+    except ImportError:
+        try:
+            from importlib_metadata import distributions
+        except ImportError:
+            distributions = None
+
+    if distributions is not None:
+        return sorted({
+            f'{dist.metadata["Name"]}=={dist.version}' for dist in distributions()
+            if any(ep.group == ENTRY_POINT_GROUP for ep in dist.entry_points)})
+
+    return sorted({f'{ep.dist.project_name}=={ep.dist.version}' for ep in _iter_entry_points(ENTRY_POINT_GROUP)
+                   if getattr(ep, 'dist', None) is not None})
+
+
+def load_plugins() -> List[type]:
+    """Returns plugin checkers, which are loaded from entry points at first call.
+
+    Plugin package registers Checker subclass to "sqlint.checkers" group.
+
+    Examples:
+    ----
+    # setup.py of plugin package
+    setup(
+        ...
+        entry_points={
+            'sqlint.checkers': ['banned_function = sqlint_shop.checkers:BannedFunctionChecker'],
+        },
+    )
+    ----
+
+    Returns:
+        plugin checkers
+    """
+
+    global _plugins
+
+    if _plugins is not None:
+        return _plugins
+
+    _plugins = []
+    for ep in _iter_entry_points(ENTRY_POINT_GROUP):
+        try:
+            checker = ep.load()
+        except Exception as e:
+            logger.warning(f'failed to load plugin {ep.name}: {e}')
+            continue
+
+        try:
+            register(checker)
+        except (TypeError, ValueError) as e:
+            logger.warning(f'failed to load plugin {ep.name}: {e}')
+
+    return _plugins
+
+
+def register(checker: type):
+    """Registers plugin checker, which runs with built-in checkers
+
+    Args:
+        checker: Checker subclass, whose codes must not be used by built-in checkers and other plugins
+    """
+
+    if not isinstance(checker, type) or not issubclass(checker, Checker):
+        raise TypeError(f'plugin must be a subclass of Checker, but {checker!r}')
+
+    if _plugins is None:
+        load_plugins()
+
+    if checker in _plugins:
+        return
+
+    used = {c.code for c in get_codes()}
+    conflicts = [c.code for c in checker.codes if c.code in used]
+    if conflicts:
+        raise ValueError(f'violation codes of {checker.__name__} are already used: {", ".join(conflicts)}')
+
+    _plugins.append(checker)
+
+
+def get_codes() -> List[Union[Code, PluginCode]]:
+    """Returns built-in violation codes and ones defined by plugins"""
+
+    result: List[Union[Code, PluginCode]] = list(Code)
+    for checker in load_plugins():
+        result.extend(checker.codes)
+
+    return result
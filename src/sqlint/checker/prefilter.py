@@ -0,0 +1,93 @@
+from typing import Iterable, Optional, Set
+
+from .violation import Code
+from sqlint.parser import SuppressionIndex
+from sqlint.syntax_tree import SyntaxTree
+
+
+class SourceIndex:
+    """Cheap per-file index which prefilters are evaluated against.
+
+    Each value is computed at first access and shared by all rules, so that a file is scanned
+    at most once whatever the number of rules.
+    """
+
+    def __init__(self, tree: SyntaxTree):
+        """
+
+        Args:
+            tree: root of syntax tree
+        """
+        self.tree: SyntaxTree = tree
+        self._source: Optional[str] = None
+        self._kinds: Optional[Set[str]] = None
+
+    @property
+    def source(self) -> str:
+        """Upper-cased raw source"""
+        if self._source is None:
+            if self.tree.source is not None:
+                self._source = self.tree.source.upper()
+            else:
+                self._source = '\n'.join([leaf.text for leaf in self.tree.walk()]).upper()
+
+        return self._source
+
+    @property
+    def kinds(self) -> Set[str]:
+        """Kinds of tokens in the file"""
+        if self._kinds is None:
+            self._kinds = {token.kind for leaf in self.tree.walk() for token in leaf.tokens}
+
+        return self._kinds
+
+    @property
+    def suppressions(self) -> SuppressionIndex:
+        if self.tree.suppressions is None:
+            return SuppressionIndex()
+
+        return self.tree.suppressions
+
+
+class Prefilter:
+    """Cheap condition whether a rule can find violations in a file.
+
+    A rule is skipped when any of given conditions does not match.
+        - words: case-insensitive substrings, any of which must be in raw source.
+        - kinds: token kinds, any of which must be in the file.
+        - codes: violation codes the rule reports, any of which must not be suppressed in whole of file.
+
+    Examples:
+    ----
+    prefilter = Prefilter(words=['JOIN'], codes=[Code.JOIN_TABLE_NOT_EXISIT, Code.JOIN_CONTEXT_OMIT])
+    if prefilter.match(SourceIndex(tree)):
+        violations = JoinChecker.check(tree, config)
+    ----
+    """
+
+    def __init__(self, words: Iterable[str] = (), kinds: Iterable[str] = (), codes: Iterable[Code] = ()):
+        self.words = [w.upper() for w in words]
+        self.kinds = list(kinds)
+        self.codes = [c.code for c in codes]
+
+    def match(self, index: SourceIndex) -> bool:
+        """Returns whether the rule may find violations in the file
+
+        Args:
+            index: index of the file
+
+        Returns:
+            False if the rule cannot find any violations
+        """
+        if self.codes:
+            suppressions = index.suppressions
+            if all([suppressions.is_suppressed_all(c) for c in self.codes]):
+                return False
+
+        if self.words and not any([w in index.source for w in self.words]):
+            return False
+
+        if self.kinds and not any([k in index.kinds for k in self.kinds]):
+            return False
+
+        return True
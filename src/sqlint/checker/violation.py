@@ -1,8 +1,8 @@
-from typing import Dict
+from typing import Dict, Union
 from enum import Enum
 
 from sqlint.parser import Token
-from sqlint.syntax_tree import SyntaxTree
+from sqlint.syntax_tree import Node, SyntaxTree
 
 
 class Code(Enum):
@@ -58,11 +58,36 @@ class Code(Enum):
         self._template = value
 
 
+class PluginCode:
+    """Violation code defined by plugin, which has the same interface as Code.
+
+    Examples:
+    ----
+    BANNED_FUNCTION = PluginCode('BANNED_FUNCTION', 'X101', 'function is banned: {actual}')
+    ----
+    """
+
+    def __init__(self, name: str, code: str, template: str):
+        """
+        Args:
+            name: name of the code
+            code: violation code, which must be unique and match [A-Z]+[0-9]+ to be suppressed by comments.
+            template: violation template message
+        """
+        self.name = name
+        self.code = code
+        self.template = template
+
+    def __repr__(self):
+        return f'<PluginCode.{self.name}: {self.code}>'
+
+
 class Violation:
-    def __init__(self, tree: SyntaxTree, index: int, code: Code, **kwargs):
-        self.tree: SyntaxTree = tree
+    def __init__(self, tree: Union[SyntaxTree, Node], index: int, code: Union[Code, PluginCode], **kwargs):
+        # the line violation is found at, which is Node when tree is not built (e.g. streaming mode)
+        self.tree: Union[SyntaxTree, Node] = tree
         self.index: int = index
-        self.code: Code = code
+        self.code: Union[Code, PluginCode] = code
         self.params: Dict = kwargs
 
     @property
@@ -73,13 +98,24 @@ class Violation:
     def pos(self):
         return self.tree.get_position(self.index)
 
-    def __str__(self):
-        _template = '(L{line}, {pos}): ' + self.code.template
+    @property
+    def message(self) -> str:
+        return self.code.template.format(**self.params)
 
-        return _template.format(
+    def __str__(self):
+        return '(L{line}, {pos}): {message}'.format(
             line=self.line_num,
             pos=self.pos,
-            **self.params)
+            message=self.message)
+
+    def to_dict(self) -> Dict:
+        """Returns violation as a serializable dict"""
+        return {
+            'line': self.line_num,
+            'pos': self.pos,
+            'code': self.code.code,
+            'message': self.message,
+        }
 
     def __lt__(self, other):
         if self.line_num == other.line_num:
@@ -98,32 +134,34 @@ class KeywordStyleViolation(Violation):
         if 'style' not in kwargs:
             raise KeyError(f'style must be passed.')
 
-        style = kwargs['style']
+        super().__init__(tree, index, self.get_code(kwargs['style']), **kwargs)
 
+    @staticmethod
+    def get_code(style: str) -> Code:
         if style == 'upper-all':
-            _code = Code.KEYWORD_UPPER
+            return Code.KEYWORD_UPPER
         elif style == 'upper-head':
-            _code = Code.KEYWORD_UPPER_HEAD
+            return Code.KEYWORD_UPPER_HEAD
         elif style == 'lower':
-            _code = Code.KEYWORD_LOWER
-        else:
-            raise ValueError('keyword style must be in [upper-all, upper-head, lower]')
+            return Code.KEYWORD_LOWER
 
-        super().__init__(tree, index, _code, **kwargs)
+        raise ValueError('keyword style must be in [upper-all, upper-head, lower]')
 
 
 class CommaPositionViolation(Violation):
     def __init__(self, tree: SyntaxTree, index: int, comma_position: str, **kwargs):
         self.comma_position = comma_position
 
+        super().__init__(tree, index, self.get_code(comma_position), **kwargs)
+
+    @staticmethod
+    def get_code(comma_position: str) -> Code:
         if comma_position == 'head':
-            _code = Code.COMMA_HEAD
+            return Code.COMMA_HEAD
         elif comma_position == 'end':
-            _code = Code.COMMA_END
-        else:
-            raise ValueError('position must be in [head, end]')
+            return Code.COMMA_END
 
-        super().__init__(tree, index, _code, **kwargs)
+        raise ValueError('position must be in [head, end]')
 
 
 class MultiSpacesViolation(Violation):
@@ -141,30 +179,32 @@ class WhitespaceViolation(Violation):
         self.token = kwargs['token']
         self.position = kwargs['position']
 
+        super().__init__(tree, index, self.get_code(self.token, self.position), **kwargs)
+
+    @staticmethod
+    def get_code(token: str, position: str) -> Code:
         # TODO: modify more simple, maybe it is better to split several classes.
-        if self.token == Token.COMMA:
-            if self.position == 'before':
-                _code = Code.WHITESPACE_BEFORE_COMMA
-            elif self.position == 'after':
-                _code = Code.WHITESPACE_AFTER_COMMA
+        if token == Token.COMMA:
+            if position == 'before':
+                return Code.WHITESPACE_BEFORE_COMMA
+            elif position == 'after':
+                return Code.WHITESPACE_AFTER_COMMA
             else:
                 raise ValueError('whitespace position must be in [before, after]')
-        elif self.token == Token.BRACKET_LEFT:
-            _code = Code.WHITESPACE_AFTER_BRACKET
-        elif self.token == Token.BRACKET_RIGHT:
-            _code = Code.WHITESPACE_BEFORE_BRACKET
-        elif self.token == Token.OPERATOR:
-            if self.position == 'before':
-                _code = Code.WHITESPACE_BEFORE_OPERATOR
-            elif self.position == 'after':
-                _code = Code.WHITESPACE_AFTER_OPERATOR
+        elif token == Token.BRACKET_LEFT:
+            return Code.WHITESPACE_AFTER_BRACKET
+        elif token == Token.BRACKET_RIGHT:
+            return Code.WHITESPACE_BEFORE_BRACKET
+        elif token == Token.OPERATOR:
+            if position == 'before':
+                return Code.WHITESPACE_BEFORE_OPERATOR
+            elif position == 'after':
+                return Code.WHITESPACE_AFTER_OPERATOR
             else:
                 raise ValueError('whitespace position must be in [before, after]')
-        else:
-            raise ValueError('token kind must be in [{}, {}, {}, {}]'.format(
-                Token.COMMA, Token.BRACKET_LEFT, Token.BRACKET_RIGHT, Token.OPERATOR))
 
-        super().__init__(tree, index, _code, **kwargs)
+        raise ValueError('token kind must be in [{}, {}, {}, {}]'.format(
+            Token.COMMA, Token.BRACKET_LEFT, Token.BRACKET_RIGHT, Token.OPERATOR))
 
 
 class JoinTableNotExistViolation(Violation):
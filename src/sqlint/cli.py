@@ -1,11 +1,25 @@
 import click
+import io
+import json
 import logging
 import os
-from typing import Dict
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional, TextIO, Tuple
 
+from .baseline import Baseline, fingerprint
+from .cache import ResultCache, DEFAULT_MAX_AGE, DEFAULT_MAX_SIZE
 from .checker import check as check_tree
+from .checker import Budget, check_stream
+from .checker import get_checkers, get_plugin_versions
 from .config import Config
-from .formatter import format as format_tree
+from .formatter import Comparator
+from .formatter import diff as diff_formatted
+from .formatter import is_formatted
+from .formatter import tracer, write_file, write_stream
+from .profiler import call_profiled, profiler
+from .reporter import get_reporter, OUTPUT_FORMATS, Reporter
 from .syntax_tree import SyntaxTree
 
 # setting logger
@@ -18,13 +32,73 @@ logger = logging.getLogger(__name__)
               type=click.Path(),
               help='Path to the config file that will be the authoritative config source.')
 @click.option('--format', '-f', 'is_format', is_flag=True, help='Prints formatted sql and exist')
-def main(files, config_file, is_format):
+@click.option('--cache-dir', 'cache_dir',
+              type=click.Path(file_okay=False),
+              help='Directory to cache results of unchanged files across runs.')
+@click.option('--cache-max-age', 'cache_max_age', type=float, default=DEFAULT_MAX_AGE / (24 * 60 * 60),
+              show_default=True, help='Days to keep cache entries.')
+@click.option('--cache-max-size', 'cache_max_size', type=float, default=DEFAULT_MAX_SIZE / (1024 * 1024),
+              show_default=True, help='Max total size of cache entries in MB.')
+@click.option('--output-format', 'output_format',
+              type=click.Choice(OUTPUT_FORMATS), default='text', show_default=True,
+              help='Format of violations.')
+@click.option('--output-file', '-o', 'output_file',
+              type=click.Path(dir_okay=False),
+              help='Path to the file violations are written to. (default: stdout)')
+@click.option('--profile', 'is_profile', is_flag=True, help='Prints elapsed time of each stage and each rule.')
+@click.option('--profile-json', 'profile_json',
+              type=click.Path(dir_okay=False),
+              help='Path to the file profiling stats are written to as json.')
+@click.option('--trace-format', 'trace_format',
+              type=click.Path(dir_okay=False),
+              help='Path to the file decisions of formatter, which splitter split each line and widths of lines, '
+                   'are written to as json.')
+@click.option('--baseline', 'baseline_file',
+              type=click.Path(dir_okay=False),
+              help='Path to the baseline file. Violations recorded in it are not reported.')
+@click.option('--write-baseline', 'is_write_baseline', is_flag=True,
+              help='Records current violations to the baseline file instead of reporting them.')
+@click.option('--stream', 'is_stream', is_flag=True,
+              help='Checks files line by line without building syntax tree, which runs token-local rules only. '
+                   'With --format, each statement is formatted and written as soon as it is read.')
+@click.option('--fail-fast', 'is_fail_fast', is_flag=True,
+              help='Stops the whole run at the first violation, and exits with status 1.')
+@click.option('--max-violations', 'max_violations', type=click.IntRange(min=1),
+              help='Stops checking a file after N violations, and exits with status 1 if any violation is found.')
+@click.option('--check', 'is_check', is_flag=True,
+              help='Checks whether files are already formatted, and exits with status 1 if any file would change.')
+@click.option('--diff', 'is_diff', is_flag=True, help='Prints unified diff of formatting each file.')
+@click.option('--in-place', '-i', 'is_in_place', is_flag=True,
+              help='Rewrites files with formatted sql, skipping files which are already formatted.')
+@click.option('--jobs', '-j', 'jobs', type=click.IntRange(min=1),
+              help='The number of processes formatting files, or statements of each file with --format, '
+                   'in parallel. (default: the number of CPUs, or 1 with --format)')
+def main(files, config_file, is_format, cache_dir, cache_max_age, cache_max_size, output_format, output_file,
+         is_profile, profile_json, trace_format, baseline_file, is_write_baseline, is_stream, is_fail_fast, max_violations,
+         is_check, is_diff, is_in_place, jobs):
     """
 
     Args:
         files:
         config_file: path to the user config file.
         is_format: the flage whether outputs formatted sql
+        cache_dir: path to the cache directory. If this is None, results are not cached.
+        cache_max_age: days to keep cache entries
+        cache_max_size: max total size of cache entries in MB
+        output_format: format of violations
+        output_file: path to the file violations are written to. If this is None, writes to stdout.
+        is_profile: the flag whether prints profiling summary
+        profile_json: path to the file profiling stats are written to
+        trace_format: path to the file decisions of formatter are written to
+        baseline_file: path to the baseline file
+        is_write_baseline: the flag whether records violations to the baseline file
+        is_stream: the flag whether checks (or formats) files in streaming mode
+        is_fail_fast: the flag whether stops the whole run at the first violation
+        max_violations: the number of violations checking a file is stopped after
+        is_check: the flag whether checks files are already formatted
+        is_diff: the flag whether prints diff of formatting
+        is_in_place: the flag whether rewrites files with formatted sql
+        jobs: the number of processes formatting files in parallel
 
     Returns:
 
@@ -34,9 +108,407 @@ def main(files, config_file, is_format):
         # Todo: search *.sql file in current directory recursively.
         return
 
+    if is_profile or profile_json is not None:
+        profiler.enable()
+
+    _validate_options(is_format, is_check, is_diff, is_in_place, baseline_file, is_write_baseline, is_stream,
+                      is_fail_fast, max_violations, jobs, trace_format)
+
+    if trace_format is not None:
+        tracer.enable()
+        # cached files are not formatted, so nothing would be traced
+        cache_dir = None
+
+    is_compare = is_check or is_diff
+
+    # gating modes exit with status 1 if any violation or unformatted file is reported.
+    is_gating = is_fail_fast or max_violations is not None or is_check
+    if is_fail_fast:
+        max_violations = 1
+
     config = Config(config_file)
-    trees: Dict[str, SyntaxTree] = {}
-    # constructs syntax tree in each files
+
+    baseline: Optional[Baseline] = None
+    if is_write_baseline:
+        baseline = Baseline()
+    elif baseline_file is not None:
+        baseline = _load_baseline(baseline_file)
+
+    if is_stream:
+        _warn_stream_mode(cache_dir, is_format)
+        cache_dir = None
+
+    cache: Optional[ResultCache] = None
+    if cache_dir is not None:
+        cache = ResultCache(cache_dir, config, rules=[c.__name__ for c in get_checkers()],
+                            plugins=get_plugin_versions())
+
+    stream = sys.stdout if output_file is None else open(output_file, 'w', encoding='utf-8')
+    reporter = get_reporter(output_format, stream)
+
+    try:
+        if is_in_place:
+            _format_files_in_place(files, config, cache, jobs)
+            reported = 0
+        elif is_compare:
+            reported = _compare_files(files, config, stream, is_check, is_diff, cache, jobs)
+        else:
+            reported = _process_files(
+                files, config, reporter, is_format, is_stream, cache, baseline, is_write_baseline,
+                max_violations, is_fail_fast, jobs)
+    finally:
+        if output_file is not None:
+            stream.close()
+
+    if is_write_baseline:
+        baseline.save(baseline_file)
+        logger.info(f'{len(baseline)} violations are written to {baseline_file}')
+
+    if cache is not None:
+        cache.prune(max_age=cache_max_age * 24 * 60 * 60, max_size=int(cache_max_size * 1024 * 1024))
+
+    _write_diagnostics(is_profile, profile_json, trace_format)
+
+    if is_gating and reported > 0:
+        sys.exit(1)
+
+
+def _load_baseline(baseline_file: str) -> Baseline:
+    """Loads baseline file, and raises BadParameter if it cannot be loaded
+
+    Args:
+        baseline_file: path to the baseline file
+
+    Returns:
+        known violations
+    """
+
+    try:
+        with profiler.timer('baseline', 'load'):
+            return Baseline.load(baseline_file)
+    except (OSError, ValueError) as e:
+        raise click.BadParameter(f'failed to load baseline file: {e}', param_hint='--baseline')
+
+
+def _write_diagnostics(is_profile: bool, profile_json: Optional[str], trace_format: Optional[str]):
+    """Writes profiling stats and the trace of formatter, if they are requested
+
+    Args:
+        is_profile: the flag whether prints profiling summary
+        profile_json: path to the file profiling stats are written to
+        trace_format: path to the file decisions of formatter are written to
+    """
+
+    if is_profile:
+        logger.info(profiler.summary())
+    if profile_json is not None:
+        with open(profile_json, 'w', encoding='utf-8') as fp:
+            json.dump(profiler.dump(), fp, indent=2)
+    if trace_format is not None:
+        with open(trace_format, 'w', encoding='utf-8') as fp:
+            json.dump(tracer.dump(), fp, indent=2)
+
+
+def _validate_options(is_format: bool,
+                      is_check: bool,
+                      is_diff: bool,
+                      is_in_place: bool,
+                      baseline_file: Optional[str],
+                      is_write_baseline: bool,
+                      is_stream: bool,
+                      is_fail_fast: bool,
+                      max_violations: Optional[int],
+                      jobs: Optional[int] = None,
+                      trace_format: Optional[str] = None):
+    """Raises UsageError if given options cannot be used together"""
+
+    if is_write_baseline and baseline_file is None:
+        raise click.UsageError('--write-baseline requires --baseline FILE')
+
+    if is_format and (is_check or is_diff):
+        raise click.UsageError('--check and --diff cannot be used with --format')
+
+    if is_in_place and (is_format or is_check or is_diff):
+        raise click.UsageError('--in-place cannot be used with --format, --check and --diff')
+
+    if (is_format or is_check or is_diff or is_in_place) and (is_fail_fast or max_violations is not None):
+        raise click.UsageError('--fail-fast and --max-violations cannot be used with formatting')
+
+    if is_stream and (is_check or is_diff or is_in_place):
+        raise click.UsageError('--stream cannot be used with --check, --diff and --in-place')
+
+    if is_stream and is_format and jobs is not None:
+        raise click.UsageError('--jobs cannot be used with --stream --format, which formats statements serially')
+
+    if trace_format is not None and not is_format:
+        raise click.UsageError('--trace-format requires --format')
+
+    if trace_format is not None and jobs is not None and jobs > 1:
+        raise click.UsageError('--trace-format cannot be used with --jobs, because statements are traced serially')
+
+
+def _process_files(files,
+                   config: Config,
+                   reporter: Reporter,
+                   is_format: bool,
+                   is_stream: bool,
+                   cache: Optional[ResultCache],
+                   baseline: Optional[Baseline],
+                   is_write_baseline: bool,
+                   max_violations: Optional[int] = None,
+                   is_fail_fast: bool = False,
+                   jobs: Optional[int] = None) -> int:
+    """Processes files one by one: read -> parse -> check(format) -> emit,
+    so that only one syntax tree is alive at a time.
+
+    Args:
+        files: paths given by command line
+        config:
+        reporter: reporter which violations are written by
+        is_format: the flag whether outputs formatted sql
+        is_stream: the flag whether checks (or formats) files in streaming mode
+        cache: result cache, if it is used
+        baseline: known violations which are not reported, if baseline file is given
+        is_write_baseline: If this is True, violations are added to baseline instead of being reported.
+        max_violations: the number of violations checking a file is stopped after
+        is_fail_fast: If this is True, the rest of files are skipped after a violation is reported.
+        jobs: the number of processes formatting statements of each file
+
+    Returns:
+        the number of reported violations
+    """
+
+    reported = 0
+    if not is_format:
+        reporter.start()
+
+    for f in _iter_files(files):
+        profiler.count('files')
+        if is_format:
+            tracer.start(f)
+
+        if is_stream and is_format:
+            _format_stream_file(f, config, reporter.stream)
+        elif is_stream:
+            reported += _check_stream_file(f, config, reporter, baseline, is_write_baseline, max_violations)
+        else:
+            with profiler.timer('read'):
+                with open(f, 'r') as fp:
+                    sql = fp.read()
+
+            if is_format:
+                _format_file(sql, config, reporter.stream, cache, jobs)
+            else:
+                reported += _check_file(f, sql, config, reporter, cache, baseline, is_write_baseline, max_violations)
+
+        if is_fail_fast and reported > 0:
+            break
+
+    if not is_format:
+        reporter.finish()
+
+    return reported
+
+
+def _compare_files(files, config: Config, stream: TextIO, is_check: bool, is_diff: bool,
+                   cache: Optional[ResultCache] = None, jobs: Optional[int] = None) -> int:
+    """Compares files with formatted sql in parallel, and reports files which would change
+
+    Args:
+        files: paths given by command line
+        config:
+        stream: file object results are written to
+        is_check: the flag whether reports files which would change
+        is_diff: the flag whether prints unified diff
+        cache: result cache, if it is used
+        jobs: the number of processes. If this is None, the number of CPUs.
+
+    Returns:
+        the number of files which would change
+    """
+
+    paths = list(_iter_files(files))
+    results = _map_files(_compare_file, [(f, config, is_diff, cache) for f in paths], jobs)
+    changed = _report_compared(results, stream, is_check)
+
+    if is_check:
+        logger.info(f'{changed} of {len(paths)} files would be reformatted')
+
+    return changed
+
+
+def _format_files_in_place(files, config: Config, cache: Optional[ResultCache] = None,
+                           jobs: Optional[int] = None) -> int:
+    """Rewrites files with formatted sql in parallel
+
+    Args:
+        files: paths given by command line
+        config:
+        cache: result cache, if it is used
+        jobs: the number of processes. If this is None, the number of CPUs.
+
+    Returns:
+        the number of rewritten files
+    """
+
+    paths = list(_iter_files(files))
+    changed = 0
+    for f, is_changed in _map_files(_format_file_in_place, [(f, config, cache) for f in paths], jobs):
+        if is_changed:
+            changed += 1
+            logger.info(f'reformatted {f}')
+
+    logger.info(f'{changed} of {len(paths)} files reformatted')
+
+    return changed
+
+
+def _map_files(func: Callable, tasks: List[Tuple], jobs: Optional[int] = None) -> Iterator:
+    """Applies func to tasks of files in a process pool, and yields results in order of tasks
+
+    Profiling stats collected in worker processes are aggregated into profiler of this process.
+
+    Args:
+        func: top-level function, which can be pickled to worker processes
+        tasks: arguments of func for each file
+        jobs: the number of processes. If this is None, the number of CPUs.
+
+    Returns:
+        iterator of results
+    """
+
+    jobs = min(jobs or os.cpu_count() or 1, len(tasks))
+    if jobs <= 1:
+        yield from map(func, tasks)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        results = executor.map(call_profiled, [profiler.enabled] * len(tasks), [func] * len(tasks), tasks,
+                               chunksize=max(1, len(tasks) // (jobs * 4)))
+        for result, stats in results:
+            profiler.merge(stats)
+            yield result
+
+
+def _report_compared(results: Iterator[Tuple[str, bool, List[str]]], stream: TextIO, is_check: bool) -> int:
+    """Writes results of _compare_file() in order of files, and returns the number of files which would change"""
+
+    changed = 0
+    for f, is_changed, diff_lines in results:
+        if not is_changed:
+            continue
+
+        changed += 1
+        if is_check:
+            stream.write(f'{f}: would be reformatted\n')
+        stream.writelines(diff_lines)
+
+    return changed
+
+
+def _compare_file(task: Tuple[str, Config, bool, Optional[ResultCache]]) -> Tuple[str, bool, List[str]]:
+    """Compares a file with formatted sql, which runs in worker processes
+
+    Args:
+        task: path of the file, config, the flag whether returns unified diff and result cache
+
+    Returns:
+        path of the file, whether it would change and lines of unified diff
+    """
+
+    f, config, is_diff, cache = task
+    profiler.count('files')
+    with profiler.timer('read'):
+        with open(f, 'r') as fp:
+            sql = fp.read()
+
+    if _is_known_formatted(sql, cache):
+        return f, False, []
+
+    tree = SyntaxTree.sqlptree(sql, is_abstract=True)
+    if is_diff:
+        diff_lines = diff_formatted(tree, config, sql, f)
+        is_changed = len(diff_lines) > 0
+    else:
+        diff_lines = []
+        is_changed = not is_formatted(tree, config, sql)
+
+    if not is_changed:
+        _record_formatted(sql, cache)
+
+    return f, is_changed, diff_lines
+
+
+def _format_file_in_place(task: Tuple[str, Config, Optional[ResultCache]]) -> Tuple[str, bool]:
+    """Rewrites a file with formatted sql, which runs in worker processes
+
+    The file is replaced atomically by a temporary file in the same directory,
+    and it is not touched if formatted sql is the same as the file.
+
+    Args:
+        task: path of the file, config and result cache
+
+    Returns:
+        path of the file and whether it is rewritten
+    """
+
+    f, config, cache = task
+    profiler.count('files')
+    with profiler.timer('read'):
+        with open(f, 'r') as fp:
+            sql = fp.read()
+
+    if _is_known_formatted(sql, cache):
+        return f, False
+
+    tree = SyntaxTree.sqlptree(sql, is_abstract=True)
+    buffer = io.StringIO()
+    comparator = Comparator(sql, buffer=buffer)
+    write_file(tree, config, comparator)
+    if not comparator.is_changed:
+        _record_formatted(sql, cache)
+        return f, False
+
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(f)), prefix='.sqlint-', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as fp:
+            fp.write(buffer.getvalue())
+        # mkstemp creates the file readable only by owner
+        os.chmod(tmp, os.stat(f).st_mode & 0o7777)
+        os.replace(tmp, f)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+    return f, True
+
+
+def _warn_stream_mode(cache_dir: Optional[str], is_format: bool = False):
+    """Warns about features which are not available in streaming mode
+
+    Args:
+        cache_dir: path to the cache directory given by command line
+        is_format: the flag whether formats files, which runs no rules
+    """
+
+    skipped = [] if is_format else [c.__name__ for c in get_checkers() if not c.is_token_local]
+    if skipped:
+        logger.warning(f'{", ".join(skipped)} are disabled in streaming mode')
+
+    if cache_dir is not None:
+        logger.warning('results are not cached in streaming mode')
+
+
+def _iter_files(files) -> Iterator[str]:
+    """Yields paths of files to be processed, skipping missing files and directories
+
+    Args:
+        files: paths given by command line
+
+    Returns:
+        iterator of file paths
+    """
+
     for f in files:
         if not os.path.exists(f):
             logger.warning(f'file is not found: {f}')
@@ -46,21 +518,219 @@ def main(files, config_file, is_format):
             logger.warning(f'{f} is a directory')
             continue
 
-        with open(f, 'r') as fp:
-            if is_format:
-                # constructs syntax tree
-                trees[f] = SyntaxTree.sqlptree(fp.read(), is_abstract=True)
-            else:
-                trees[f] = SyntaxTree.sqlptree(fp.read())
+        yield f
 
-    for file, tree in trees.items():
-        if is_format:
-            formatted_tree = format_tree(tree, config)
-            logger.info(formatted_tree.sqlftree())
-        else:
-            tree.sqlftree()
-            for v in sorted(check_tree(tree, config)):
-                logger.info('{} {}'.format(file, v))
+
+def _check_file(file: str,
+                sql: str,
+                config: Config,
+                reporter: Reporter,
+                cache: Optional[ResultCache] = None,
+                baseline: Optional[Baseline] = None,
+                is_write_baseline: bool = False,
+                max_violations: Optional[int] = None) -> int:
+    """Checks sql statement and emits violations
+
+    Args:
+        file: path to the file
+        sql: sql statement in the file
+        config:
+        reporter: reporter which violations are written by
+        cache: result cache, if it is used
+        baseline: known violations which are not reported
+        is_write_baseline: If this is True, violations are added to baseline instead of being reported.
+        max_violations: the number of violations checking is stopped after
+
+    Returns:
+        the number of reported violations
+    """
+
+    result: Optional[Dict] = None
+    if cache is not None:
+        key = cache.key(sql, 'check')
+        result = cache.get(key)
+        profiler.count('cache.miss' if result is None else 'cache.hit')
+
+    if result is None:
+        tree = SyntaxTree.sqlptree(sql)
+        budget = Budget(_get_budget_limit(max_violations, baseline, is_write_baseline))
+        violations = sorted(check_tree(tree, config, budget))
+        result = {'violations': [
+            dict(v.to_dict(), fingerprint=fp) for v, fp in zip(violations, fingerprint(violations))]}
+        # cancelled result is incomplete
+        if cache is not None and not budget.is_cancelled:
+            cache.put(key, result)
+
+    violations = result['violations']
+    if baseline is not None:
+        if is_write_baseline:
+            baseline.add(file, violations)
+            return 0
+
+        with profiler.timer('baseline', 'filter'):
+            violations = baseline.filter(file, violations)
+
+    if max_violations is not None:
+        violations = violations[:max_violations]
+
+    with profiler.timer('emit'):
+        reporter.report(file, violations)
+
+    return len(violations)
+
+
+def _get_budget_limit(max_violations: Optional[int],
+                      baseline: Optional[Baseline],
+                      is_write_baseline: bool) -> Optional[int]:
+    """Returns the number of violations checking can be cancelled after.
+
+    Violations known in baseline are not reported, and all violations are needed to write baseline,
+    so that checking is not cancelled in these cases.
+    """
+
+    if is_write_baseline or (baseline is not None and len(baseline) > 0):
+        return None
+
+    return max_violations
+
+
+def _check_stream_file(file: str,
+                       config: Config,
+                       reporter: Reporter,
+                       baseline: Optional[Baseline] = None,
+                       is_write_baseline: bool = False,
+                       max_violations: Optional[int] = None) -> int:
+    """Checks the file line by line and emits violations as soon as they are found
+
+    Args:
+        file: path to the file
+        config:
+        reporter: reporter which violations are written by
+        baseline: known violations which are not reported
+        is_write_baseline: If this is True, violations are added to baseline instead of being reported.
+        max_violations: the number of violations checking is stopped after
+
+    Returns:
+        the number of reported violations
+    """
+
+    # occurrence counters of fingerprints, which are carried over lines
+    occurrences: Dict[str, int] = {}
+    reported = 0
+    budget = Budget(_get_budget_limit(max_violations, baseline, is_write_baseline))
+
+    with open(file, 'r') as fp:
+        for violations in check_stream(fp, config, budget=budget):
+            if not violations:
+                continue
+
+            violation_list = [
+                dict(v.to_dict(), fingerprint=f)
+                for v, f in zip(violations, fingerprint(violations, occurrences))]
+
+            if baseline is not None:
+                if is_write_baseline:
+                    baseline.add(file, violation_list)
+                    continue
+
+                with profiler.timer('baseline', 'filter'):
+                    violation_list = baseline.filter(file, violation_list)
+
+            if max_violations is not None:
+                violation_list = violation_list[:max_violations - reported]
+
+            with profiler.timer('emit'):
+                reporter.report(file, violation_list)
+            reported += len(violation_list)
+
+            if max_violations is not None and reported >= max_violations:
+                # stops reading the rest of lines
+                budget.cancel()
+
+    return reported
+
+
+def _format_stream_file(file: str, config: Config, stream: TextIO):
+    """Formats the file statement by statement, and writes each of them as soon as it is read
+
+    Args:
+        file: path to the file
+        config:
+        stream: file object formatted sql is written to
+    """
+
+    with open(file, 'r') as fp:
+        write_stream(fp, config, stream)
+    stream.write('\n')
+
+
+def _format_file(sql: str, config: Config, stream: TextIO, cache: Optional[ResultCache] = None,
+                 jobs: Optional[int] = None):
+    """Formats sql statement and writes it to stream
+
+    Without cache, formatted lines are written as soon as they are formatted.
+
+    Args:
+        sql: sql statement in the file
+        config:
+        stream: file object formatted sql is written to
+        cache: result cache, if it is used
+        jobs: the number of processes formatting statements. If this is None, they are formatted serially.
+    """
+
+    result: Optional[Dict] = None
+    if cache is not None:
+        key = cache.key(sql, 'format')
+        result = {'formatted': sql} if _is_known_formatted(sql, cache) else cache.get(key)
+        profiler.count('cache.miss' if result is None else 'cache.hit')
+
+    if result is None:
+        tree = SyntaxTree.sqlptree(sql, is_abstract=True)
+        if cache is None:
+            write_file(tree, config, stream, jobs or 1)
+            return
+
+        buffer = io.StringIO()
+        write_file(tree, config, buffer, jobs or 1)
+        result = {'formatted': buffer.getvalue()}
+        cache.put(key, result)
+        if result['formatted'] == sql:
+            _record_formatted(sql, cache)
+
+    with profiler.timer('emit'):
+        stream.write(result['formatted'])
+
+
+def _is_known_formatted(sql: str, cache: Optional[ResultCache]) -> bool:
+    """Returns whether sql is recorded as already formatted, so that it is not formatted again
+
+    Args:
+        sql: sql statement in the file
+        cache: result cache, if it is used
+
+    Returns:
+        True if sql has been formatted to itself with the same version and config
+    """
+
+    if cache is None:
+        return False
+
+    return cache.get(cache.key(sql, 'formatted')) is not None
+
+
+def _record_formatted(sql: str, cache: Optional[ResultCache]):
+    """Records fingerprint of sql which formatting does not change
+
+    Output of formatting is not recorded as formatted unless formatting it again is observed not to change it,
+    because formatter is not idempotent for some statements yet.
+
+    Args:
+        sql: sql statement which is the same as its formatted sql
+        cache: result cache, if it is used
+    """
+
+    if cache is not None:
+        cache.put(cache.key(sql, 'formatted'), {'is_formatted': True})
 
 
 if __name__ == '__main__':
@@ -1,3 +1,5 @@
+import hashlib
+import json
 import os
 import logging
 import warnings
@@ -145,3 +147,18 @@ class Config:
             return 4
 
         return self.loader.get('indent-steps')
+
+    @property
+    def digest(self) -> str:
+        """Returns hash of effective config values.
+
+        Two configs having same digest produce same results in checking and formatting.
+        """
+        values = {
+            'max-line-length': self.max_line_length,
+            'comma-position': self.comma_position,
+            'keyword-style': self.keyword_style,
+            'indent-steps': self.indent_steps,
+        }
+
+        return hashlib.sha256(json.dumps(values, sort_keys=True).encode('utf-8')).hexdigest()
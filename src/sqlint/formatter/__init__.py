@@ -1,5 +1,21 @@
-from .base import format
+from .base import format, write
+from .compare import diff, is_formatted, Comparator
+from .emitter import Emitter
+from .statement import format_range, write_file, write_statements, write_stream, TextEdit
+from .trace import tracer, Tracer
 
 __all__ = [
-    'format'
+    'format',
+    'write',
+    'write_statements',
+    'write_file',
+    'write_stream',
+    'format_range',
+    'TextEdit',
+    'diff',
+    'is_formatted',
+    'Comparator',
+    'Emitter',
+    'tracer',
+    'Tracer',
 ]
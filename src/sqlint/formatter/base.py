@@ -1,13 +1,29 @@
-import logging
-from typing import List, Tuple
+from itertools import chain
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
 
 from . import splitter as spt
 from . import formatter as fmt
+from .emitter import Emitter
+from .span import TokenSpan
+from .trace import tracer
 from sqlint.config import Config
 from sqlint.parser import Token
+from sqlint.profiler import profiler
 from sqlint.syntax_tree import SyntaxTree
 
-logger = logging.getLogger(__name__)
+# (own, children, sibling) tokens split from a leaf
+Split = Tuple[TokenSpan, List[TokenSpan], TokenSpan]
+
+# splitter names corresponding to kind of head token, which are used in profiling
+SPLITTER_NAMES = {
+    Token.KEYWORD: spt.KeywordSplitter.__name__,
+    Token.FUNCTION: spt.KeywordSplitter.__name__,
+    Token.COMMA: spt.CommaSplitter.__name__,
+    Token.IDENTIFIER: spt.IdentifierSplitter.__name__,
+    Token.BRACKET_LEFT: spt.Splitter.__name__,
+    Token.OPERATOR: spt.Splitter.__name__,
+    Token.BRACKET_RIGHT: spt.RightBrackerSplitter.__name__,
+}
 
 
 def format(tree: SyntaxTree, config: Config) -> SyntaxTree:
@@ -23,25 +39,89 @@ def format(tree: SyntaxTree, config: Config) -> SyntaxTree:
         re-formatted tree
     """
 
+    root = _new_root(tree)
+
+    # reshapes tree
+    with profiler.timer('format', 'reshape'):
+        _reshape_tree(root.leaves[0], config)
+
+    # for examples inserting indent or whitespaces, re-formating keyword and positioning comma, etc
+    _format_tree(root, config)
+
+    return root
+
+
+def write(tree: SyntaxTree, config: Config, stream: TextIO):
+    """Formats syntax tree and writes formatted sql to stream
+
+    Each top-level line is formatted as soon as it and its descendants are reshaped, and is written
+    and released as soon as it is formatted, so that neither the formatted tree nor whole of formatted sql
+    is kept. Written text is the same as format(tree, config).sqlftree().
+
+    Note: This is bang method.
+
+    Args:
+        tree: target SyntaxTree
+        config:
+        stream: file object formatted sql is written to
+    """
+
+    _write_root(_new_root(tree), config, Emitter(stream))
+
+
+def _write_root(root: SyntaxTree, config: Config, emitter: Emitter,
+                splits: Optional[Dict[int, Split]] = None, is_end: bool = True):
+    """Reshapes and formats the root having single leaf, and writes its lines to emitter
+
+    Args:
+        root: tree having single leaf, which has all tokens
+        config:
+        emitter:
+        splits: splits of top-level leaves given instead of splitting their tokens, keyed by their start
+        is_end: whether tokens are at end of sql, which are followed by a blank line
+    """
+
+    def emit(leaf: SyntaxTree, is_blank: bool):
+        emitter.write_leaf(leaf)
+        if is_blank:
+            emitter.write_leaf(SyntaxTree(depth=1, line_num=0))
+        leaf.leaves = []
+
+    with profiler.timer('format', 'lines'):
+        _format_leaves(
+            root, _iter_reshaped(root.leaves[0], config, splits),
+            config.keyword_style, config.comma_position, config.indent_steps, True, emit, is_end)
+
+    if is_end:
+        # blank line at end of leaves
+        emitter.write_leaf(SyntaxTree(depth=1, line_num=0))
+
+
+def _new_root(tree: SyntaxTree) -> SyntaxTree:
+    """Returns new tree having single leaf, which has all tokens of the tree"""
+
     if not tree.is_abstract:
         raise ValueError('Failed to format, because target SyntaxTree is not Abstract')
 
+    with profiler.timer('format', 'gather'):
+        tokens = _gather_tokens(tree)
+
+    return _root_of(tokens)
+
+
+def _root_of(tokens: List[Token]) -> SyntaxTree:
+    """Returns new tree having single leaf, which has the tokens"""
+
     # create a tree having single leaf
     root: SyntaxTree = SyntaxTree(depth=0, line_num=0, is_abstract=True)
     leaf: SyntaxTree = SyntaxTree(
                         depth=1,
                         line_num=1,
-                        tokens=_gather_tokens(tree),
+                        tokens=tokens,
                         parent=root,
                         is_abstract=True)
     root.add_leaf(leaf)
 
-    # reshapes tree
-    _reshape_tree(leaf, config)
-
-    # for examples inserting indent or whitespaces, re-formating keyword and positioning comma, etc
-    _format_tree(root, config)
-
     return root
 
 
@@ -64,54 +144,116 @@ def _gather_tokens(tree: SyntaxTree) -> List[Token]:
 
 
 def _reshape_tree(tree: SyntaxTree, config: Config):
-    own, children, sibling = _split_tokens(tree)
-    siblings = [sibling]
+    """Reshapes a leaf having all tokens into lines.
 
-    # f own and own[0].word.lower() == 'date_diff':
-    logger.debug(f'\033[32mown\033[0m = {own}')
-    logger.debug(f'\033[32mchildren\033[0m = {children}')
-    logger.debug(f'\033[32msibling\033[0m = {sibling}')
+    Args:
+        tree: leaf having all tokens
+        config:
+    """
+
+    for _ in _iter_reshaped(tree, config):
+        pass
+
+
+def _iter_reshaped(tree: SyntaxTree, config: Config,
+                   splits: Optional[Dict[int, Split]] = None) -> Iterator[SyntaxTree]:
+    """Reshapes a leaf having all tokens into lines, and yields each top-level leaf once it and its
+    descendants are reshaped.
+
+    Tokens are handed over as TokenSpan of the shared token list, and leaves are created
+    by an explicit worklist in the same order as depth-first recursion, so that reshaping
+    is linear in tokens and is not limited by recursion depth.
+
+    Args:
+        tree: leaf having all tokens
+        config:
+        splits: splits of top-level leaves given instead of splitting their tokens, keyed by their start
+
+    Returns:
+        iterator of top-level leaves
+    """
 
-    tree.tokens = own
+    tree.tokens = TokenSpan(tree.tokens)
+    root = tree.parent
+    if tracer.enabled:
+        tracer.root(len(tree.tokens), config.max_line_length)
+    top = tree
+    if splits is None:
+        splits = {}
+
+    # stack of (tokens, depth, parent) of leaves to create, whose top is created first
+    stack: List[Tuple[TokenSpan, int, SyntaxTree]] = []
+    while True:
+        split = splits.get(tree.tokens.start) if tree.parent is root else None
+        children, siblings = _reshape_leaf(tree, config, split)
+
+        for sbg in reversed(siblings):
+            if sbg:
+                stack.append((sbg, tree.depth, tree.parent))
+        for chn in reversed(children):
+            if chn:
+                stack.append((chn, tree.depth+1, tree))
+
+        if not stack:
+            break
+
+        tokens, depth, parent = stack.pop()
+        if parent is root:
+            # the previous top-level leaf has no more descendants
+            yield top
+
+        tree = SyntaxTree(
+            depth=depth,
+            line_num=0,
+            tokens=tokens,
+            parent=parent,
+            is_abstract=True)
+        parent.add_leaf(tree)
+        if parent is root:
+            top = tree
+
+    yield top
+
+
+def _reshape_leaf(tree: SyntaxTree, config: Config,
+                  split: Optional[Split] = None) -> Tuple[List[TokenSpan], List[TokenSpan]]:
+    """Splits tokens of the leaf, and leaves own tokens on it.
 
-    # checks tokens(line) length
-    tokens_and_spaces = fmt.WhiteSpacesFormatter.format_tokens(own)
-    length = sum([len(tkn) for tkn in tokens_and_spaces]) + config.indent_steps*(tree.depth-1)
+    Args:
+        tree: leaf whose tokens are TokenSpan
+        config:
+        split: (own, children, sibling) of the leaf given instead of splitting its tokens
+
+    Returns:
+        tokens of children and siblings to create
+    """
+    own, children, sibling = _split_tokens(tree) if split is None else split
+    siblings = [sibling]
+
+    # checks tokens(line) length, which is measured only until it exceeds max length
+    indent = config.indent_steps*(tree.depth-1)
     max_length = config.max_line_length
+    length = fmt.WhiteSpacesFormatter.line_width(own, limit=max_length-indent) + indent
+
+    if tracer.enabled:
+        # length is measured only until it exceeds max length
+        width = length if length <= max_length else fmt.WhiteSpacesFormatter.line_width(own) + indent
+        tracer.split(SPLITTER_NAMES.get(own[0].kind, 'Other') if own else 'Other',
+                     tree.depth, own, children, siblings, width)
 
     if length > max_length:
-        _o, _c, _s = spt.LongLineSplitter.split(own, tree)
-        """DEBUG
-        if own and own[0].word.lower() == 'date_diff':
-            logger.debug(f'    \033[92m_o\033[0m = {_o}')
-            logger.debug(f'    \033[92m_c\033[0m = {_c}')
-            logger.debug(f'    \033[92m_s\033[0m = {_s}')
-        """
-        tree.tokens = _o
+        with profiler.timer('split', spt.LongLineSplitter.__name__):
+            _o, _c, _s = spt.LongLineSplitter.split_lines(own, tree, max_length-indent)
+        if tracer.enabled:
+            tracer.split(spt.LongLineSplitter.__name__, tree.depth, _o, _c, _s,
+                         fmt.WhiteSpacesFormatter.line_width(_o) + indent)
+        own = _o
         children = _c + children
-        siblings.insert(0, _s)
-
-    for chn in children:
-        if chn:
-            _tree: SyntaxTree = SyntaxTree(
-                depth=tree.depth+1,
-                line_num=0,
-                tokens=chn,
-                parent=tree,
-                is_abstract=True)
-            tree.add_leaf(_tree)
-            _reshape_tree(_tree, config)
-
-    for sbg in siblings:
-        if sbg:
-            _tree: SyntaxTree = SyntaxTree(
-                depth=tree.depth,
-                line_num=0,
-                tokens=sbg,
-                parent=tree.parent,
-                is_abstract=True)
-            tree.parent.add_leaf(_tree)
-            _reshape_tree(_tree, config)
+        siblings = _s + siblings
+
+    tree.tokens = list(own)
+
+    return children, siblings
 
 
 def _split_tokens(tree: SyntaxTree) -> Tuple[List[Token], List[List[Token]], List[Token]]:
@@ -128,6 +270,16 @@ def _split_tokens(tree: SyntaxTree) -> Tuple[List[Token], List[List[Token]], Lis
     if not tokens:
         return [], [], []
 
+    if not profiler.enabled:
+        return _split_tokens_by_head(tokens, tree)
+
+    with profiler.timer('split', SPLITTER_NAMES.get(tokens[0].kind, 'Other')):
+        return _split_tokens_by_head(tokens, tree)
+
+
+def _split_tokens_by_head(tokens: List[Token], tree: SyntaxTree) -> Tuple[List[Token], List[List[Token]], List[Token]]:
+    """Splits tokens by splitter corresponding to kind of head token"""
+
     if tokens[0].kind in [Token.KEYWORD, Token.FUNCTION]:
         return spt.KeywordSplitter.split(tokens, tree)
     elif tokens[0].kind == Token.COMMA:
@@ -147,15 +299,81 @@ def _split_tokens(tree: SyntaxTree) -> Tuple[List[Token], List[List[Token]], Lis
 
 
 def _format_tree(tree: SyntaxTree, config: Config):
-    # formetter order is important
-    formatter_list = [
-        fmt.KeywordStyleFormatter,
-        fmt.JoinFormatter,
-        fmt.CommaPositionFormatter,
-        fmt.IndentStepsFormatter,
-        fmt.BlankLineFormatter,
-        fmt.WhiteSpacesFormatter,
-    ]
-
-    for formatter in formatter_list:
-        formatter.format(tree, config)
+    """Formats all lines of the tree in a single traversal
+
+    Each line is formatted in the same order as running formatters on whole tree one by one,
+    KeywordStyle, Join, CommaPosition, IndentSteps, BlankLine and WhiteSpaces.
+
+    Args:
+        tree: root of tree
+        config:
+    """
+
+    with profiler.timer('format', 'lines'):
+        blanks = _format_leaves(
+            tree, tree.leaves, config.keyword_style, config.comma_position, config.indent_steps, True)
+
+    with profiler.timer('format', fmt.BlankLineFormatter.__name__):
+        fmt.BlankLineFormatter.insert_blanks(tree, blanks)
+
+
+def _format_leaves(tree: SyntaxTree, leaves: Iterable[SyntaxTree], keyword_style: str, comma_position: str,
+                   indent_steps: int, is_comma_target: bool,
+                   emit: Optional[Callable[[SyntaxTree, bool], None]] = None,
+                   is_end: bool = True) -> List[bool]:
+    """Formats leaves of the tree and their descendants
+
+    Comma moves between neighbouring leaves, so leaves are formatted in a window of three:
+        1. keyword style and join of leaves[idx], before comma of the previous leaf moves to its head
+        2. comma position of leaves[idx-1]
+        3. indent, whitespaces and descendants of leaves[idx-2], after comma of the next leaf moves to its end
+
+    Args:
+        tree:
+        leaves: leaves of the tree in order, which may be yielded while they are added to the tree
+        keyword_style: config.keyword_style
+        comma_position: config.comma_position
+        indent_steps: config.indent_steps
+        is_comma_target: whether commas in leaves are positioned
+        emit: if given, called with each leaf and its blank line flag as soon as it and its descendants are formatted,
+              and then the leaf is replaced with None in leaves of the tree to release it
+        is_end: whether leaves are at end of sql, whose last leaf is followed by a blank line at end anyway
+
+    Returns:
+        flags whether a blank line is inserted after each leaf, which are only given at root depth
+    """
+
+    siblings = tree.leaves
+    is_root = tree.depth == 0
+    blanks: List[bool] = []
+    is_comma_targets: List[bool] = []
+    count = 0
+
+    # two None follow leaves to flush the window
+    for idx, leaf in enumerate(chain(leaves, (None, None))):
+        if leaf is not None:
+            count += 1
+            fmt.KeywordStyleFormatter.format_line(leaf, keyword_style)
+            fmt.JoinFormatter.format_line(leaf, keyword_style)
+
+        if 0 < idx <= count:
+            is_comma_targets.append(
+                is_comma_target and fmt.CommaPositionFormatter.format_line(siblings, idx-1, comma_position))
+
+        if 1 < idx <= count + 1:
+            leaf = siblings[idx-2]
+            fmt.IndentStepsFormatter.format_line(leaf, indent_steps)
+            if is_root:
+                # the last leaf is followed by a blank line at end of leaves anyway
+                blanks.append(fmt.BlankLineFormatter.needs_blank(leaf) and (not is_end or idx-2 < count-1))
+            if leaf.leaves:
+                _format_leaves(
+                    leaf, leaf.leaves, keyword_style, comma_position, indent_steps, is_comma_targets[idx-2])
+            fmt.WhiteSpacesFormatter.format_line(leaf)
+
+            if emit is not None:
+                emit(leaf, blanks[-1] if is_root else False)
+                # the emitted leaf is not looked at any more, so that it is released with its tokens
+                siblings[idx-2] = None
+
+    return blanks
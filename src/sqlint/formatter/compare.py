@@ -0,0 +1,111 @@
+import difflib
+import io
+from typing import List, Optional, TextIO
+
+from .statement import write_file
+from sqlint.config import Config
+from sqlint.syntax_tree import SyntaxTree
+
+
+class _Changed(Exception):
+    """Raised by Comparator to stop formatting at the first difference"""
+    pass
+
+
+class Comparator:
+    """Writable stream which compares formatted sql with source incrementally.
+
+    Each written text is compared with the source at the same position, without keeping formatted sql.
+
+    Examples:
+    ----
+    comparator = Comparator(sql)
+    write_file(tree, config, comparator)
+    comparator.is_changed
+    ----
+    """
+
+    def __init__(self, source: str, is_early_exit: bool = False, buffer: Optional[TextIO] = None):
+        """
+
+        Args:
+            source: sql in the file
+            is_early_exit: If this is True, writing raises an exception at the first difference.
+            buffer: If given, written texts are also written to it.
+        """
+        self.source: str = source
+        self.is_early_exit: bool = is_early_exit
+        self.buffer: Optional[TextIO] = buffer
+        self.position: int = 0
+        self._is_changed: bool = False
+
+    def write(self, text: str) -> int:
+        if self.buffer is not None:
+            self.buffer.write(text)
+
+        if not self._is_changed:
+            end = self.position + len(text)
+            if self.source[self.position:end] != text:
+                self._is_changed = True
+            self.position = end
+
+        if self._is_changed and self.is_early_exit:
+            raise _Changed()
+
+        return len(text)
+
+    @property
+    def is_changed(self) -> bool:
+        """Whether formatted sql written so far differs from source, or it is shorter than source"""
+        return self._is_changed or self.position != len(self.source)
+
+
+def is_formatted(tree: SyntaxTree, config: Config, source: str) -> bool:
+    """Returns whether source is already formatted, which stops formatting at the first difference
+
+    Source is compared with the formatted text of the file written by write_file().
+
+    Args:
+        tree: syntax tree of source
+        config:
+        source: sql in the file
+
+    Returns:
+        True if formatting does not change source
+    """
+
+    comparator = Comparator(source, is_early_exit=True)
+    try:
+        write_file(tree, config, comparator)
+    except _Changed:
+        return False
+
+    return not comparator.is_changed
+
+
+def diff(tree: SyntaxTree, config: Config, source: str, file: str = '') -> List[str]:
+    """Returns unified diff from source to formatted sql written by write_file()
+
+    Args:
+        tree: syntax tree of source
+        config:
+        source: sql in the file
+        file: path of the file, which is shown in headers of diff
+
+    Returns:
+        lines of unified diff, which is empty if source is already formatted
+    """
+
+    buffer = io.StringIO()
+    comparator = Comparator(source, buffer=buffer)
+    write_file(tree, config, comparator)
+    if not comparator.is_changed:
+        return []
+
+    lines = difflib.unified_diff(
+        source.splitlines(keepends=True),
+        buffer.getvalue().splitlines(keepends=True),
+        fromfile=f'a/{file}',
+        tofile=f'b/{file}')
+
+    return [line if line.endswith('\n') else f'{line}\n\\ No newline at end of file\n' for line in lines]
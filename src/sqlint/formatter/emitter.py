@@ -0,0 +1,66 @@
+from typing import TextIO
+
+from sqlint.syntax_tree import SyntaxTree
+
+
+class Emitter:
+    """Writes formatted lines to stream leaf by leaf.
+
+    Written text is the same as SyntaxTree.sqlftree() of a tree having the written leaves,
+    but neither the tree nor whole text has to be kept.
+
+    Examples:
+    ----
+    emitter = Emitter(sys.stdout)
+    for leaf in root.leaves:
+        emitter.write_leaf(leaf)
+    ----
+    """
+
+    def __init__(self, stream: TextIO, is_written: bool = False):
+        """
+
+        Args:
+            stream: file object formatted sql is written to
+            is_written: whether a non-empty text has been written before, for example by preceding statements
+        """
+        self.stream: TextIO = stream
+        # whether a non-empty text has been written, before which empty lines are dropped
+        self.is_written: bool = is_written
+
+    def write_leaf(self, leaf: SyntaxTree):
+        """Writes a line of the leaf and its descendants
+
+        Args:
+            leaf: leaf at top-level depth
+        """
+        self.is_written = self._write_line(leaf, '', self.is_written, self.stream.write)
+
+    @classmethod
+    def _write_line(cls, leaf: SyntaxTree, pending: str, is_written: bool, write) -> bool:
+        """Writes a line of the leaf and its descendants
+
+        Args:
+            leaf:
+            pending: text written before the first non-empty text
+            is_written: whether a non-empty text has been written in the siblings
+            write: write method of stream
+
+        Returns:
+            whether a non-empty text has been written in the siblings
+        """
+
+        text = leaf.text
+        if is_written:
+            write(f'\n{text}')
+        elif text:
+            write(f'{pending}{text}')
+            is_written = True
+
+        # descendants are written following a line break if any of them is not empty
+        pending = '\n' if is_written else f'{pending}\n'
+        is_child_written = False
+        for child in leaf.leaves:
+            is_child_written = cls._write_line(child, pending, is_child_written, write)
+
+        return is_written or is_child_written
@@ -1,5 +1,5 @@
 from abc import ABCMeta, abstractmethod
-from typing import List
+from typing import List, Optional, Sequence
 
 from sqlint.config import Config
 from sqlint.parser import Token
@@ -22,11 +22,15 @@ class KeywordStyleFormatter(Formatter):
     @classmethod
     def _format(cls, tree: SyntaxTree, keyword_style: str):
         for leaf in tree.leaves:
-            for token in leaf.tokens:
-                if token.kind in [Token.KEYWORD, Token.FUNCTION]:
-                    token.word = format_keyword(token.word, keyword_style)
+            cls.format_line(leaf, keyword_style)
             cls._format(leaf, keyword_style)
 
+    @staticmethod
+    def format_line(leaf: SyntaxTree, keyword_style: str):
+        for token in leaf.tokens:
+            if token.kind in [Token.KEYWORD, Token.FUNCTION]:
+                token.word = format_keyword(token.word, keyword_style)
+
 
 class JoinFormatter(Formatter):
     join_token = Token(word='JOIN', kind=Token.KEYWORD)
@@ -44,82 +48,102 @@ class JoinFormatter(Formatter):
     @classmethod
     def _format(cls, tree: SyntaxTree, stlye: str):
         for leaf in tree.leaves:
-            join_indexes = [i for i, tk in enumerate(leaf.tokens) if tk == cls.join_token]
+            cls.format_line(leaf, stlye)
+            cls._format(leaf, stlye)
+
+    @classmethod
+    def format_line(cls, leaf: SyntaxTree, stlye: str):
+        if not any(tk.kind == Token.KEYWORD and tk == cls.join_token for tk in leaf.tokens):
+            return
 
-            insert_count = 0
-            for idx in join_indexes:
-                adjusted_idx = idx + insert_count
+        # tokens are copied to a new list in a single pass, inserting a keyword before each 'JOIN'
+        tokens: List[Token] = []
+        for token in leaf.tokens:
+            if token.kind == Token.KEYWORD and token == cls.join_token:
                 # checks previous 'JOIN'
                 # When only 'JOIN' is exist, format as 'INNER JOIN'
-                if adjusted_idx == 0:
-                    leaf.tokens.insert(adjusted_idx, Token(word=format_keyword('INNER', stlye), kind=Token.KEYWORD))
-                    insert_count += 1
-                    continue
-
-                prev_token = leaf.tokens[adjusted_idx-1]
-                # valid case
-                if prev_token in [cls.inner_token, cls.cross_token, cls.outer_token]:
+                if not tokens:
+                    tokens.append(Token(word=format_keyword('INNER', stlye), kind=Token.KEYWORD))
+                elif tokens[-1] in [cls.inner_token, cls.cross_token, cls.outer_token]:
+                    # valid case
                     # When prev_token is 'OUTER' and previous it is not LEFT, RIGHT or FULL,
                     # I can't determined to insert which of these, so I ignore this illegal case.
-                    continue
-                elif prev_token in [cls.left_token, cls.right_token, cls.full_token]:
+                    pass
+                elif tokens[-1] in [cls.left_token, cls.right_token, cls.full_token]:
                     # When 'LEFT JOIN', 'RIGHT JOIN' or 'FULL JOIN', format as 'XXX OUTER JOIN'
-                    leaf.tokens.insert(adjusted_idx, Token(word=format_keyword('OUTER', stlye), kind=Token.KEYWORD))
-                    insert_count += 1
-                    continue
+                    tokens.append(Token(word=format_keyword('OUTER', stlye), kind=Token.KEYWORD))
+                else:
+                    # When only 'JOIN' is exist, format like 'INNER JOIN'
+                    tokens.append(Token(word=format_keyword('INNER', stlye), kind=Token.KEYWORD))
 
-                # When only 'JOIN' is exist, format like 'INNER JOIN'
-                leaf.tokens.insert(adjusted_idx, Token(word=format_keyword('INNER', stlye), kind=Token.KEYWORD))
-                insert_count += 1
+            tokens.append(token)
 
-            cls._format(leaf, stlye)
+        leaf.tokens = tokens
 
 
 class CommaPositionFormatter(Formatter):
     @classmethod
     def format(cls, tree: SyntaxTree, config: Config):
-        if config.comma_position == 'head':
-            cls._format_head(tree)
-        else:  # comma_position == 'end':
-            cls._format_end(tree)
+        cls._format(tree, config.comma_position)
 
     @classmethod
-    def _format_head(cls, tree: SyntaxTree):
+    def _format(cls, tree: SyntaxTree, comma_position: str):
         for idx, leaf in enumerate(tree.leaves):
-            if leaf.tokens[-1].kind != Token.COMMA:
-                cls._format_head(leaf)
-                continue
+            if cls.format_line(tree.leaves, idx, comma_position):
+                cls._format(leaf, comma_position)
 
-            # only comma in a line
-            if len(leaf.tokens) == 1:
-                continue
+    @classmethod
+    def format_line(cls, leaves: List[SyntaxTree], idx: int, comma_position: str) -> bool:
+        """Moves comma of idx-th leaf to its neighbour
+
+        Args:
+            leaves: sibling leaves
+            idx: index of the leaf
+            comma_position: 'head' or 'end'
+
+        Returns:
+            whether children of the leaf are formatted
+        """
+        if comma_position == 'head':
+            return cls._format_head(leaves, idx)
+        else:  # comma_position == 'end':
+            return cls._format_end(leaves, idx)
 
-            if idx < len(tree.leaves)-1:
-                tree.leaves[idx+1].tokens.insert(0, leaf.tokens.pop(-1))
-            # elif leaf.leaves:
-            #     leaf.leaves[0].tokens.insert(0, leaf.tokens.pop(-1))
+    @staticmethod
+    def _format_head(leaves: List[SyntaxTree], idx: int) -> bool:
+        leaf = leaves[idx]
+        if leaf.tokens[-1].kind != Token.COMMA:
+            return True
 
-            cls._format_head(leaf)
+        # only comma in a line
+        if len(leaf.tokens) == 1:
+            return False
 
-    @classmethod
-    def _format_end(cls, tree: SyntaxTree):
-        for idx, leaf in enumerate(tree.leaves):
-            # ignores comma at zero indent because it may be with-comma
-            if leaf.depth <= 1 or leaf.tokens[0].kind != Token.COMMA:
-                cls._format_end(leaf)
-                continue
+        if idx < len(leaves)-1:
+            leaves[idx+1].tokens.insert(0, leaf.tokens.pop(-1))
+        # elif leaf.leaves:
+        #     leaf.leaves[0].tokens.insert(0, leaf.tokens.pop(-1))
 
-            # only comma in a line
-            if len(leaf.tokens) == 1:
-                continue
+        return True
+
+    @staticmethod
+    def _format_end(leaves: List[SyntaxTree], idx: int) -> bool:
+        leaf = leaves[idx]
+        # ignores comma at zero indent because it may be with-comma
+        if leaf.depth <= 1 or leaf.tokens[0].kind != Token.COMMA:
+            return True
+
+        # only comma in a line
+        if len(leaf.tokens) == 1:
+            return False
 
-            poped_token = leaf.tokens.pop(0)
-            if idx > 0:
-                tree.leaves[idx-1].tokens.insert(len(tree.leaves), poped_token)
-            # elif leaf.parent and leaf.parent.depth > 0:
-            #     leaf.parent.tokens.insert(len(tree.leaves), poped_token)
+        poped_token = leaf.tokens.pop(0)
+        if idx > 0:
+            leaves[idx-1].tokens.insert(len(leaves), poped_token)
+        # elif leaf.parent and leaf.parent.depth > 0:
+        #     leaf.parent.tokens.insert(len(tree.leaves), poped_token)
 
-            cls._format_end(leaf)
+        return True
 
 
 class IndentStepsFormatter(Formatter):
@@ -129,60 +153,115 @@ class IndentStepsFormatter(Formatter):
 
     @classmethod
     def _format(cls, tree: SyntaxTree, indent_steps: int):
-        indent = ' ' * indent_steps
-
         for leaf in tree.leaves:
-            tokens = leaf.tokens
+            cls.format_line(leaf, indent_steps)
+            cls._format(leaf, indent_steps)
 
-            if tokens[0].kind == Token.WHITESPACE:
-                leaf.tokens[0].word = indent*(leaf.depth-1)
-            elif leaf.depth > 1:
-                leaf.node.insert(0, Token(word=indent*(leaf.depth-1), kind=Token.WHITESPACE))
+    @staticmethod
+    def format_line(leaf: SyntaxTree, indent_steps: int):
+        indent = ' ' * indent_steps
+        tokens = leaf.tokens
 
-            cls._format(leaf, indent_steps)
+        if tokens[0].kind == Token.WHITESPACE:
+            leaf.tokens[0].word = indent*(leaf.depth-1)
+        elif leaf.depth > 1:
+            leaf.node.insert(0, Token(word=indent*(leaf.depth-1), kind=Token.WHITESPACE))
 
 
 class WhiteSpacesFormatter(Formatter):
+    # kinds of token which whitespace is not put after
+    no_space_after = (Token.DOT, Token.BRACKET_LEFT, Token.WHITESPACE, Token.FUNCTION)
+    # kinds of token which whitespace is not put before
+    no_space_before = (Token.COMMA, Token.DOT, Token.BRACKET_RIGHT)
+
     @classmethod
     def format(cls, tree: SyntaxTree, config: Config):
         cls._format(tree)
 
     @classmethod
     def _format(cls, tree: SyntaxTree):
-        # ignores head of tokens because it is indent
         for leaf in tree.leaves:
-            leaf.node.tokens = WhiteSpacesFormatter.format_tokens(leaf.tokens)
-
+            cls.format_line(leaf)
             cls._format(leaf)
 
+    @staticmethod
+    def format_line(leaf: SyntaxTree):
+        leaf.node.tokens = WhiteSpacesFormatter.format_tokens(leaf.tokens)
+
     @staticmethod
     def format_tokens(tokens: List[Token]):
         result: List[Token] = []
 
+        space_width = WhiteSpacesFormatter.space_width
         for idx, token in enumerate(tokens):
             result.append(token)
 
-            # next of (, functions, or whitespaces must not be WHITESPACE
-            if (token.kind in [Token.DOT, Token.BRACKET_LEFT, Token.WHITESPACE, Token.FUNCTION]) or \
-               (idx >= len(tokens) - 1):
+            if idx >= len(tokens) - 1:
                 continue
 
-            next_tokens = tokens[idx + 1]
-            # previoues of comma or ) must not be WHITESPACE
-            # user function maybe
-            if (next_tokens.kind in [Token.COMMA, Token.DOT, Token.BRACKET_RIGHT]) or \
-               (token.kind == Token.IDENTIFIER and next_tokens.kind == Token.BRACKET_LEFT):
-                continue
-
-            whitespace = '  ' if next_tokens.kind == Token.COMMENT else ' '
-            result.append(Token(word=whitespace, kind=Token.WHITESPACE))
+            width = space_width(token, tokens[idx + 1])
+            if width > 0:
+                result.append(Token(word=' '*width, kind=Token.WHITESPACE))
 
         return result
 
+    @staticmethod
+    def space_width(token: Token, next_token: Token) -> int:
+        """Returns the number of whitespaces put between token and next_token
+
+        Args:
+            token:
+            next_token:
+
+        Returns:
+            0, 1 or 2 (before comment)
+        """
+
+        # next of (, functions, or whitespaces must not be WHITESPACE
+        if token.kind in WhiteSpacesFormatter.no_space_after:
+            return 0
+
+        # previoues of comma or ) must not be WHITESPACE
+        # user function maybe
+        if (next_token.kind in WhiteSpacesFormatter.no_space_before) or \
+           (token.kind == Token.IDENTIFIER and next_token.kind == Token.BRACKET_LEFT):
+            return 0
+
+        return 2 if next_token.kind == Token.COMMENT else 1
+
+    @staticmethod
+    def line_width(tokens: Sequence[Token], limit: Optional[int] = None) -> int:
+        """Returns width of tokens formatted by format_tokens() without creating any tokens
+
+        Args:
+            tokens: tokens of a line, which may be TokenSpan
+            limit: if given, measuring stops as soon as width exceeds it
+
+        Returns:
+            width of the line, which is only guaranteed to be greater than limit when it exceeds
+        """
+
+        space_width = WhiteSpacesFormatter.space_width
+        width = 0
+        prev = None
+        for token in tokens:
+            if prev is not None:
+                width += space_width(prev, token)
+            width += len(token.word)
+
+            if limit is not None and width > limit:
+                break
+            prev = token
+
+        return width
+
 
 # TODO: keep Idempotency
 class BlankLineFormatter(Formatter):
     """"""
+    with_token = Token(word='WITH', kind=Token.KEYWORD)
+    comma_token = Token(word=',', kind=Token.COMMA)
+
     @classmethod
     def format(cls, tree: SyntaxTree, config: Config):
         cls._format(tree)
@@ -195,26 +274,38 @@ class BlankLineFormatter(Formatter):
         if tree.depth != 0:
             return
 
-        with_token = Token(word='WITH', kind=Token.KEYWORD)
-        comma_token = Token(word=',', kind=Token.COMMA)
-        index = 0
+        cls.insert_blanks(tree, [cls.needs_blank(leaf) for leaf in tree.leaves])
 
-        while True:
-            # if reaches to end of leaves
-            if len(tree.leaves)-1 <= index:
-                tree.insert_leaf(index + 1, SyntaxTree(depth=1, line_num=0))
-                break
+    @classmethod
+    def needs_blank(cls, leaf: SyntaxTree) -> bool:
+        """Returns whether a blank line is inserted after the leaf at root depth"""
 
-            leaf = tree.leaves[index]
-            tokens = leaf.tokens
+        tokens = leaf.tokens
 
-            try:
-                if (tokens[0].kind == Token.BRACKET_RIGHT) or \
+        try:
+            return (tokens[0].kind == Token.BRACKET_RIGHT) or \
                    (tokens[0].kind == Token.IDENTIFIER) or \
-                   (tokens[0] in [with_token, comma_token] and len(tokens) == 2):
-                    tree.insert_leaf(index+1, SyntaxTree(depth=1, line_num=0))
+                   (tokens[0] in [cls.with_token, cls.comma_token] and len(tokens) == 2)
+        except IndexError:
+            # tokens index out of range
+            return False
 
-            except IndexError:
-                # tokens index out of range
-                pass
-            index += 1
+    @staticmethod
+    def insert_blanks(tree: SyntaxTree, blanks: List[bool]):
+        """Inserts a blank line after each leaf whose flag is True, and at end of leaves
+
+        Args:
+            tree: root of tree
+            blanks: flags of leaves by needs_blank(), where the last one is ignored
+        """
+
+        # leaves are copied to a new list in a single pass, instead of inserting blanks one by one
+        last = len(tree.leaves) - 1
+        leaves: List[SyntaxTree] = []
+        for idx, (leaf, blank) in enumerate(zip(tree.leaves, blanks)):
+            leaves.append(leaf)
+            if blank and idx < last:
+                leaves.append(SyntaxTree(depth=1, line_num=0))
+        leaves.append(SyntaxTree(depth=1, line_num=0))
+
+        tree.leaves[:] = leaves
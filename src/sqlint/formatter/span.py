@@ -0,0 +1,60 @@
+from collections.abc import Sequence
+from typing import Iterator, List, Optional, Union
+
+from sqlint.parser import Token
+
+
+class TokenSpan(Sequence):
+    """Read-only range [start, stop) over a token list shared by all spans of a file.
+
+    Slicing a span returns another span of the same list without copying tokens,
+    so that splitters can cut off heads and hand over the rest in constant time.
+
+    Examples:
+    ----
+    span = TokenSpan(tokens)
+    own, rest = span[0:2], span[2:]  # no tokens are copied
+    ----
+    """
+
+    __slots__ = ('tokens', 'start', 'stop')
+
+    def __init__(self, tokens: List[Token], start: int = 0, stop: Optional[int] = None):
+        """
+
+        Args:
+            tokens: shared list of tokens
+            start: index of head token in tokens
+            stop: index next to last token in tokens. If this is None, end of tokens.
+        """
+        self.tokens: List[Token] = tokens
+        self.start: int = start
+        self.stop: int = len(tokens) if stop is None else stop
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+    def __iter__(self) -> Iterator[Token]:
+        return map(self.tokens.__getitem__, range(self.start, self.stop))
+
+    def __getitem__(self, key: Union[int, slice]) -> Union[Token, 'TokenSpan']:
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self.stop - self.start)
+            if step != 1:
+                raise ValueError(f'step of TokenSpan slice must be 1, but {step}')
+            return TokenSpan(self.tokens, self.start + start, self.start + max(start, stop))
+
+        if key < 0:
+            key += self.stop - self.start
+        if not 0 <= key < self.stop - self.start:
+            raise IndexError('TokenSpan index out of range')
+
+        return self.tokens[self.start + key]
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+    def index(self, value: Token, start: int = 0, stop: Optional[int] = None) -> int:
+        """Returns the first index of value in the span, like list.index()"""
+        start, stop, _ = slice(start, stop).indices(self.stop - self.start)
+        return self.tokens.index(value, self.start + start, self.start + max(start, stop)) - self.start
@@ -1,13 +1,57 @@
-import logging
 from abc import ABCMeta, abstractmethod
-from typing import List, TypeVar, Tuple
+from typing import Callable, Dict, List, Optional, TypeVar, Tuple
 
+from .formatter import WhiteSpacesFormatter
 from sqlint.parser import Token
 from sqlint.syntax_tree import SyntaxTree
 
 T = TypeVar('T')
 
-logger = logging.getLogger(__name__)
+# tokens compared with tokens of lines, which are created once on import
+AND_TOKEN = Token(word='AND', kind=Token.KEYWORD)
+AS_TOKEN = Token(word='AS', kind=Token.KEYWORD)
+BETWEEN_TOKEN = Token(word='BETWEEN', kind=Token.KEYWORD)
+CASE_TOKEN = Token(word='CASE', kind=Token.KEYWORD)
+END_TOKEN = Token(word='END', kind=Token.KEYWORD)
+FROM_TOKEN = Token(word='FROM', kind=Token.KEYWORD)
+GROUP_TOKEN = Token(word='GROUP', kind=Token.KEYWORD)
+HAVING_TOKEN = Token(word='HAVING', kind=Token.KEYWORD)
+JOIN_TOKEN = Token(word='JOIN', kind=Token.KEYWORD)
+LANGUAGE_TOKEN = Token(word='LANGUAGE', kind=Token.KEYWORD)
+LIMIT_TOKEN = Token(word='LIMIT', kind=Token.KEYWORD)
+OR_TOKEN = Token(word='OR', kind=Token.KEYWORD)
+ORDER_TOKEN = Token(word='ORDER', kind=Token.KEYWORD)
+RETURNS_TOKEN = Token(word='RETURNS', kind=Token.KEYWORD)
+SELECT_TOKEN = Token(word='SELECT', kind=Token.KEYWORD)
+THEN_TOKEN = Token(word='THEN', kind=Token.KEYWORD)
+WHEN_TOKEN = Token(word='WHEN', kind=Token.KEYWORD)
+WHERE_TOKEN = Token(word='WHERE', kind=Token.KEYWORD)
+
+JOIN_TOKENS = (
+    Token(word='INNER', kind=Token.KEYWORD),
+    Token(word='LEFT', kind=Token.KEYWORD),
+    Token(word='RIGHT', kind=Token.KEYWORD),
+    Token(word='FULL', kind=Token.KEYWORD),
+    Token(word='CROSS', kind=Token.KEYWORD),
+    Token(word='OUTER', kind=Token.KEYWORD),
+    JOIN_TOKEN,
+)
+CONDITION_TOKENS = (
+    Token(word='ON', kind=Token.KEYWORD),
+    Token(word='USING', kind=Token.FUNCTION),
+)
+LOGICAL_TOKENS = (AND_TOKEN, OR_TOKEN)
+
+# keywords which close the sequence, in order of priority for CREATE FUNCTION
+CREATE_STOPPERS = (RETURNS_TOKEN, LANGUAGE_TOKEN, AS_TOKEN)
+RETURNS_STOPPERS = (LANGUAGE_TOKEN, AS_TOKEN)
+LANGUAGE_STOPPERS = (AS_TOKEN,)
+SELECT_STOPPERS = (FROM_TOKEN, WHERE_TOKEN, ORDER_TOKEN, GROUP_TOKEN, HAVING_TOKEN, LIMIT_TOKEN)
+FROM_STOPPERS = (SELECT_TOKEN, WHERE_TOKEN, ORDER_TOKEN, GROUP_TOKEN, HAVING_TOKEN, LIMIT_TOKEN)
+WHERE_STOPPERS = (SELECT_TOKEN, ORDER_TOKEN, GROUP_TOKEN, HAVING_TOKEN, LIMIT_TOKEN)
+GROUPBY_STOPPERS = (SELECT_TOKEN, WHERE_TOKEN, ORDER_TOKEN, HAVING_TOKEN, LIMIT_TOKEN)
+ORDERBY_STOPPERS = (SELECT_TOKEN, WHERE_TOKEN, GROUP_TOKEN, HAVING_TOKEN, LIMIT_TOKEN)
+HAVING_STOPPERS = (SELECT_TOKEN, WHERE_TOKEN, ORDER_TOKEN, GROUP_TOKEN, LIMIT_TOKEN)
 
 
 class Splitter(metaclass=ABCMeta):
@@ -34,37 +78,24 @@ class IdentifierSplitter(Splitter):
     def split(cls, tokens: List[Token], tree: SyntaxTree) -> Tuple[List[Token], List[List[Token]], List[Token]]:
         parent_tree = tree.parent
 
-        logger.debug(tokens)
-
         if parent_tree is None or parent_tree.depth == 0:
             # The identifier placed on root depth is illegal case.
             return tokens[0:1], [], tokens[1:]
 
         # if parent tree is "FROM" sequence, explores "JOIN" sequences.
-        from_token = Token(word='FROM', kind=Token.KEYWORD)
-        if parent_tree.tokens[0] == from_token:
+        if parent_tree.tokens[0] == FROM_TOKEN:
             return cls.split_from(tokens)
 
         return cls.split_other(tokens)
 
     @classmethod
     def split_from(cls, tokens: List[Token]) -> Tuple[List[Token], List[List[Token]], List[Token]]:
-        join_tokens = [
-            Token(word='INNER', kind=Token.KEYWORD),
-            Token(word='LEFT', kind=Token.KEYWORD),
-            Token(word='RIGHT', kind=Token.KEYWORD),
-            Token(word='FULL', kind=Token.KEYWORD),
-            Token(word='CROSS', kind=Token.KEYWORD),
-            Token(word='OUTER', kind=Token.KEYWORD),
-            Token(word='JOIN', kind=Token.KEYWORD)
-        ]
-
         bracket_count = 0
         for idx, token in enumerate(tokens):
             bracket_count += (1 if token.kind == Token.BRACKET_LEFT else 0)
             bracket_count += (-1 if token.kind == Token.BRACKET_RIGHT else 0)
 
-            if token in join_tokens and bracket_count == 0:
+            if token in JOIN_TOKENS and bracket_count == 0:
                 return tokens[0:idx], [], tokens[idx:]
 
         return cls.split_other(tokens)
@@ -83,49 +114,258 @@ class RightBrackerSplitter(Splitter):
 
 
 class LongLineSplitter(Splitter):
+    """Splits a line longer than max line length at the best break point.
+
+    This is a greedy line breaking like Wadler/Oppen pretty printers. Break points are
+    before binary operators and AND/OR at top level of the line, and groups, which are
+    non-empty brackets and CASE ... END. A group is kept flat as long as it fits in a line,
+    and contents of a broken group become children.
+    Splitting is repeated on the sibling while it is still long, so each line is filled as much as possible.
+    Commas and keywords split by other splitters are not break points here, because they are always broken.
+    Ends of statements and comments are hard breaks, and tokens after them are never joined to the line.
+    """
+
     @classmethod
-    def split(cls, tokens: List[Token], tree: SyntaxTree) -> Tuple[List[Token], List[List[Token]], List[Token]]:
+    def split(cls, tokens: List[Token], tree: SyntaxTree,
+              width: int = 0) -> Tuple[List[Token], List[List[Token]], List[Token]]:
+        """
+
+        Args:
+            tokens:
+            tree:
+            width: width available for the line. If this is 0, the line is split at the first break point.
+
+        Returns:
+
+        """
         if tokens[0].word.upper() == 'WHEN':
             return cls._split_when(tokens)
 
-        return cls._split(tokens)
+        return cls._split(tokens, width)
 
     @classmethod
-    def _split(cls, tokens: List[Token]) -> Tuple[List[Token], List[List[Token]], List[Token]]:
-        lb_token = Token(word='(', kind=Token.BRACKET_LEFT)
-        try:
-            left_index = tokens.index(lb_token)
-        except ValueError:
-            # Not Found left bracket, can't split the line
-            return tokens, [], []
+    def split_lines(cls, tokens: List[Token], tree: SyntaxTree,
+                    width: int) -> Tuple[List[Token], List[List[Token]], List[List[Token]]]:
+        """Splits a long line, and fills following lines broken before operators at once
 
-        bracket_count = 1
-        for idx, token in enumerate(tokens[left_index+1:]):
-            bracket_count += (1 if token.kind == Token.BRACKET_LEFT else 0)
-            bracket_count += (-1 if token.kind == Token.BRACKET_RIGHT else 0)
+        Each filled line becomes a sibling, so that the rest of the line is not scanned again for each line.
 
-            if bracket_count == 0:
-                return (
-                    tokens[0:left_index+1],
-                    KeywordSelectSplitter.split_leaves(tokens[left_index+1:idx+left_index+1]),
-                    # [tokens[left_index+1:idx+left_index+1]],
-                    tokens[idx+left_index+1:]
-                )
+        Args:
+            tokens:
+            tree:
+            width: width available for the line
+
+        Returns:
+            own tokens, children and siblings in order
+        """
+
+        stop = cls._hard_break(tokens)
+        if stop < len(tokens):
+            # tokens after the end of statement are split by the splitter of their head
+            head, rest = tokens[0:stop], tokens[stop:]
+            if WhiteSpacesFormatter.line_width(head, limit=width) <= width:
+                return head, [], [rest]
+
+            own, children, siblings = cls.split_lines(head, tree, width)
+            return own, children, siblings + [rest]
+
+        own, children, sibling = cls.split(tokens, tree, width)
+        if children or tokens[0].word.upper() == 'WHEN':
+            return own, children, [sibling]
+
+        siblings = []
+        while sibling and WhiteSpacesFormatter.line_width(sibling, limit=width) > width:
+            _own, _children, _sibling = cls._split(sibling, width)
+            if _children or not _sibling:
+                # the line is broken at a group, which is split again
+                break
+            siblings.append(_own)
+            sibling = _sibling
+        siblings.append(sibling)
 
+        return own, children, siblings
+
+    @classmethod
+    def _hard_break(cls, tokens: List[Token]) -> int:
+        """Returns index next to the first token which ends a statement or is a comment, or length of tokens"""
+
+        for idx, token in enumerate(tokens):
+            if token.kind == Token.COMMENT or token.word.endswith(';'):
+                return idx + 1
+
+        return len(tokens)
+
+    @classmethod
+    def _split(cls, tokens: List[Token], width: int) -> Tuple[List[Token], List[List[Token]], List[Token]]:
+        """Splits tokens at the last break point before the line exceeds width
+
+        Args:
+            tokens:
+            width:
+
+        Returns:
+
+        """
+
+        overflow, operators, openers = cls._scan(tokens, width)
+
+        # the last group which is opened before overflow and can be broken
+        group = None
+        opener = -1
+        for opener in reversed(openers):
+            group = cls._group(tokens, opener)
+            if group is not None:
+                break
+
+        operator = operators[-1] if operators else None
+        if group is not None and (operator is None or operator < opener):
+            # breaking before the operator is better if the whole group fits in the next line
+            if operator is None or not cls._fits(tokens, operator, group[2], width):
+                return cls._split_group(tokens, *group)
+
+        if operator is not None:
+            return tokens[0:operator], [], tokens[operator:]
+
+        # Not Found break point, can't split the line
         return tokens, [], []
 
+    @classmethod
+    def _scan(cls, tokens: List[Token], width: int, start: int = 0) -> Tuple[int, List[int], List[int]]:
+        """Scans tokens until they exceed width, and finds break points at top level
+
+        If no break point is found before that, scanning continues until the first one.
+
+        Args:
+            tokens:
+            width:
+            start: index which scanning starts from, whose token is at head of the line
+
+        Returns:
+            index of the token exceeding width (or length of tokens), and indices of operators and openers of groups
+        """
+
+        space_width = WhiteSpacesFormatter.space_width
+
+        operators: List[int] = []
+        openers: List[int] = []
+        overflow = len(tokens)
+        column = 0
+        level = 0
+        is_between = False
+        prev = tokens[start-1] if start > 0 else None
+        for idx in range(start, len(tokens)):
+            token = tokens[idx]
+            if idx > start:
+                column += space_width(prev, token)
+            column += len(token.word)
+
+            if level == 0:
+                if cls._is_operator(token, prev, is_between):
+                    operators.append(idx)
+                if token == BETWEEN_TOKEN:
+                    is_between = True
+                elif token in LOGICAL_TOKENS:
+                    is_between = False
+                if cls._level_step(token) > 0:
+                    openers.append(idx)
+
+            # closing tokens at head of the line, which are opened in the previous lines
+            level = max(level + cls._level_step(token), 0)
+            prev = token
+
+            if overflow == len(tokens) and column > width:
+                overflow = idx
+            if overflow <= idx and (operators or openers):
+                break
+
+        return overflow, operators, openers
+
+    @classmethod
+    def _is_operator(cls, token: Token, prev: Token, is_between: bool) -> bool:
+        """Returns whether the line can be broken before the token, which is a binary operator or AND/OR"""
+
+        if prev is None:
+            return False
+        if token.kind == Token.OPERATOR:
+            # unary operators follow operators, keywords, brackets or commas
+            return prev.kind in [Token.IDENTIFIER, Token.BRACKET_RIGHT] or prev.word.upper() == 'END'
+
+        return token in LOGICAL_TOKENS and not (is_between and token.word.upper() == 'AND')
+
+    @classmethod
+    def _level_step(cls, token: Token) -> int:
+        """Returns 1 for openers of groups, -1 for closing tokens, otherwise 0"""
+
+        # END followed by comma is parsed as identifier
+        word = token.word.upper()
+        if token.kind == Token.BRACKET_LEFT or word == 'CASE':
+            return 1
+        if token.kind == Token.BRACKET_RIGHT or word == 'END':
+            return -1
+        return 0
+
+    @classmethod
+    def _group(cls, tokens: List[Token], opener: int) -> Optional[Tuple[int, int, int]]:
+        """Finds contents of the group opened at opener
+
+        Args:
+            tokens:
+            opener: index of "(" or CASE
+
+        Returns:
+            start and stop of contents and index of the closing token,
+            or None if the group is empty or not closed in tokens
+        """
+
+        level = 0
+        for idx in range(opener, len(tokens)):
+            level += cls._level_step(tokens[idx])
+            if level == 0:
+                break
+        else:
+            return None
+
+        if tokens[opener].kind == Token.BRACKET_LEFT:
+            return (opener + 1, idx, idx) if idx > opener + 1 else None
+
+        # CASE is broken before the first WHEN like CASE sequence
+        for when_index in range(opener + 1, idx):
+            if tokens[when_index] == WHEN_TOKEN:
+                return when_index, idx, idx
+        return None
+
+    @classmethod
+    def _fits(cls, tokens: List[Token], start: int, close: int, width: int) -> bool:
+        """Returns whether a line from start fits in width until the next break point after close"""
+
+        _, operators, openers = cls._scan(tokens, 0, close + 1)
+        if operators or openers:
+            stop = min(operators[:1] + [opener + 1 for opener in openers[:1]])
+        else:
+            stop = len(tokens)
+
+        return WhiteSpacesFormatter.line_width(tokens[start:stop], limit=width) <= width
+
+    @classmethod
+    def _split_group(cls, tokens: List[Token], start: int, stop: int,
+                     close: int) -> Tuple[List[Token], List[List[Token]], List[Token]]:
+        """Splits contents of the group into children"""
+
+        if tokens[start] == WHEN_TOKEN:
+            return tokens[0:start], [tokens[start:stop]], tokens[close:]
+
+        return tokens[0:start], KeywordSelectSplitter.split_leaves(tokens[start:stop]), tokens[close:]
+
     @classmethod
     def _split_when(cls, tokens: List[Token]) -> Tuple[List[Token], List[List[Token]], List[Token]]:
         """Case - when"""
 
-        then_token = Token(word='THEN', kind=Token.KEYWORD)
-
         bracket_count = 0
         for idx, token in enumerate(tokens):
             bracket_count += (1 if token.kind == Token.BRACKET_LEFT else 0)
             bracket_count += (-1 if token.kind == Token.BRACKET_RIGHT else 0)
 
-            if token == then_token and bracket_count == 0:
+            if token == THEN_TOKEN and bracket_count == 0:
                 return (
                     tokens[0:idx+1],
                     KeywordWhereSplitter.split_condiction(tokens[idx+1:]),
@@ -145,8 +385,6 @@ class CommaSplitter(Splitter):
             # maybe this comma correspands to WITH sequence
             # expected
             # , {Identifier} AS ( {myquery ) ...
-            as_token = Token(word='AS', kind=Token.KEYWORD)
-
             if len(tokens) <= 2:
                 return tokens, [], []
 
@@ -154,10 +392,10 @@ class CommaSplitter(Splitter):
                 raise ValueError(f'a head of tokens must be "," sequence, but {tokens[0]}')
 
             if tokens[1].kind != Token.IDENTIFIER:
-                # TODO: raises SQL error or check this as Violations
-                raise ValueError(f'next of "WITH" or "," must be identifier, but {tokens[1]}')
+                # not WITH sequence but a list broken at top level, e.g.) rows of VALUES
+                return cls._split_comma(tokens)
 
-            if tokens[2] != as_token:
+            if tokens[2] != AS_TOKEN:
                 return tokens[0:2], [], tokens[2:]
 
             if tokens[3].kind != Token.BRACKET_LEFT:
@@ -175,6 +413,14 @@ class CommaSplitter(Splitter):
 
             return tokens[0:1], [], tokens[1:]
 
+        return cls._split_comma(tokens)
+
+    @classmethod
+    def _split_comma(cls, tokens: List[Token]) -> Tuple[List[Token], List[List[Token]], List[Token]]:
+        """Splits tokens before the next comma outside brackets"""
+
+        bracket_count = 0
+
         # Explores next COMMA
         for idx, token in enumerate(tokens[1:]):
             bracket_count += (1 if token.kind == Token.BRACKET_LEFT else 0)
@@ -187,37 +433,19 @@ class CommaSplitter(Splitter):
 
 
 class KeywordSplitter(Splitter):
+    # splitting methods keyed by upper-cased head keyword, which is set once all splitters are defined
+    handlers: Dict[str, Callable[[List[Token]], Tuple[List[Token], List[List[Token]], List[Token]]]] = {}
+
     @classmethod
     def split(cls, tokens: List[Token], tree: SyntaxTree) -> Tuple[List[Token], List[List[Token]], List[Token]]:
         head = tokens[0]
 
-        if head.kind not in [Token.KEYWORD, Token.FUNCTION]:
+        if head.kind != Token.KEYWORD and head.kind != Token.FUNCTION:
             raise ValueError(f'token kind must be reserved KEYWORD or FUNCTION, but {head.kind}')
 
-        key_functions = [
-            (['CREATE'], cls._split_create),
-            (['RETURNS'], cls._split_returns),
-            (['LANGUAGE'], cls._split_language),
-            (['AS'], cls._split_as),
-            (['WITH'], cls._split_with),
-            (['SELECT'], KeywordSelectSplitter.split_select),
-            (['FROM'], cls._split_from),
-            (['WHERE'], KeywordWhereSplitter.split_where),
-            (['ORDER'], cls._split_orderby),
-            (['GROUP'], cls._split_groupby),
-            (['HAVING'], KeywordHavingSplitter.split_having),
-            (['LIMIT'], cls._split_limit),
-            (['CASE'], cls._split_case),
-            (['WHEN'], cls._split_when),
-            (['INNER', 'LEFT', 'RIGHT', 'FULL', 'CROSS', 'OUTER', 'JOIN'], KeywordJoinSplitter.split_join),
-        ]
-
-        word = head.word.upper()
-        # Switches by specified keywords
-
-        for keys, func in key_functions:
-            if word in keys:
-                return func(tokens)
+        func = cls.handlers.get(head.word.upper())
+        if func is not None:
+            return func(tokens)
 
         return tokens, [], []
 
@@ -225,15 +453,6 @@ class KeywordSplitter(Splitter):
     def _split_groupby(cls, tokens: List[Token]) -> Tuple[List[Token], List[List[Token]], List[Token]]:
         """Splits GROUP BY sequence """
 
-        group_token = Token(word='GROUP', kind=Token.KEYWORD)
-        stoppers = [
-            Token(word='SELECT', kind=Token.KEYWORD),
-            Token(word='WHERE', kind=Token.KEYWORD),
-            Token(word='ORDER', kind=Token.KEYWORD),
-            Token(word='HAVING', kind=Token.KEYWORD),
-            Token(word='LIMIT', kind=Token.KEYWORD),
-        ]
-
         # Explores tokens until GROUP is closed by condition sequence corresponding it.
         group_count = 1
         bracket_count = 0
@@ -241,10 +460,10 @@ class KeywordSplitter(Splitter):
             bracket_count += (1 if token.kind == Token.BRACKET_LEFT else 0)
             bracket_count += (-1 if token.kind == Token.BRACKET_RIGHT else 0)
 
-            if token == group_token and bracket_count == 0:
+            if token == GROUP_TOKEN and bracket_count == 0:
                 group_count += 1
 
-            if token in stoppers and group_count == 1 and bracket_count == 0:
+            if token in GROUPBY_STOPPERS and group_count == 1 and bracket_count == 0:
                 if len(tokens) >= 3 and tokens[2].kind == Token.BRACKET_LEFT:
                     return tokens[0:3], [tokens[3:idx+1]], tokens[idx+1:]
                 else:
@@ -256,15 +475,6 @@ class KeywordSplitter(Splitter):
     def _split_orderby(cls, tokens: List[Token]) -> Tuple[List[Token], List[List[Token]], List[Token]]:
         """Splits ORDER BY sequence """
 
-        order_token = Token(word='ORDER', kind=Token.KEYWORD)
-        stoppers = [
-            Token(word='SELECT', kind=Token.KEYWORD),
-            Token(word='WHERE', kind=Token.KEYWORD),
-            Token(word='GROUP', kind=Token.KEYWORD),
-            Token(word='HAVING', kind=Token.KEYWORD),
-            Token(word='LIMIT', kind=Token.KEYWORD),
-        ]
-
         # Explores tokens until GROUP is closed by condition sequence corresponding it.
         order_count = 1
         bracket_count = 0
@@ -272,10 +482,10 @@ class KeywordSplitter(Splitter):
             bracket_count += (1 if token.kind == Token.BRACKET_LEFT else 0)
             bracket_count += (-1 if token.kind == Token.BRACKET_RIGHT else 0)
 
-            if token == order_token and bracket_count == 0:
+            if token == ORDER_TOKEN and bracket_count == 0:
                 order_count += 1
 
-            if token in stoppers and order_count == 1 and bracket_count == 0:
+            if token in ORDERBY_STOPPERS and order_count == 1 and bracket_count == 0:
                 if len(tokens) >= 3 and tokens[2].kind == Token.BRACKET_LEFT:
                     return tokens[0:3], [tokens[3:idx + 1]], tokens[idx + 1:]
                 else:
@@ -290,13 +500,7 @@ class KeywordSplitter(Splitter):
 
     @classmethod
     def _split_create(cls, tokens: List[Token]) -> Tuple[List[Token], List[List[Token]], List[Token]]:
-        stoppers = [
-            Token(word='RETURNS', kind=Token.KEYWORD),
-            Token(word='LANGUAGE', kind=Token.KEYWORD),
-            Token(word='AS', kind=Token.KEYWORD),
-        ]
-
-        for stp in stoppers:
+        for stp in CREATE_STOPPERS:
             try:
                 index = tokens.index(stp, 1, -1)
                 return tokens[0:index], [], tokens[index:]
@@ -307,12 +511,7 @@ class KeywordSplitter(Splitter):
 
     @classmethod
     def _split_returns(cls, tokens: List[Token]) -> Tuple[List[Token], List[List[Token]], List[Token]]:
-        stoppers = [
-            Token(word='LANGUAGE', kind=Token.KEYWORD),
-            Token(word='AS', kind=Token.KEYWORD),
-        ]
-
-        for stp in stoppers:
+        for stp in RETURNS_STOPPERS:
             try:
                 index = tokens.index(stp, 1, -1)
                 return tokens[0:index], [], tokens[index:]
@@ -323,11 +522,7 @@ class KeywordSplitter(Splitter):
 
     @classmethod
     def _split_language(cls, tokens: List[Token]) -> Tuple[List[Token], List[List[Token]], List[Token]]:
-        stoppers = [
-            Token(word='AS', kind=Token.KEYWORD),
-        ]
-
-        for stp in stoppers:
+        for stp in LANGUAGE_STOPPERS:
             try:
                 index = tokens.index(stp, 1, -1)
                 return tokens[0:index], [], tokens[index:]
@@ -378,7 +573,6 @@ class KeywordSplitter(Splitter):
         Returns:
 
         """
-        as_token = Token(word='AS', kind=Token.KEYWORD)
 
         if len(tokens) <= 2:
             return tokens, [], []
@@ -391,7 +585,7 @@ class KeywordSplitter(Splitter):
             # TODO: raises SQL error or check this as Violations
             raise ValueError(f'next of "WITH" must be identifier, but {tokens[1]}')
 
-        if tokens[2] != as_token:
+        if tokens[2] != AS_TOKEN:
             return tokens[0:2], [], tokens[2:]
 
         if tokens[3].kind != Token.BRACKET_LEFT:
@@ -413,16 +607,6 @@ class KeywordSplitter(Splitter):
     def _split_from(cls, tokens: List[Token]) -> Tuple[List[Token], List[List[Token]], List[Token]]:
         """Splits FROM sequence """
 
-        from_token = Token(word='FROM', kind=Token.KEYWORD)
-        stoppers = [
-            Token(word='SELECT', kind=Token.KEYWORD),
-            Token(word='WHERE', kind=Token.KEYWORD),
-            Token(word='ORDER', kind=Token.KEYWORD),
-            Token(word='GROUP', kind=Token.KEYWORD),
-            Token(word='HAVING', kind=Token.KEYWORD),
-            Token(word='LIMIT', kind=Token.KEYWORD),
-        ]
-
         # Explores tokens until FROM is closed by condition sequence corresponding it.
         from_count = 1
         bracket_count = 0
@@ -430,10 +614,10 @@ class KeywordSplitter(Splitter):
             bracket_count += (1 if token.kind == Token.BRACKET_LEFT else 0)
             bracket_count += (-1 if token.kind == Token.BRACKET_RIGHT else 0)
 
-            if token == from_token and bracket_count == 0:
+            if token == FROM_TOKEN and bracket_count == 0:
                 from_count += 1
 
-            if token in stoppers and from_count == 1 and bracket_count == 0:
+            if token in FROM_STOPPERS and from_count == 1 and bracket_count == 0:
                 if tokens[1].kind == Token.BRACKET_LEFT:
                     return tokens[0:2], [tokens[2:idx+1]], tokens[idx+1:]
                 else:
@@ -452,12 +636,8 @@ class KeywordSplitter(Splitter):
 
         """
 
-        case_token = Token(word='CASE', kind=Token.KEYWORD)
-        when_token = Token(word='WHEN', kind=Token.KEYWORD)
-        end_token = Token(word='END', kind=Token.KEYWORD)
-
         try:
-            when_index = tokens.index(when_token)
+            when_index = tokens.index(WHEN_TOKEN)
         except ValueError:
             # TODO: raises SQL error or check this as Violations
             raise ValueError('"CASE" sequence requires one or more "WHEN" sequense')
@@ -468,9 +648,9 @@ class KeywordSplitter(Splitter):
             bracket_count += (1 if token.kind == Token.BRACKET_LEFT else 0)
             bracket_count += (-1 if token.kind == Token.BRACKET_RIGHT else 0)
 
-            if token == case_token and bracket_count == 0:
+            if token == CASE_TOKEN and bracket_count == 0:
                 case_count += 1
-            if token == end_token and case_count == 1 and bracket_count == 0:
+            if token == END_TOKEN and case_count == 1 and bracket_count == 0:
                 return tokens[0:when_index], [tokens[when_index:idx+when_index]], tokens[idx+when_index:]
 
         return tokens[0:when_index], [tokens[when_index:]], []
@@ -486,10 +666,6 @@ class KeywordSplitter(Splitter):
 
         """
 
-        case_token = Token(word='CASE', kind=Token.KEYWORD)
-        when_token = Token(word='WHEN', kind=Token.KEYWORD)
-        end_token = Token(word='END', kind=Token.KEYWORD)
-
         bracket_count = 0
         case_count = 1
         for idx, token in enumerate(tokens[1:]):
@@ -497,10 +673,10 @@ class KeywordSplitter(Splitter):
             bracket_count += (-1 if token.kind == Token.BRACKET_RIGHT else 0)
 
             if bracket_count == 0:
-                case_count += (1 if token == case_token else 0)
-                case_count += (-1 if token == end_token else 0)
+                case_count += (1 if token == CASE_TOKEN else 0)
+                case_count += (-1 if token == END_TOKEN else 0)
 
-            if token == when_token and case_count <= 1 and bracket_count == 0:
+            if token == WHEN_TOKEN and case_count <= 1 and bracket_count == 0:
                 return tokens[0:idx+1], [], tokens[idx+1:]
 
         return tokens, [], []
@@ -549,16 +725,6 @@ class KeywordSelectSplitter(KeywordSplitter):
 
         """
 
-        select_token = Token(word='SELECT', kind=Token.KEYWORD)
-        stoppers = [
-            Token(word='FROM', kind=Token.KEYWORD),
-            Token(word='WHERE', kind=Token.KEYWORD),
-            Token(word='ORDER', kind=Token.KEYWORD),
-            Token(word='GROUP', kind=Token.KEYWORD),
-            Token(word='HAVING', kind=Token.KEYWORD),
-            Token(word='LIMIT', kind=Token.KEYWORD),
-        ]
-
         # Explores tokens until SELECT is closed by FROM corresponding it.
         select_count = 1
         bracket_count = 0
@@ -566,9 +732,9 @@ class KeywordSelectSplitter(KeywordSplitter):
             bracket_count += (1 if token.kind == Token.BRACKET_LEFT else 0)
             bracket_count += (-1 if token.kind == Token.BRACKET_RIGHT else 0)
 
-            if token == select_token and bracket_count == 0:
+            if token == SELECT_TOKEN and bracket_count == 0:
                 select_count += 1
-            if token in stoppers and select_count == 1 and bracket_count == 0:
+            if token in SELECT_STOPPERS and select_count == 1 and bracket_count == 0:
                 return (
                     tokens[0:1],
                     cls.split_leaves(tokens[1:idx+1]),
@@ -589,15 +755,6 @@ class KeywordWhereSplitter(KeywordSplitter):
 
         """
 
-        where_token = Token(word='WHERE', kind=Token.KEYWORD)
-        stoppers = [
-            Token(word='SELECT', kind=Token.KEYWORD),
-            Token(word='ORDER', kind=Token.KEYWORD),
-            Token(word='GROUP', kind=Token.KEYWORD),
-            Token(word='HAVING', kind=Token.KEYWORD),
-            Token(word='LIMIT', kind=Token.KEYWORD),
-        ]
-
         # Explores tokens until FROM is closed by condition sequence corresponding it.
         where_count = 1
         bracket_count = 0
@@ -605,10 +762,10 @@ class KeywordWhereSplitter(KeywordSplitter):
             bracket_count += (1 if token.kind == Token.BRACKET_LEFT else 0)
             bracket_count += (-1 if token.kind == Token.BRACKET_RIGHT else 0)
 
-            if token == where_token and bracket_count == 0:
+            if token == WHERE_TOKEN and bracket_count == 0:
                 where_count += 1
 
-            if token in stoppers and where_count == 1 and bracket_count == 0:
+            if token in WHERE_STOPPERS and where_count == 1 and bracket_count == 0:
                 return (
                     tokens[0:1],
                     cls.split_condiction(tokens[1:idx+1]),
@@ -627,12 +784,6 @@ class KeywordWhereSplitter(KeywordSplitter):
 
         """
 
-        case_token = Token(word='CASE', kind=Token.KEYWORD)
-        end_token = Token(word='END', kind=Token.KEYWORD)
-        and_token = Token(word='AND', kind=Token.KEYWORD)
-        or_token = Token(word='OR', kind=Token.KEYWORD)
-        between_tokens = Token(word='BETWEEN', kind=Token.KEYWORD)
-
         result = []
 
         case_count = 0
@@ -651,17 +802,17 @@ class KeywordWhereSplitter(KeywordSplitter):
                 start = idx+1
                 continue
 
-            case_count += (1 if token == case_token else 0)
-            case_count += (-1 if token == end_token else 0)
+            case_count += (1 if token == CASE_TOKEN else 0)
+            case_count += (-1 if token == END_TOKEN else 0)
 
-            if token == between_tokens:
+            if token == BETWEEN_TOKEN:
                 between_count += 1
 
-            if token == and_token and between_count >= 1:
+            if token == AND_TOKEN and between_count >= 1:
                 between_count -= between_count
                 continue
 
-            if token in [and_token, or_token] and case_count == 0 and between_count == 0:
+            if token in LOGICAL_TOKENS and case_count == 0 and between_count == 0:
                 result.append(tokens[start:idx])
                 start = idx
 
@@ -676,15 +827,6 @@ class KeywordHavingSplitter(KeywordSplitter):
     def split_having(cls, tokens: List[Token]) -> Tuple[List[Token], List[List[Token]], List[Token]]:
         """Splits Having sequence """
 
-        having_token = Token(word='HAVING', kind=Token.KEYWORD)
-        stoppers = [
-            Token(word='SELECT', kind=Token.KEYWORD),
-            Token(word='WHERE', kind=Token.KEYWORD),
-            Token(word='ORDER', kind=Token.KEYWORD),
-            Token(word='GROUP', kind=Token.KEYWORD),
-            Token(word='LIMIT', kind=Token.KEYWORD),
-        ]
-
         # Explores tokens until FROM is closed by condition sequence corresponding it.
         having_count = 1
         bracket_count = 0
@@ -692,10 +834,10 @@ class KeywordHavingSplitter(KeywordSplitter):
             bracket_count += (1 if token.kind == Token.BRACKET_LEFT else 0)
             bracket_count += (-1 if token.kind == Token.BRACKET_RIGHT else 0)
 
-            if token == having_token and bracket_count == 0:
+            if token == HAVING_TOKEN and bracket_count == 0:
                 having_count += 1
 
-            if token in stoppers and having_count == 1 and bracket_count == 0:
+            if token in HAVING_STOPPERS and having_count == 1 and bracket_count == 0:
                 return (
                     tokens[0:1],
                     KeywordWhereSplitter.split_condiction(tokens[1:idx+1]),
@@ -715,23 +857,9 @@ class KeywordJoinSplitter(KeywordSplitter):
         Returns:
 
         """
-        join_token = Token(word='JOIN', kind=Token.KEYWORD)
-        join_tokens = [
-            Token(word='INNER', kind=Token.KEYWORD),
-            Token(word='LEFT', kind=Token.KEYWORD),
-            Token(word='RIGHT', kind=Token.KEYWORD),
-            Token(word='FULL', kind=Token.KEYWORD),
-            Token(word='CROSS', kind=Token.KEYWORD),
-            Token(word='OUTER', kind=Token.KEYWORD),
-            Token(word='JOIN', kind=Token.KEYWORD)
-        ]
-        condition_tokens = [
-            Token(word='ON', kind=Token.KEYWORD),
-            Token(word='USING', kind=Token.FUNCTION)
-        ]
 
         try:
-            join_index = tokens.index(join_token)
+            join_index = tokens.index(JOIN_TOKEN)
         except ValueError:
             raise ValueError(f'{tokens[0]} needs "JOIN" context')
 
@@ -742,10 +870,10 @@ class KeywordJoinSplitter(KeywordSplitter):
             bracket_count += (1 if token.kind == Token.BRACKET_LEFT else 0)
             bracket_count += (-1 if token.kind == Token.BRACKET_RIGHT else 0)
 
-            if token in condition_tokens and bracket_count == 0:
+            if token in CONDITION_TOKENS and bracket_count == 0:
                 condition_index = idx+(join_index+1)
 
-            if token in join_tokens and bracket_count == 0:
+            if token in JOIN_TOKENS and bracket_count == 0:
                 next_join_index = idx+(join_index+1)
                 break
 
@@ -774,3 +902,22 @@ class KeywordJoinSplitter(KeywordSplitter):
             return [tokens]
 
         return KeywordWhereSplitter.split_condiction(tokens)
+
+
+KeywordSplitter.handlers = {
+    'CREATE': KeywordSplitter._split_create,
+    'RETURNS': KeywordSplitter._split_returns,
+    'LANGUAGE': KeywordSplitter._split_language,
+    'AS': KeywordSplitter._split_as,
+    'WITH': KeywordSplitter._split_with,
+    'SELECT': KeywordSelectSplitter.split_select,
+    'FROM': KeywordSplitter._split_from,
+    'WHERE': KeywordWhereSplitter.split_where,
+    'ORDER': KeywordSplitter._split_orderby,
+    'GROUP': KeywordSplitter._split_groupby,
+    'HAVING': KeywordHavingSplitter.split_having,
+    'LIMIT': KeywordSplitter._split_limit,
+    'CASE': KeywordSplitter._split_case,
+    'WHEN': KeywordSplitter._split_when,
+    **dict.fromkeys(['INNER', 'LEFT', 'RIGHT', 'FULL', 'CROSS', 'OUTER', 'JOIN'], KeywordJoinSplitter.split_join),
+}
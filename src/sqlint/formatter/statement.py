@@ -0,0 +1,367 @@
+import difflib
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, TextIO, Tuple
+
+from .base import write, _gather_tokens, _root_of, _split_tokens, _write_root
+from .emitter import Emitter
+from .span import TokenSpan
+from sqlint.config import Config
+from sqlint.parser import parse_lines, Token
+from sqlint.profiler import call_profiled, profiler
+from sqlint.syntax_tree import SyntaxTree
+
+# ranges of (own, children) and start of sibling split from a top-level leaf
+Ranges = Tuple[Tuple[int, int], List[Tuple[int, int]], int]
+
+
+class TextEdit(NamedTuple):
+    """Replaces lines of source from start_line until end_line (exclusive) with text.
+
+    Line numbers start from 1, and start_line equals end_line if text is inserted before start_line.
+    """
+    start_line: int
+    end_line: int
+    text: str
+
+
+def format_range(tree: SyntaxTree, config: Config, source: str, start_line: int, end_line: int) -> List[TextEdit]:
+    """Formats statements overlapping lines from start_line to end_line, and returns edits of source
+
+    The range is expanded to whole statements, and only they are reshaped and formatted.
+    A statement ends at the end of a line whose last token ends with ";", and each statement is formatted
+    independently in the same way as write_stream(), so that latency is proportional to the statements
+    in the range rather than lines before them.
+
+    Note: This is bang method.
+
+    Args:
+        tree: syntax tree of source
+        config:
+        source: sql in the file
+        start_line: first line of the range, which starts from 1
+        end_line: last line of the range (inclusive), which is clamped to the last line of source
+
+    Returns:
+        minimal edits of lines, which are empty if the statements are already formatted
+    """
+
+    if not tree.is_abstract:
+        raise ValueError('Failed to format, because target SyntaxTree is not Abstract')
+    source_lines = source.splitlines(keepends=True)
+    if not 1 <= start_line <= min(end_line, len(source_lines)):
+        raise ValueError(f'invalid range of lines: {start_line}-{end_line}')
+    end_line = min(end_line, len(source_lines))
+
+    with profiler.timer('format', 'statements'):
+        tokens, first_line, next_line = _gather_statements(tree, start_line, end_line)
+    if not tokens:
+        return []
+
+    is_head, is_end = first_line == 0, next_line is None
+    text = _write_part(tokens, {}, config, is_head, is_end)
+
+    # lines of the part, which continues lines of the previous part
+    if not is_head:
+        text = text[1:]
+    if not is_end:
+        text += '\n'
+
+    first = 0 if is_head else first_line - 1
+    last = len(source_lines) if is_end else next_line - 1
+
+    matcher = difflib.SequenceMatcher(None, source_lines[first:last], text.splitlines(keepends=True), autojunk=False)
+    return [TextEdit(first + i1 + 1, first + i2 + 1, ''.join(matcher.b[j1:j2]))
+            for tag, i1, i2, j1, j2 in matcher.get_opcodes() if tag != 'equal']
+
+
+def write_statements(tree: SyntaxTree, config: Config, stream: TextIO, jobs: Optional[int] = None):
+    """Formats statements of syntax tree in parallel, and writes formatted sql to stream in order
+
+    Tokens are cut at ends of statements into parts of similar size, and each part is formatted
+    independently in a process pool with top-level lines split from whole tokens,
+    so that written text is the same as write(tree, config, stream).
+
+    Note: This is bang method.
+
+    Args:
+        tree: target SyntaxTree
+        config:
+        stream: file object formatted sql is written to
+        jobs: the number of processes. If this is None, the number of CPUs.
+    """
+
+    jobs = jobs or os.cpu_count() or 1
+    if jobs <= 1:
+        write(tree, config, stream)
+        return
+
+    if not tree.is_abstract:
+        raise ValueError('Failed to format, because target SyntaxTree is not Abstract')
+
+    with profiler.timer('format', 'gather'):
+        tokens = _gather_tokens(tree)
+
+    ranges: Dict[int, Ranges] = {}
+    boundaries: List[int] = []
+    with profiler.timer('format', 'statements'):
+        for head, split, is_end_of_statement in _iter_top_level(tokens):
+            ranges[head] = split
+            if is_end_of_statement:
+                boundaries.append(split[2])
+
+    # several parts for each process, which balance sizes of statements
+    parts = _cut_parts(boundaries, len(tokens), jobs * 4)
+    if len(parts) <= 1:
+        _write_root(_root_of(tokens), config, Emitter(stream))
+        return
+
+    with ProcessPoolExecutor(max_workers=min(jobs, len(parts))) as executor:
+        results = executor.map(
+            call_profiled,
+            [profiler.enabled] * len(parts),
+            [_write_part] * len(parts),
+            [tokens[start:stop] for start, stop in parts],
+            [_shift_ranges(ranges, start, stop) for start, stop in parts],
+            [config] * len(parts),
+            [start == 0 for start, _ in parts],
+            [stop == len(tokens) for _, stop in parts])
+        for text, stats in results:
+            # stats of formatting each part in worker processes
+            profiler.merge(stats)
+            stream.write(text)
+
+
+def write_file(tree: SyntaxTree, config: Config, stream: TextIO, jobs: int = 1):
+    """Formats whole sql of a file, and writes it to stream followed by a newline at end of file
+
+    This is the canonical formatted text of a file, which is printed by --format,
+    compared with the file by --check and --diff, and written to the file by --in-place.
+
+    Note: This is bang method.
+
+    Args:
+        tree: target SyntaxTree
+        config:
+        stream: file object formatted sql is written to
+        jobs: the number of processes formatting statements
+    """
+
+    write_statements(tree, config, stream, jobs)
+    stream.write('\n')
+
+
+def write_stream(lines: Iterable[str], config: Config, stream: TextIO):
+    """Formats sql read line by line, and writes each statement to stream as soon as it is read
+
+    A statement ends at the end of a line whose last token ends with ";". Each statement is formatted
+    independently, so that only tokens of the statement being read and the previous one are kept,
+    and memory usage is bounded by the largest statement instead of the size of sql.
+
+    Examples:
+    ----
+    with open('dump.sql') as fp:
+        write_stream(fp, config, sys.stdout)
+    ----
+
+    Args:
+        lines: lines of sql statement. e.g.) file object
+        config:
+        stream: file object formatted sql is written to
+    """
+
+    emitter = Emitter(stream)
+
+    # the previous statement is written once the next one is read, so that the last one is known
+    previous: List[Token] = []
+    tokens: List[Token] = []
+    for line_tokens in parse_lines(lines):
+        line_tokens = [token for token in line_tokens if token.kind != Token.WHITESPACE]
+        if not line_tokens:
+            continue
+
+        tokens.extend(line_tokens)
+        if _is_end_of_statement(line_tokens[-1]):
+            if previous:
+                with profiler.timer('format', 'statement'):
+                    _write_root(_root_of(previous), config, emitter, is_end=False)
+            previous, tokens = tokens, []
+
+    if previous and tokens:
+        with profiler.timer('format', 'statement'):
+            _write_root(_root_of(previous), config, emitter, is_end=False)
+    with profiler.timer('format', 'statement'):
+        _write_root(_root_of(tokens or previous), config, emitter)
+
+
+def _cut_parts(boundaries: List[int], length: int, count: int) -> List[Tuple[int, int]]:
+    """Cuts tokens at boundaries into parts of similar size
+
+    Args:
+        boundaries: indices tokens can be cut at, in ascending order
+        length: the number of tokens
+        count: the number of parts expected
+
+    Returns:
+        ranges of parts
+    """
+
+    size = max(1, length // count)
+    parts: List[Tuple[int, int]] = []
+    start = 0
+    for boundary in boundaries:
+        if boundary - start >= size:
+            parts.append((start, boundary))
+            start = boundary
+
+    if start < length:
+        parts.append((start, length))
+
+    return parts
+
+
+def _gather_statements(tree: SyntaxTree, start_line: int, end_line: int) -> Tuple[List[Token], int, Optional[int]]:
+    """Gathers tokens of statements overlapping lines from start_line to end_line
+
+    Top-level leaves are in order of lines, so that the leaf at start_line is found by binary search,
+    and the head of its statement by going back to the previous end of statement. Then leaves are visited
+    from there until the first token of the statement after end_line, and only their last tokens are
+    looked at to find ends of statements.
+
+    Args:
+        tree:
+        start_line: first line of the range
+        end_line: last line of the range (inclusive)
+
+    Returns:
+        tokens of the statements, line of their first token (0 if they are at head of sql)
+        and line of the first token following them (None if they are at end of sql)
+    """
+
+    leaves = tree.leaves
+
+    # the last top-level leaf at or before start_line
+    low, high = 0, len(leaves)
+    while low < high:
+        mid = (low + high) // 2
+        if leaves[mid].line_num <= start_line:
+            low = mid + 1
+        else:
+            high = mid
+    head = max(low - 1, 0)
+
+    # the top-level leaf following an end of statement
+    while head > 0:
+        last = _last_token(leaves[head-1])
+        if last is not None and _is_end_of_statement(last):
+            break
+        head -= 1
+
+    tokens: List[Token] = []
+    first_line = 0
+    is_end_of_statement = head > 0
+    for top in leaves[head:]:
+        # leaves to visit, whose top is visited first
+        stack = [top]
+        while stack:
+            leaf = stack.pop()
+            stack.extend(reversed(leaf.leaves))
+            if not leaf.tokens:
+                continue
+
+            if is_end_of_statement:
+                if leaf.line_num > end_line:
+                    return tokens, first_line, leaf.line_num
+                if leaf.line_num <= start_line:
+                    tokens, first_line = [], leaf.line_num
+
+            tokens.extend(leaf.tokens)
+            is_end_of_statement = _is_end_of_statement(leaf.tokens[-1])
+
+    return tokens, first_line, None
+
+
+def _last_token(tree: SyntaxTree) -> Optional[Token]:
+    """Returns the last token of the leaf and its descendants, or None if they have no tokens"""
+
+    for leaf in reversed(tree.leaves):
+        last = _last_token(leaf)
+        if last is not None:
+            return last
+
+    return tree.tokens[-1] if tree.tokens else None
+
+
+def _is_end_of_statement(token: Token) -> bool:
+    """Returns whether the token at end of a line ends a statement"""
+
+    return token.kind != Token.COMMENT and token.word.endswith(';')
+
+
+def _iter_top_level(tokens: List[Token]) -> Iterator[Tuple[int, Ranges, bool]]:
+    """Splits top-level leaves in the same way as reshaping, and finds ends of statements between them
+
+    A statement ends at a top-level leaf following a token which ends with ";". Its previous leaf must not
+    end with comma, which would be moved to the next leaf.
+
+    Args:
+        tokens: all tokens
+
+    Returns:
+        iterator of start of each top-level leaf, ranges split from it,
+        and whether a statement ends before its sibling
+    """
+
+    root = SyntaxTree(depth=0, line_num=0, is_abstract=True)
+
+    span = TokenSpan(tokens)
+    while span:
+        leaf = SyntaxTree(depth=1, line_num=0, tokens=span, parent=root, is_abstract=True)
+        own, children, sibling = _split_tokens(leaf)
+        sibling_start = sibling.start if sibling else span.stop
+
+        is_end_of_statement = bool(sibling) and \
+            tokens[sibling_start-1].word.endswith(';') and own[-1].kind != Token.COMMA
+        yield span.start, ((own.start, own.stop), [(c.start, c.stop) for c in children if c], sibling_start), \
+            is_end_of_statement
+
+        span = sibling
+
+
+def _shift_ranges(ranges: Dict[int, Ranges], start: int, stop: int) -> Dict[int, Ranges]:
+    """Returns ranges of top-level leaves in tokens[start:stop], which are relative to start"""
+
+    return {
+        head - start: (
+            (own[0] - start, own[1] - start),
+            [(c_start - start, c_stop - start) for c_start, c_stop in children],
+            sibling - start)
+        for head, (own, children, sibling) in ranges.items() if start <= head < stop}
+
+
+def _write_part(tokens: List[Token], ranges: Dict[int, Ranges], config: Config, is_head: bool, is_end: bool) -> str:
+    """Formats a part of tokens split at ends of statements
+
+    Top-level leaves are split by given ranges, which are split from whole tokens,
+    so that formatted text is the same as the part of formatting whole tokens.
+
+    Args:
+        tokens: tokens of the part
+        ranges: ranges split from top-level leaves, which are relative to the part
+        config:
+        is_head: whether the part is at head of sql
+        is_end: whether the part is at end of sql
+
+    Returns:
+        formatted sql of the part
+    """
+
+    splits = {
+        head: (TokenSpan(tokens, *own), [TokenSpan(tokens, *c) for c in children], TokenSpan(tokens, sibling))
+        for head, (own, children, sibling) in ranges.items()}
+
+    buffer = io.StringIO()
+    _write_root(_root_of(tokens), config, Emitter(buffer, is_written=not is_head), splits, is_end)
+
+    return buffer.getvalue()
@@ -0,0 +1,104 @@
+from typing import Dict, List, Optional, Sequence
+
+from .span import TokenSpan
+from sqlint.parser import Token
+
+
+class Tracer:
+    """Records decisions of formatter, which splitter split each line at which tokens and how wide the line is.
+
+    While tracing is disabled, nothing is recorded. Events are built from tokens only when they are recorded,
+    so callers in hot paths check enabled before calling split(), and pay nothing but a branch.
+
+    Examples:
+    ----
+    if tracer.enabled:
+        tracer.split('CommaSplitter', tree.depth, own, children, [sibling], width)
+    ----
+
+    Events are plain dicts grouped by name of sql such as a file path, so that they can be written as json.
+    Indices of tokens are relative to the tokens given by the last root() in the group.
+    """
+
+    def __init__(self):
+        self.enabled: bool = False
+        # name -> events
+        self.traces: Dict[str, List[Dict]] = {}
+        # events of the current group
+        self.events: List[Dict] = []
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        self.traces = {}
+        self.events = []
+
+    def start(self, name: str):
+        """Starts a group of events
+
+        Args:
+            name: name of sql. e.g.) file path
+        """
+        if not self.enabled:
+            return
+
+        self.events = self.traces.setdefault(name, [])
+
+    def root(self, tokens: int, max_width: int):
+        """Records the start of tokens being reshaped, which splits are relative to
+
+        Args:
+            tokens: the number of tokens. e.g.) tokens of a file or a statement
+            max_width: max line length
+        """
+        if not self.enabled:
+            return
+
+        self.events.append({'event': 'root', 'tokens': tokens, 'max_width': max_width})
+
+    def split(self, splitter: str, depth: int, own: Sequence[Token], children: List[Sequence[Token]],
+              siblings: List[Sequence[Token]], width: int):
+        """Records tokens of a line split by the splitter
+
+        Args:
+            splitter: splitter name. e.g.) CommaSplitter
+            depth: depth of the line
+            own: tokens left on the line
+            children: tokens of children
+            siblings: tokens of siblings following the line
+            width: width of the line including indent
+        """
+        if not self.enabled:
+            return
+
+        self.events.append({
+            'event': 'split',
+            'splitter': splitter,
+            'depth': depth,
+            'own': _range_of(own),
+            'children': [_range_of(c) for c in children if c],
+            'siblings': [_range_of(s) for s in siblings if s],
+            'width': width,
+            'line': ' '.join(token.word for token in own),
+        })
+
+    def dump(self) -> Dict:
+        """Returns serializable events"""
+        return {'traces': {name: list(events) for name, events in self.traces.items()}}
+
+
+def _range_of(tokens: Sequence[Token]) -> Optional[List[int]]:
+    """Returns [start, stop) of the span in shared tokens, or None if tokens are not a span"""
+
+    if isinstance(tokens, TokenSpan):
+        return [tokens.start, tokens.stop]
+
+    return None
+
+
+# tracer shared in the process
+tracer = Tracer()
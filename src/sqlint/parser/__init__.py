@@ -1,7 +1,11 @@
-from .base import parse
+from .base import parse, parse_lines
+from .suppression import SuppressionIndex, StreamingSuppressionIndex
 from .token import Token
 
 __all__ = [
     'parse',
+    'parse_lines',
+    'SuppressionIndex',
+    'StreamingSuppressionIndex',
     'Token'
 ]
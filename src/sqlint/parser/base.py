@@ -1,13 +1,14 @@
 import re
 from sre_parse import Pattern
-from typing import List, Tuple
+from typing import Iterable, Iterator, List, Optional, Tuple
 
 from . import pattern
+from .suppression import SuppressionIndex
 from .token import Token
 
 
 # TODO: Parses sql to Tree directory
-def parse(stmt: str) -> List[List[Token]]:
+def parse(stmt: str, suppressions: Optional[SuppressionIndex] = None) -> List[List[Token]]:
     """ Parses full sql statement to list of some tokens.
 
     Examples:
@@ -35,6 +36,7 @@ def parse(stmt: str) -> List[List[Token]]:
 
     Args:
         stmt: sql statement
+        suppressions: if this is passed, suppression directives in comments are collected into it.
 
     Returns:
         parsed list of tokens list
@@ -46,13 +48,53 @@ def parse(stmt: str) -> List[List[Token]]:
         for line in lines.split('\n'):
             stmt_list.extend(line.split('\r'))
 
-    result: List[List[Token]] = []
+    return list(parse_lines(stmt_list, suppressions))
+
+
+def parse_lines(lines: Iterable[str], suppressions: Optional[SuppressionIndex] = None) -> Iterator[List[Token]]:
+    """Parses sql statement line by line, which is used to parse large file without reading whole of it.
+
+    As same as parse(), text after the last new line is also a line even if it is empty.
+
+    Examples:
+    ----
+    with open('dump.sql') as fp:
+        for tokens in parse_lines(fp):
+            ...
+    ----
+
+    Args:
+        lines: lines of sql statement, which may end with new line. e.g.) file object
+        suppressions: if this is passed, suppression directives in comments are collected into it
+                      before tokens of the line are yielded.
+
+    Returns:
+        iterator of tokens in each lines
+    """
+
+    line_num = 0
     is_comment_line = False
-    for line in stmt_list:
+    last_line: Optional[str] = None
+
+    for line in lines:
+        last_line = line
+        line_num += 1
         tokens, is_comment_line = _tokenize(line.rstrip('\r\n'), is_comment_line)
-        result.append(tokens)
 
-    return result
+        if suppressions is not None:
+            suppressions.collect(line_num, tokens)
+        yield tokens
+
+    if last_line is None or last_line.endswith(('\n', '\r')):
+        line_num += 1
+        tokens, is_comment_line = _tokenize('', is_comment_line)
+
+        if suppressions is not None:
+            suppressions.collect(line_num, tokens)
+        yield tokens
+
+    if suppressions is not None:
+        suppressions.build()
 
 
 def _tokenize_comment_end(text: str) -> Tuple[str, List[Token], bool]:
@@ -5,6 +5,9 @@ ref) https://cloud.google.com/bigquery/docs/reference/standard-sql/lexical?hl=ja
 Some keywords are used legacy-sql and these are replaced other functions in standard-sql
 ref) # https://cloud.google.com/bigquery/docs/reference/standard-sql/migrating-from-legacy-sql#function_comparison
 """
+from functools import lru_cache
+from typing import Dict
+
 RESERVED_KEYWORDS = [
     'ALL', 'AND', 'ANY', 'ARRAY', 'AS', 'ASC', 'ASSERT_ROWS_MODIFIED',
     'AT', 'BETWEEN', 'BY', 'CASE', 'COLLATE', 'CONTAINS', 'CREATE',
@@ -94,9 +97,15 @@ BINARY_OPERATORS_ESCAPED = [
 ]
 
 
+KEYWORD_STYLES = ['lower', 'upper-all', 'upper-head']
+
+
 def format(keyword: str, keyword_style: str) -> str:
     """Returns formatted keyword
 
+    Reserved keywords written in any style are looked up in the table of the style,
+    and other words are formatted and cached.
+
     Args:
         keyword: target keyword
         keyword_style: formatting style
@@ -104,13 +113,40 @@ def format(keyword: str, keyword_style: str) -> str:
     Returns:
         formatted keyword
     """
-    expected: str = keyword
+    try:
+        return STYLED_KEYWORDS[keyword_style][keyword]
+    except KeyError:
+        return _format_unknown(keyword, keyword_style)
+
+
+@lru_cache(maxsize=4096)
+def _format_unknown(keyword: str, keyword_style: str) -> str:
+    """Returns formatted keyword which is not in the table, such as mixed case keyword"""
+    return _format(keyword, keyword_style)
+
+
+def _format(keyword: str, keyword_style: str) -> str:
+    """Returns formatted keyword without the table"""
 
     if keyword_style == 'lower':
-        expected = keyword.lower()
+        return keyword.lower()
     if keyword_style == 'upper-all':
-        expected = keyword.upper()
+        return keyword.upper()
     if keyword_style == 'upper-head':
-        expected = f'{keyword[0].upper()}{keyword[1:].lower()}'
+        return f'{keyword[0].upper()}{keyword[1:].lower()}'
+
+    return keyword
+
+
+def _styled_table(keyword_style: str) -> Dict[str, str]:
+    """Returns reserved keywords and functions formatted by the style, keyed by them written in each style"""
+
+    return {
+        written: _format(keyword, keyword_style)
+        for keyword in RESERVED_KEYWORDS + RESERVED_FUNCTIONS
+        for written in [_format(keyword, style) for style in KEYWORD_STYLES]
+    }
+
 
-    return expected
+# formatted reserved keywords for each style, which are built once on import
+STYLED_KEYWORDS: Dict[str, Dict[str, str]] = {style: _styled_table(style) for style in KEYWORD_STYLES}
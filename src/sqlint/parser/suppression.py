@@ -0,0 +1,251 @@
+import re
+from bisect import bisect_right
+from typing import Dict, List, Optional, Tuple
+
+from .token import Token
+
+# matches suppression directive in comment
+# e.g.) -- sqlint: disable=E201,E202
+REGEX_DIRECTIVE = (r'(?:--|#|/\*)?\s*sqlint\s*:\s*(disable-next-line|disable|enable)\b'
+                   r'(?:\s*=\s*([A-Z]+\d+(?:\s*,\s*[A-Z]+\d+)*))?')
+DIRECTIVE = re.compile(REGEX_DIRECTIVE, re.IGNORECASE)
+
+# quotes of string literals, in which directives are not collected
+QUOTES = ('\'', '"')
+
+# the key standing for all violation codes
+ALL_CODES = '*'
+
+# end line of the range which is not closed by "enable"
+OPEN_END = float('inf')
+
+
+class SuppressionIndex:
+    """Index of line ranges where violations are suppressed by comments.
+
+    Supported directives are below.
+        - disable-next-line=CODES: suppresses violations at the next line.
+        - disable=CODES: suppresses violations at the line if it follows any statement.
+            Otherwise, suppresses violations from the line until "enable" directive or end of file.
+        - enable=CODES: closes range opened by "disable".
+
+    If CODES is omitted, all violations are suppressed.
+
+    Examples:
+    ----
+    select
+        a,  -- sqlint: disable=E301
+        -- sqlint: disable-next-line=E201
+        b  ,  c
+    -- sqlint: disable
+    from   legacy_table
+    -- sqlint: enable
+    ----
+
+    Ranges are collected by the parser while tokenizing and merged into sorted intervals each
+    violation code, so that checkers can look up whether a line is suppressed in O(log N)
+    before creating violations.
+    """
+
+    def __init__(self):
+        # ranges being collected: code -> list of (start, end)
+        self._ranges: Dict[str, List[Tuple[int, float]]] = {}
+        # ranges opened by "disable" and not closed yet: code -> start line
+        self._opened: Dict[str, int] = {}
+        # built index: code -> sorted start lines and end lines of merged ranges
+        self._starts: Dict[str, List[int]] = {}
+        self._ends: Dict[str, List[float]] = {}
+
+    def __bool__(self) -> bool:
+        return bool(self._starts)
+
+    def collect(self, line_num: int, tokens: List[Token]):
+        """Collects directives in comments of a line
+
+        Args:
+            line_num: the number of line (1-origin)
+            tokens: tokens of the line
+        """
+
+        is_trailing = False
+        # quote of string literal being open, whose text after whitespaces may be tokenized as comment
+        quote: Optional[str] = None
+        for token in tokens:
+            if token.kind != Token.COMMENT:
+                if token.kind != Token.WHITESPACE:
+                    is_trailing = True
+                quote = self._open_quote(token.word, quote)
+                continue
+
+            if quote is not None:
+                continue
+
+            match = DIRECTIVE.match(token.word)
+            if match is None:
+                continue
+
+            directive = match.group(1).lower()
+            codes = self._parse_codes(match.group(2))
+
+            for code in codes:
+                if directive == 'disable-next-line':
+                    self.add(code, line_num + 1, line_num + 1)
+                elif directive == 'disable' and is_trailing:
+                    self.add(code, line_num, line_num)
+                elif directive == 'disable':
+                    self._opened.setdefault(code, line_num)
+                else:  # directive == 'enable'
+                    self._close(code, line_num)
+
+    @staticmethod
+    def _open_quote(word: str, quote: Optional[str]) -> Optional[str]:
+        """Returns quote of string literal which is still open after the word"""
+
+        for char in word:
+            if quote is None and char in QUOTES:
+                quote = char
+            elif char == quote:
+                quote = None
+
+        return quote
+
+    @staticmethod
+    def _parse_codes(value: Optional[str]) -> List[str]:
+        if value is None:
+            return [ALL_CODES]
+
+        codes = [v.strip().upper() for v in value.split(',')]
+        codes = [c for c in codes if c]
+
+        return codes if codes else [ALL_CODES]
+
+    def _close(self, code: str, line_num: int):
+        if code == ALL_CODES:
+            # "enable" without codes closes all ranges
+            for c, start in self._opened.items():
+                self.add(c, start, line_num)
+            self._opened = {}
+            return
+
+        if code in self._opened:
+            self.add(code, self._opened.pop(code), line_num)
+
+    def add(self, code: str, start: int, end: float):
+        """Adds the range where violations are suppressed
+
+        Args:
+            code: violation code, or ALL_CODES
+            start: first line of range
+            end: last line of range
+        """
+        self._ranges.setdefault(code, []).append((start, end))
+
+    def build(self):
+        """Closes ranges opened until end of file and builds index"""
+
+        for code, start in self._opened.items():
+            self.add(code, start, OPEN_END)
+        self._opened = {}
+
+        for code, ranges in self._ranges.items():
+            starts: List[int] = []
+            ends: List[float] = []
+            for start, end in sorted(ranges):
+                # merges overlapped or adjacent ranges
+                if ends and start <= ends[-1] + 1:
+                    ends[-1] = max(ends[-1], end)
+                    continue
+                starts.append(start)
+                ends.append(end)
+
+            self._starts[code] = starts
+            self._ends[code] = ends
+
+    def is_suppressed(self, code: str, line_num: int) -> bool:
+        """Returns whether violations of code are suppressed at the line
+
+        Args:
+            code: violation code. e.g.) E201
+            line_num: the number of line (1-origin)
+
+        Returns:
+            True if suppressed
+        """
+        if not self._starts:
+            return False
+
+        return self._contains(code, line_num) or self._contains(ALL_CODES, line_num)
+
+    def is_suppressed_all(self, code: str) -> bool:
+        """Returns whether violations of code are suppressed in whole of file
+
+        Args:
+            code: violation code. e.g.) E201
+
+        Returns:
+            True if suppressed from the first line until end of file
+        """
+        return self._covers(code) or self._covers(ALL_CODES)
+
+    def _covers(self, code: str) -> bool:
+        starts = self._starts.get(code)
+        if not starts:
+            return False
+
+        # ranges are merged, so that only the first range may cover whole of file
+        return starts[0] <= 1 and self._ends[code][0] == OPEN_END
+
+    def _contains(self, code: str, line_num: int) -> bool:
+        starts = self._starts.get(code)
+        if not starts:
+            return False
+
+        idx = bisect_right(starts, line_num) - 1
+
+        return idx >= 0 and line_num <= self._ends[code][idx]
+
+
+class StreamingSuppressionIndex(SuppressionIndex):
+    """Suppression index looked up while lines are being streamed.
+
+    Directives of a line are collected before the line is checked, so that ranges collected so far
+    are enough to decide whether the line is suppressed. Ranges ending before the current line are
+    discarded, so that memory usage does not grow with the number of lines.
+    """
+
+    def __bool__(self) -> bool:
+        return bool(self._ranges) or bool(self._opened)
+
+    def build(self):
+        """Does nothing, because ranges are looked up without building index"""
+        pass
+
+    def is_suppressed(self, code: str, line_num: int) -> bool:
+        return self._contains(code, line_num) or self._contains(ALL_CODES, line_num)
+
+    def _contains(self, code: str, line_num: int) -> bool:
+        start = self._opened.get(code)
+        if start is not None and start <= line_num:
+            return True
+
+        for start, end in self._ranges.get(code, []):
+            if start <= line_num <= end:
+                return True
+
+        return False
+
+    def discard(self, line_num: int):
+        """Discards ranges ending before the line
+
+        Args:
+            line_num: the number of line (1-origin)
+        """
+        if not self._ranges:
+            return
+
+        for code in list(self._ranges.keys()):
+            ranges = [r for r in self._ranges[code] if line_num <= r[1]]
+            if ranges:
+                self._ranges[code] = ranges
+            else:
+                del self._ranges[code]
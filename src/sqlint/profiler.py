@@ -0,0 +1,185 @@
+from typing import Any, Callable, Dict, List, Tuple
+
+try:
+    from time import perf_counter_ns
+except ImportError:  # python 3.6
+    from time import perf_counter
+
+    def perf_counter_ns() -> int:
+        return int(perf_counter() * 1e9)
+
+
+class _Timer:
+    """Adds elapsed time of with-block to stats"""
+
+    __slots__ = ('stats', 'key', 'start')
+
+    def __init__(self, stats: Dict[str, List[int]], key: str):
+        self.stats = stats
+        self.key = key
+        self.start = 0
+
+    def __enter__(self):
+        self.start = perf_counter_ns()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        elapsed = perf_counter_ns() - self.start
+        stat = self.stats.get(self.key)
+        if stat is None:
+            self.stats[self.key] = [1, elapsed]
+        else:
+            stat[0] += 1
+            stat[1] += elapsed
+
+
+class _NullTimer:
+    """Does nothing, which is returned while profiling is disabled"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+
+NULL_TIMER = _NullTimer()
+
+
+class Profiler:
+    """Collects counters and elapsed times of each stage and each rule.
+
+    While profiling is disabled, timer() returns shared no-op object and count() returns immediately,
+    so that instrumented code pays nothing but a method call.
+
+    Examples:
+    ----
+    with profiler.timer('check', 'CommaChecker'):
+        violations = CommaChecker.check(tree, config)
+    profiler.count('violations', len(violations))
+    ----
+
+    Stats are plain dicts, so that stats collected in worker processes can be sent by dump()
+    and aggregated by merge().
+    """
+
+    def __init__(self):
+        self.enabled: bool = False
+        # key -> [calls, elapsed nanoseconds]
+        self.timers: Dict[str, List[int]] = {}
+        # key -> count
+        self.counters: Dict[str, int] = {}
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        self.timers = {}
+        self.counters = {}
+
+    def timer(self, stage: str, name: str = ''):
+        """Returns context manager measuring elapsed time
+
+        Args:
+            stage: stage name. e.g.) tokenize, check, format
+            name: rule name in the stage. e.g.) CommaChecker
+
+        Returns:
+            context manager
+        """
+        if not self.enabled:
+            return NULL_TIMER
+
+        return _Timer(self.timers, f'{stage}.{name}' if name else stage)
+
+    def count(self, name: str, value: int = 1):
+        """Adds value to counter
+
+        Args:
+            name: counter name
+            value: value to be added
+        """
+        if not self.enabled:
+            return
+
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def dump(self) -> Dict:
+        """Returns serializable stats"""
+        return {
+            'timers': {k: {'calls': v[0], 'time_ns': v[1]} for k, v in self.timers.items()},
+            'counters': dict(self.counters),
+        }
+
+    def merge(self, stats: Dict):
+        """Aggregates stats made by dump(), for example which are collected in other process
+
+        Args:
+            stats: stats made by dump()
+        """
+        for key, value in stats.get('timers', {}).items():
+            stat = self.timers.setdefault(key, [0, 0])
+            stat[0] += value['calls']
+            stat[1] += value['time_ns']
+
+        for key, value in stats.get('counters', {}).items():
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def summary(self) -> str:
+        """Returns summary table of stats
+
+        Examples:
+        ----
+        stage                               calls    total(ms)  per call(us)
+        tokenize                               12        1.234       102.833
+        ...
+        ----
+        """
+        lines = [f'{"stage":<40} {"calls":>10} {"total(ms)":>12} {"per call(us)":>14}']
+        for key, (calls, time_ns) in sorted(self.timers.items(), key=lambda x: -x[1][1]):
+            lines.append(f'{key:<40} {calls:>10} {time_ns / 1e6:>12.3f} {time_ns / 1e3 / calls:>14.3f}')
+
+        if self.counters:
+            lines.append('')
+            lines.append(f'{"counter":<40} {"count":>10}')
+            for key, value in sorted(self.counters.items()):
+                lines.append(f'{key:<40} {value:>10}')
+
+        return '\n'.join(lines)
+
+
+# profiler shared in the process
+profiler = Profiler()
+
+
+def call_profiled(enabled: bool, func: Callable, *args) -> Tuple[Any, Dict]:
+    """Calls func in a worker process, and returns its result with stats collected while it runs
+
+    Stats of the worker are reset before the call, because forked worker inherits stats of the parent,
+    so that the parent can aggregate returned stats by profiler.merge() without counting anything twice.
+
+    Examples:
+    ----
+    for result, stats in executor.map(call_profiled, [profiler.enabled] * len(tasks), [func] * len(tasks), tasks):
+        profiler.merge(stats)
+    ----
+
+    Args:
+        enabled: whether profiling is enabled in the parent
+        func: top-level function, which can be pickled to worker processes
+        args: arguments of func
+
+    Returns:
+        result of func and stats made by dump()
+    """
+    profiler.reset()
+    if enabled:
+        profiler.enable()
+    else:
+        profiler.disable()
+
+    return func(*args), profiler.dump()
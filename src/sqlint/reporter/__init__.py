@@ -0,0 +1,8 @@
+from .base import get_reporter, OUTPUT_FORMATS
+from .reporter import Reporter
+
+__all__ = [
+    'get_reporter',
+    'OUTPUT_FORMATS',
+    'Reporter',
+]
@@ -0,0 +1,29 @@
+from typing import TextIO
+
+from . import reporter as rpt
+
+REPORTER_LIST = {
+    'text': rpt.TextReporter,
+    'jsonl': rpt.JsonLinesReporter,
+    'sarif': rpt.SarifReporter,
+    'checkstyle': rpt.CheckstyleReporter,
+}
+
+OUTPUT_FORMATS = list(REPORTER_LIST.keys())
+
+
+def get_reporter(output_format: str, stream: TextIO) -> rpt.Reporter:
+    """Returns reporter which writes violations in specified format
+
+    Args:
+        output_format: one of OUTPUT_FORMATS
+        stream: writable text stream
+
+    Returns:
+        Reporter instance
+    """
+
+    if output_format not in REPORTER_LIST:
+        raise ValueError(f'output format must be in {OUTPUT_FORMATS}, but {output_format}')
+
+    return REPORTER_LIST[output_format](stream)
@@ -0,0 +1,169 @@
+import json
+from abc import ABCMeta, abstractmethod
+from typing import Dict, List, Optional, TextIO
+from xml.sax.saxutils import quoteattr
+
+from sqlint import __version__
+from sqlint.checker.plugin import get_codes
+
+
+class Reporter(metaclass=ABCMeta):
+    """Writes violations to stream.
+
+    Violations are passed file by file and serialized as soon as they arrive,
+    so that reporter does not hold violations of all files.
+    Violations of a file may be passed in several calls in order, for example in streaming mode.
+    Each violation is a dict made by Violation.to_dict().
+    """
+
+    def __init__(self, stream: TextIO):
+        self.stream: TextIO = stream
+
+    def start(self):
+        """Writes header before any violations"""
+        pass
+
+    @abstractmethod
+    def report(self, file: str, violations: List[Dict]):
+        """Writes violations of a file
+
+        Args:
+            file: path to the file
+            violations: sorted violations in the file
+        """
+        pass
+
+    def finish(self):
+        """Writes footer after all violations"""
+        self.stream.flush()
+
+
+class TextReporter(Reporter):
+    """
+    Examples:
+    ----
+    example.sql (L3, 8): whitespace must be before binary operator: b+
+    ----
+    """
+
+    def report(self, file: str, violations: List[Dict]):
+        self.stream.writelines(
+            [f'{file} (L{v["line"]}, {v["pos"]}): {v["message"]}\n' for v in violations])
+
+
+class JsonLinesReporter(Reporter):
+    """
+    Examples:
+    ----
+    {"file": "example.sql", "line": 3, "pos": 8, "code": "E207", "message": "whitespace must be ..."}
+    ----
+    """
+
+    def report(self, file: str, violations: List[Dict]):
+        self.stream.writelines(
+            [json.dumps(dict(file=file, **v)) + '\n' for v in violations])
+
+
+class SarifReporter(Reporter):
+    """Writes violations as SARIF v2.1.0 log.
+
+    ref) https://docs.oasis-open.org/sarif/sarif/v2.1.0/sarif-v2.1.0.html
+    """
+
+    SCHEMA = 'https://json.schemastore.org/sarif-2.1.0.json'
+    VERSION = '2.1.0'
+
+    def __init__(self, stream: TextIO):
+        super().__init__(stream)
+        self.is_first: bool = True
+
+    def start(self):
+        rules = [
+            {'id': c.code, 'name': c.name, 'shortDescription': {'text': c.template}}
+            for c in get_codes()]
+        driver = {
+            'name': 'sqlint',
+            'version': __version__,
+            'informationUri': 'https://github.com/shigeru0215/sqlint',
+            'rules': rules,
+        }
+
+        # results are written one by one, so writes json until opening of "results" array.
+        self.stream.write(
+            f'{{"$schema": {json.dumps(self.SCHEMA)}, "version": {json.dumps(self.VERSION)}, '
+            f'"runs": [{{"tool": {{"driver": {json.dumps(driver)}}}, "results": [')
+
+    def report(self, file: str, violations: List[Dict]):
+        uri = file.replace('\\', '/')
+
+        for v in violations:
+            result = {
+                'ruleId': v['code'],
+                'level': 'warning',
+                'message': {'text': v['message']},
+                'locations': [{
+                    'physicalLocation': {
+                        'artifactLocation': {'uri': uri},
+                        'region': {'startLine': v['line'], 'startColumn': v['pos']},
+                    }
+                }],
+            }
+            if 'fingerprint' in v:
+                result['partialFingerprints'] = {'sqlint/v1': v['fingerprint']}
+
+            if not self.is_first:
+                self.stream.write(',')
+            self.is_first = False
+            self.stream.write('\n' + json.dumps(result))
+
+    def finish(self):
+        self.stream.write('\n]}]}\n')
+        super().finish()
+
+
+class CheckstyleReporter(Reporter):
+    """Writes violations as checkstyle xml
+
+    Examples:
+    ----
+    <?xml version="1.0" encoding="UTF-8"?>
+    <checkstyle version="4.3">
+    <file name="example.sql">
+    <error line="3" column="8" severity="warning" message="..." source="sqlint.E207"/>
+    </file>
+    </checkstyle>
+    ----
+    """
+
+    def __init__(self, stream: TextIO):
+        super().__init__(stream)
+        # the file whose element is opened
+        self.current_file: Optional[str] = None
+
+    def start(self):
+        self.stream.write('<?xml version="1.0" encoding="UTF-8"?>\n<checkstyle version="4.3">\n')
+
+    def report(self, file: str, violations: List[Dict]):
+        if not violations:
+            return
+
+        lines = []
+        if file != self.current_file:
+            if self.current_file is not None:
+                lines.append('</file>\n')
+            lines.append(f'<file name={quoteattr(file)}>\n')
+            self.current_file = file
+
+        for v in violations:
+            lines.append(
+                f'<error line="{v["line"]}" column="{v["pos"]}" severity="warning" '
+                f'message={quoteattr(v["message"])} source="sqlint.{v["code"]}"/>\n')
+
+        self.stream.writelines(lines)
+
+    def finish(self):
+        if self.current_file is not None:
+            self.stream.write('</file>\n')
+            self.current_file = None
+        self.stream.write('</checkstyle>\n')
+        super().finish()
@@ -1,7 +1,8 @@
-from typing import List, Optional
+from typing import Iterator, List, Optional
 
-from .parser import Token
+from .parser import SuppressionIndex, Token
 from .parser import parse as parse_sql
+from .profiler import profiler
 
 
 class Node:
@@ -151,6 +152,10 @@ class SyntaxTree:
         self.parent: Optional['SyntaxTree'] = parent
         self.node: Node = Node(line_num=line_num, tokens=tokens)
         self.is_abstract: bool = is_abstract
+        # suppression directives in sql, which is set to root tree only
+        self.suppressions: Optional[SuppressionIndex] = None
+        # raw sql statement, which is set to root tree only
+        self.source: Optional[str] = None
 
     @property
     def depth(self) -> int:
@@ -232,7 +237,29 @@ class SyntaxTree:
         if sql_type != 'StandardSQL':
             raise NotImplementedError(f'this linter can parses only "StandardSQL" right now, but {sql_type}')
 
-        token_list: List[List[Token]] = parse_sql(sql)
+        suppressions = SuppressionIndex()
+        with profiler.timer('tokenize'):
+            token_list: List[List[Token]] = parse_sql(sql, suppressions)
+        profiler.count('lines', len(token_list))
+
+        with profiler.timer('tree'):
+            result = cls._build(token_list, is_abstract)
+        result.suppressions = suppressions
+        result.source = sql
+
+        return result
+
+    @classmethod
+    def _build(cls, token_list: List[List[Token]], is_abstract: bool) -> 'SyntaxTree':
+        """Returns SyntaxTree constructed by indent of each lines
+
+        Args:
+            token_list: list of tokens in each lines
+            is_abstract: If this is True, this tree is constructed abstractly.
+
+        Returns:
+            SyntaxTree instance
+        """
 
         # creates empty syntax tree as guard
         parent_vertex = SyntaxTree(depth=0, line_num=0, is_abstract=is_abstract)
@@ -311,6 +338,19 @@ class SyntaxTree:
 
         return result
 
+    def walk(self) -> Iterator['SyntaxTree']:
+        """Yields descendant trees in order of lines, which does not use recursive call.
+
+        Returns:
+            iterator of descendant trees
+        """
+
+        stack: List[SyntaxTree] = list(reversed(self.leaves))
+        while stack:
+            leaf = stack.pop()
+            yield leaf
+            stack.extend(reversed(leaf.leaves))
+
     def add_leaf(self, leaf: 'SyntaxTree'):
         self.leaves.append(leaf)
 
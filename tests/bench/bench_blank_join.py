@@ -0,0 +1,74 @@
+"""Measures time of inserting blank lines between top-level leaves and INNER/OUTER before JOINs, doubling the input
+
+Both are rewritten in a single pass, so that time should roughly double with the input.
+
+Usage:
+    python tests/bench/bench_blank_join.py [--size N] [--steps N]
+"""
+import argparse
+import gc
+import time
+
+from sqlint.formatter.formatter import BlankLineFormatter, JoinFormatter
+from sqlint.parser import Token
+from sqlint.syntax_tree import SyntaxTree
+
+JOINS = [['LEFT', 'JOIN'], ['JOIN'], ['RIGHT', 'JOIN'], ['INNER', 'JOIN'], ['FULL', 'OUTER', 'JOIN']]
+
+
+def _measure_joins(joins: int) -> float:
+    # a line having all joins, e.g.) from t0 left join t1 join t2 right join t3 ...
+    tokens = [Token(word='FROM', kind=Token.KEYWORD), Token(word='t0', kind=Token.IDENTIFIER)]
+    for i in range(joins):
+        tokens.extend(Token(word=word, kind=Token.KEYWORD) for word in JOINS[i % len(JOINS)])
+        tokens.append(Token(word=f't{i + 1}', kind=Token.IDENTIFIER))
+    leaf = SyntaxTree(depth=1, line_num=1, tokens=tokens)
+
+    # collections of the whole input make steps of time, which are not of formatting
+    gc.disable()
+    start = time.perf_counter()
+    JoinFormatter.format_line(leaf, 'upper-all')
+    elapsed = time.perf_counter() - start
+    gc.enable()
+
+    assert len(leaf.tokens) == len(tokens) + joins - joins // len(JOINS) * 2
+    return elapsed
+
+
+def _measure_blanks(leaves: int) -> float:
+    # every other leaf is followed by a blank line
+    root = SyntaxTree(depth=0, line_num=0)
+    root.leaves.extend(SyntaxTree(depth=1, line_num=i + 1, tokens=[Token(word=f't{i}', kind=Token.IDENTIFIER)])
+                       for i in range(leaves))
+    blanks = [i % 2 == 0 for i in range(leaves)]
+
+    # collections of the whole input make steps of time, which are not of formatting
+    gc.disable()
+    start = time.perf_counter()
+    BlankLineFormatter.insert_blanks(root, blanks)
+    elapsed = time.perf_counter() - start
+    gc.enable()
+
+    assert len(root.leaves) == leaves + sum(blanks[:-1]) + 1
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--size', type=int, default=10000)
+    parser.add_argument('--steps', type=int, default=4)
+    args = parser.parse_args()
+
+    for name, measure in [('joins', _measure_joins), ('leaves', _measure_blanks)]:
+        previous = None
+        size = args.size
+        for _ in range(args.steps):
+            elapsed = min(measure(size) for _ in range(3))
+            ratio = f'{elapsed / previous:6.2f}x' if previous else ''
+            print(f'{name} {size:>8}: {elapsed * 1e3:10.3f} ms {ratio}')
+            previous = elapsed
+            size *= 2
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""Measures formatting time of a corpus with KeywordSplitter dispatched by the keyword table and by linear search
+
+Linear search emulates the former dispatch, which built the list of (keywords, handler) pairs on every call
+and searched it in order. Formatted sql must be the same in both runs.
+
+Usage:
+    python tests/bench/bench_dispatch.py [--statements N] [--repeat N]
+"""
+import argparse
+import glob
+import io
+import os
+import time
+
+from sqlint.config import Config
+from sqlint.formatter import write
+from sqlint.formatter.splitter import KeywordSplitter
+from sqlint.parser import Token
+from sqlint.syntax_tree import SyntaxTree
+
+SAMPLES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'samples')
+
+STATEMENT = ('select t1.a, t2.b, case when t1.c > 0 then 1 else 0 end as c from table_1 as t1 '
+             'left outer join table_2 as t2 on t1.id = t2.id where t1.a > 1 and t2.b < 10 '
+             'group by t1.a, t2.b having count(*) > 1 order by t1.a limit 10;\n')
+
+
+def _corpus(statements: int):
+    sqls = []
+    for path in sorted(glob.glob(os.path.join(SAMPLES_DIR, '*.sql'))):
+        with open(path) as fp:
+            sqls.append(fp.read())
+    sqls.append(STATEMENT * statements)
+
+    return sqls
+
+
+def _linear_split(cls, tokens, tree):
+    """KeywordSplitter.split searching (keywords, handler) pairs built on every call"""
+    head = tokens[0]
+
+    if head.kind not in [Token.KEYWORD, Token.FUNCTION]:
+        raise ValueError(f'token kind must be reserved KEYWORD or FUNCTION, but {head.kind}')
+
+    key_functions = []
+    for word, func in KeywordSplitter.handlers.items():
+        if key_functions and key_functions[-1][1] == func:
+            key_functions[-1][0].append(word)
+        else:
+            key_functions.append(([word], func))
+
+    word = head.word.upper()
+    for keys, func in key_functions:
+        if word in keys:
+            return func(tokens)
+
+    return tokens, [], []
+
+
+def _run(sqls, config, repeat: int):
+    elapsed = []
+    for _ in range(repeat):
+        # trees are reshaped in place, so that they are parsed again out of measurement
+        trees = [SyntaxTree.sqlptree(sql, is_abstract=True) for sql in sqls]
+        streams = [io.StringIO() for _ in trees]
+
+        start = time.perf_counter()
+        for tree, stream in zip(trees, streams):
+            write(tree, config, stream)
+        elapsed.append(time.perf_counter() - start)
+
+    return min(elapsed), [stream.getvalue() for stream in streams]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--statements', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    sqls = _corpus(args.statements)
+    config = Config()
+
+    with_table, expected = _run(sqls, config, args.repeat)
+
+    split = KeywordSplitter.__dict__['split']
+    KeywordSplitter.split = classmethod(_linear_split)
+    try:
+        with_linear, formatted = _run(sqls, config, args.repeat)
+    finally:
+        KeywordSplitter.split = split
+
+    assert formatted == expected, 'dispatch changed formatted sql'
+    print(f'files: {len(sqls)}, bytes: {sum(len(sql) for sql in sqls)}')
+    print(f'linear search:  {with_linear * 1e3:10.3f} ms')
+    print(f'keyword table:  {with_table * 1e3:10.3f} ms ({with_linear / with_table:.2f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""Measures latency of format_range() for the first and the last statement of a large script
+
+Latency is expected to be proportional to the statements in the range, not to lines before them.
+
+Usage:
+    python tests/bench/bench_format_range.py [--statements N]
+"""
+import argparse
+import os
+import time
+
+from sqlint.config import Config
+from sqlint.formatter import format_range
+from sqlint.syntax_tree import SyntaxTree
+
+SAMPLES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'samples')
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--statements', type=int, default=4000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with open(os.path.join(SAMPLES_DIR, 'query001.sql')) as fp:
+        statement = fp.read().rstrip('\n') + ';\n'
+    source = statement * args.statements
+    lines = statement.count('\n')
+    config = Config()
+
+    for name, line in [('first', 1), ('middle', lines * (args.statements // 2) + 1),
+                       ('last', lines * (args.statements - 1) + 1)]:
+        elapsed = []
+        for _ in range(args.repeat):
+            tree = SyntaxTree.sqlptree(source, is_abstract=True)
+            start = time.perf_counter()
+            format_range(tree, config, source, line, line)
+            elapsed.append(time.perf_counter() - start)
+        print(f'{name:<8} line {line:>8}: {min(elapsed) * 1e3:10.3f} ms')
+
+
+if __name__ == '__main__':
+    main()
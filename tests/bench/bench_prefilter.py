@@ -0,0 +1,79 @@
+"""Measures checking time of a corpus with and without prefilters of rules
+
+The corpus is made of tests/samples and synthetic files, most of which have no joins, commas or operators,
+like DDL and simple queries in real repositories. Violations must be the same in both runs.
+
+Usage:
+    python tests/bench/bench_prefilter.py [--files N] [--repeat N]
+"""
+import argparse
+import glob
+import os
+import random
+import time
+
+from sqlint.checker import check, Prefilter
+from sqlint.config import Config
+from sqlint.syntax_tree import SyntaxTree
+
+SAMPLES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'samples')
+
+SYNTHETIC = [
+    'select\n    id\nfrom\n    table_{i}\nwhere\n    id = {i}\n',
+    'select\n    *\nfrom\n    table_{i}\nlimit\n    {i}\n',
+    'create table table_{i} (\n    id int\n    , name varchar(64)\n)\n',
+    'select\n    t1.id\nfrom\n    table_{i} as t1\n    left outer join table_x as t2\n        on t1.id = t2.id\n',
+]
+
+
+def _corpus(files: int):
+    sqls = []
+    for path in sorted(glob.glob(os.path.join(SAMPLES_DIR, '*.sql'))):
+        with open(path) as fp:
+            sqls.append(fp.read())
+
+    random.seed(0)
+    for i in range(files - len(sqls)):
+        # each file has 20 statements of the same kind
+        template = random.choice(SYNTHETIC)
+        sqls.append('\n'.join([template.format(i=i * 20 + j) for j in range(20)]))
+
+    return [SyntaxTree.sqlptree(sql) for sql in sqls]
+
+
+def _run(trees, config, repeat: int):
+    elapsed = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        violations = [len(check(tree, config)) for tree in trees]
+        elapsed.append(time.perf_counter() - start)
+
+    return min(elapsed), violations
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--files', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    trees = _corpus(args.files)
+    config = Config()
+
+    with_prefilter, expected = _run(trees, config, args.repeat)
+
+    match = Prefilter.match
+    Prefilter.match = lambda self, index: True
+    try:
+        without_prefilter, violations = _run(trees, config, args.repeat)
+    finally:
+        Prefilter.match = match
+
+    assert violations == expected, 'prefilters changed violations'
+    print(f'files: {len(trees)}, violations: {sum(expected)}')
+    print(f'without prefilter: {without_prefilter * 1e3:10.3f} ms')
+    print(f'with prefilter:    {with_prefilter * 1e3:10.3f} ms ({without_prefilter / with_prefilter:.2f}x)')
+
+
+if __name__ == '__main__':
+    main()
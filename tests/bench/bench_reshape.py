@@ -0,0 +1,50 @@
+"""Measures formatting time of synthetic minified queries, doubling the number of statements
+
+Each query is written in a single line, which is reshaped from a single leaf having all tokens.
+Reshaping is linear in tokens, so that time should roughly double with the input.
+
+Usage:
+    python tests/bench/bench_reshape.py [--statements N] [--steps N]
+"""
+import argparse
+import io
+import time
+
+from sqlint.config import Config
+from sqlint.formatter import write
+from sqlint.syntax_tree import SyntaxTree
+
+STATEMENT = ('select t1.a, t2.b, count(*) as c from table_1 as t1 inner join table_2 as t2 on t1.id = t2.id '
+             'where t1.a > 1 and t2.b < 10 group by t1.a, t2.b; ')
+
+
+def _measure(statements: int, config: Config) -> float:
+    sql = STATEMENT * statements
+    tree = SyntaxTree.sqlptree(sql, is_abstract=True)
+
+    start = time.perf_counter()
+    write(tree, config, io.StringIO())
+
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--statements', type=int, default=250)
+    parser.add_argument('--steps', type=int, default=4)
+    args = parser.parse_args()
+
+    config = Config()
+
+    previous = None
+    statements = args.statements
+    for _ in range(args.steps):
+        elapsed = _measure(statements, config)
+        ratio = f'{elapsed / previous:6.2f}x' if previous else ''
+        print(f'statements {statements:>8} ({len(STATEMENT) * statements:>9} bytes): {elapsed:8.3f} s {ratio}')
+        previous = elapsed
+        statements *= 2
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+import os
+
+import pytest
+from click.testing import CliRunner
+
+from sqlint.cli import main
+from sqlint.config import Config
+from sqlint.formatter import tracer
+from sqlint.profiler import profiler
+
+SAMPLES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'samples')
+
+# values of default.ini, because user config must have all of them
+DEFAULT_VALUES = {
+    'max_line_length': 128,
+    'comma_position': 'head',
+    'keyword_style': 'lower',
+    'indent_steps': 4,
+}
+
+
+@pytest.fixture
+def make_config(tmp_path):
+    """Returns function making Config from given values of [sqlint] section"""
+
+    def _make_config(**values) -> Config:
+        path = tmp_path / 'setup.cfg'
+        values = dict(DEFAULT_VALUES, **values)
+        lines = ['[sqlint]'] + [f'{name.replace("_", "-")} = {value}' for name, value in values.items()]
+        path.write_text('\n'.join(lines) + '\n')
+
+        return Config(str(path))
+
+    return _make_config
+
+
+@pytest.fixture
+def sample_sql():
+    """Returns function reading a sql file in tests/samples"""
+
+    def _sample_sql(name: str) -> str:
+        with open(os.path.join(SAMPLES_DIR, name)) as fp:
+            return fp.read()
+
+    return _sample_sql
+
+
+@pytest.fixture
+def run_cli():
+    """Returns function invoking sqlint command with given arguments"""
+
+    def _run_cli(args):
+        try:
+            return CliRunner().invoke(main, args)
+        finally:
+            # profiler and tracer are shared in the process
+            profiler.disable()
+            profiler.reset()
+            tracer.disable()
+            tracer.reset()
+
+    return _run_cli
@@ -0,0 +1,85 @@
+import json
+
+import pytest
+
+from sqlint.baseline import Baseline, fingerprint
+from sqlint.checker import check
+from sqlint.syntax_tree import SyntaxTree
+
+SQL = """select
+    if( a > 10, 0, 1 ) as x
+from
+    test_table as t1
+"""
+
+
+def _fingerprints(sql, config):
+    return fingerprint(sorted(check(SyntaxTree.sqlptree(sql), config)))
+
+
+def _violations(output):
+    return [json.loads(line) for line in output.splitlines()]
+
+
+def test_fingerprint_is_stable_when_lines_are_shifted(make_config):
+    config = make_config()
+
+    fingerprints = _fingerprints(SQL, config)
+
+    assert len(fingerprints) == 2
+    assert len(set(fingerprints)) == 2
+    assert _fingerprints('\n-- comment\n' + SQL, config) == fingerprints
+
+
+def test_baseline_is_saved_and_loaded(tmp_path):
+    path = str(tmp_path / 'baseline.bin')
+    baseline = Baseline()
+    baseline.add('a.sql', [{'fingerprint': 'f1'}, {'fingerprint': 'f2'}])
+    baseline.save(path)
+
+    loaded = Baseline.load(path)
+
+    assert loaded.keys == baseline.keys
+    assert loaded.filter('a.sql', [{'fingerprint': 'f1'}, {'fingerprint': 'f3'}]) == [{'fingerprint': 'f3'}]
+    assert loaded.filter('b.sql', [{'fingerprint': 'f1'}]) == [{'fingerprint': 'f1'}]
+
+
+def test_baseline_rejects_other_file(tmp_path):
+    path = tmp_path / 'baseline.bin'
+    path.write_bytes(b'select 1')
+
+    with pytest.raises(ValueError):
+        Baseline.load(str(path))
+
+
+def test_cli_reports_only_new_violations(tmp_path, run_cli):
+    sql_file = tmp_path / 'query.sql'
+    sql_file.write_text(SQL)
+    baseline_file = str(tmp_path / 'baseline.bin')
+
+    run_cli(['--baseline', baseline_file, '--write-baseline', str(sql_file)])
+    assert run_cli(['--baseline', baseline_file, '--output-format', 'jsonl', str(sql_file)]).output == ''
+
+    sql_file.write_text(SQL.replace('test_table', 'test_table( b )'))
+    violations = _violations(run_cli(['--baseline', baseline_file, '--output-format', 'jsonl', str(sql_file)]).output)
+    assert [v['code'] for v in violations] == ['E204', 'E205']
+    assert all(v['line'] == 4 for v in violations)
+
+
+def test_cli_reports_missing_baseline_file(tmp_path, run_cli):
+    result = run_cli(['--baseline', str(tmp_path / 'missing.bin'), str(tmp_path / 'query.sql')])
+
+    assert result.exit_code == 2
+    assert 'failed to load baseline file' in result.output
+
+
+def test_cli_does_not_apply_baseline_without_option(tmp_path, run_cli):
+    sql_file = tmp_path / 'query.sql'
+    sql_file.write_text(SQL)
+    profile_json = str(tmp_path / 'profile.json')
+
+    run_cli(['--profile-json', profile_json, str(sql_file)])
+
+    with open(profile_json) as fp:
+        stats = json.load(fp)
+    assert not [key for key in stats['timers'] if key.startswith('baseline')]
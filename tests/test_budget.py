@@ -0,0 +1,75 @@
+import os
+from collections import Counter
+
+import pytest
+
+from sqlint.checker import Budget, check
+from sqlint.syntax_tree import SyntaxTree
+
+from .conftest import SAMPLES_DIR
+
+SAMPLES = [os.path.join(SAMPLES_DIR, f'query{i:03}.sql') for i in range(1, 13)]
+
+
+def _files(output):
+    return [line.split(' (L')[0] for line in output.splitlines()]
+
+
+def test_budget_is_exhausted_by_max_violations():
+    budget = Budget(max_violations=3)
+
+    assert not budget.spend(2)
+    assert budget.spend(1)
+    assert budget.is_cancelled
+
+
+def test_unlimited_budget_is_only_cancelled_by_caller():
+    budget = Budget()
+
+    assert not budget.spend(1000)
+    budget.cancel()
+    assert budget.is_cancelled
+
+
+def test_budget_rejects_non_positive_max_violations():
+    with pytest.raises(ValueError, match='>= 1'):
+        Budget(max_violations=0)
+
+
+def test_check_stops_after_max_violations(make_config, sample_sql):
+    sql = sample_sql('query008.sql') + sample_sql('query005.sql')
+    violations = [v.to_dict() for v in check(SyntaxTree.sqlptree(sql), make_config())]
+    assert len(violations) > 2
+
+    budget = Budget(max_violations=2)
+    assert [v.to_dict() for v in check(SyntaxTree.sqlptree(sql), make_config(), budget)] == violations[:2]
+    assert budget.is_cancelled
+
+
+def test_cli_fail_fast_stops_at_first_violation(run_cli):
+    result = run_cli(['--fail-fast'] + SAMPLES)
+
+    assert result.exit_code == 1
+    assert _files(result.output) == [SAMPLES[0]]
+
+
+def test_cli_max_violations_stops_each_file_after_n_violations(run_cli):
+    all_violations = Counter(_files(run_cli(SAMPLES).output))
+    assert max(all_violations.values()) > 1
+
+    result = run_cli(['--max-violations', '1'] + SAMPLES)
+
+    assert result.exit_code == 1
+    assert Counter(_files(result.output)) == {f: 1 for f in all_violations}
+
+
+def test_cli_gating_exits_with_zero_without_violations(run_cli, tmp_path):
+    sql_file = tmp_path / 'query.sql'
+    sql_file.write_text('select\n    a\nfrom\n    t1\n')
+
+    result = run_cli(['--fail-fast', str(sql_file)])
+
+    assert result.exit_code == 0
+    assert result.output == ''
+    assert run_cli(['--max-violations', '1', str(sql_file)]).exit_code == 0
+    assert run_cli([str(SAMPLES[0])]).exit_code == 0
@@ -0,0 +1,156 @@
+import io
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlint.cache import ResultCache
+from sqlint.cli import _compare_file
+from sqlint.formatter import write_file
+from sqlint.syntax_tree import SyntaxTree
+
+SQL = 'select a from t1\n'
+
+
+def _cache(cache_dir, config, plugins=None):
+    return ResultCache(str(cache_dir), config, rules=['CommaChecker'], plugins=plugins)
+
+
+def _set_mtime(path, mtime):
+    os.utime(str(path), (mtime, mtime))
+
+
+def test_get_returns_stored_result(tmp_path, make_config):
+    cache = _cache(tmp_path, make_config())
+    key = cache.key(SQL, 'check')
+
+    assert cache.get(key) is None
+    cache.put(key, {'violations': []})
+
+    assert cache.get(key) == {'violations': []}
+    assert cache.get(cache.key(SQL, 'format')) is None
+    assert cache.get(cache.key(SQL + '\n', 'check')) is None
+
+
+def test_key_changes_with_config_rules_and_plugins(tmp_path, make_config):
+    key = _cache(tmp_path, make_config()).key(SQL, 'check')
+
+    assert _cache(tmp_path, make_config()).key(SQL, 'check') == key
+    assert _cache(tmp_path, make_config(max_line_length=80)).key(SQL, 'check') != key
+    assert ResultCache(str(tmp_path), make_config(), rules=[]).key(SQL, 'check') != key
+
+    plugin_key = _cache(tmp_path, make_config(), plugins=['sqlint-shop==1.0.0']).key(SQL, 'check')
+    assert plugin_key != key
+    assert _cache(tmp_path, make_config(), plugins=['sqlint-shop==1.0.1']).key(SQL, 'check') != plugin_key
+
+
+def test_broken_entry_is_treated_as_miss_and_overwritten(tmp_path, make_config):
+    cache = _cache(tmp_path, make_config())
+    key = cache.key(SQL, 'check')
+    cache.put(key, {'violations': []})
+    path = tmp_path / key[0:2] / f'{key}.json'
+    path.write_text('{"violations": [')
+
+    assert cache.get(key) is None
+
+    cache.put(key, {'violations': [1]})
+    assert cache.get(key) == {'violations': [1]}
+
+
+def test_concurrent_writes_leave_complete_entry(tmp_path, make_config):
+    cache = _cache(tmp_path, make_config())
+    key = cache.key(SQL, 'check')
+    values = [{'violations': [i] * 1000} for i in range(50)]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda value: (cache.put(key, value), cache.get(key)), values))
+
+    assert cache.get(key) in values
+    assert os.listdir(str(tmp_path / key[0:2])) == [f'{key}.json']
+
+
+def test_prune_removes_old_and_least_recently_used_entries(tmp_path, make_config):
+    cache = _cache(tmp_path, make_config())
+    keys = [cache.key(f'select {i}', 'check') for i in range(3)]
+    now = time.time()
+    for i, key in enumerate(keys):
+        cache.put(key, {'violations': 'x' * 100})
+        _set_mtime(tmp_path / key[0:2] / f'{key}.json', now - (3 - i) * 60)
+
+    cache.prune(max_age=150, max_size=10 ** 6)
+    assert [cache.get(key) is not None for key in keys] == [False, True, True]
+
+    cache.prune(max_age=150, max_size=150)
+    assert cache.get(keys[2]) is not None
+    assert cache.get(keys[1]) is None
+
+
+def test_prune_keeps_files_which_are_not_entries(tmp_path, make_config):
+    cache = _cache(tmp_path, make_config())
+    key = cache.key(SQL, 'check')
+    cache.put(key, {'violations': []})
+    foreign = [
+        tmp_path / 'notes.txt',
+        tmp_path / 'sub' / 'keep.sql',
+        tmp_path / key[0:2] / 'keep.sql',
+        tmp_path / key[0:2] / 'tmpabc123.tmp',
+    ]
+    for path in foreign:
+        path.parent.mkdir(exist_ok=True)
+        path.write_text(SQL)
+        _set_mtime(path, 1577836800)  # 2020-01-01
+    _set_mtime(tmp_path / key[0:2] / f'{key}.json', 1577836800)
+
+    cache.prune(max_age=60, max_size=0)
+
+    assert all(path.exists() for path in foreign)
+    assert cache.get(key) is None
+
+
+def test_cli_uses_cached_result(tmp_path, run_cli):
+    sql_file = tmp_path / 'query.sql'
+    sql_file.write_text('select\n    a ,b\nfrom\n    t1\n')
+    cache_dir = str(tmp_path / 'cache')
+    profile_json = str(tmp_path / 'profile.json')
+    args = ['--cache-dir', cache_dir, '--output-format', 'jsonl', '--profile-json', profile_json, str(sql_file)]
+
+    first = run_cli(args).output
+    second = run_cli(args).output
+
+    assert first == second
+    assert len(first.splitlines()) > 0
+    with open(profile_json) as fp:
+        assert json.load(fp)['counters']['cache.hit'] == 1
+
+
+def test_formatted_file_is_skipped_until_content_or_config_changes(tmp_path, make_config, monkeypatch):
+    parsed = []
+    sqlptree = SyntaxTree.sqlptree
+
+    def _sqlptree(sql, *args, **kwargs):
+        parsed.append(sql)
+        return sqlptree(sql, *args, **kwargs)
+
+    monkeypatch.setattr(SyntaxTree, 'sqlptree', _sqlptree)
+
+    config = make_config()
+    formatted = io.StringIO()
+    write_file(sqlptree(SQL, is_abstract=True), config, formatted)
+    sql_file = tmp_path / 'query.sql'
+    sql_file.write_text(formatted.getvalue())
+    task = (str(sql_file), config, False, _cache(tmp_path / 'cache', config))
+
+    # formatted file is recorded, and then it is not parsed any more
+    assert _compare_file(task) == (str(sql_file), False, [])
+    assert _compare_file(task) == (str(sql_file), False, [])
+    assert len(parsed) == 1
+
+    sql_file.write_text('select\n    a ,b\nfrom\n    t1\n')
+    assert _compare_file(task)[1] is True
+    assert len(parsed) == 2
+
+    sql_file.write_text(formatted.getvalue())
+    config = make_config(keyword_style='upper-all')
+    task = (str(sql_file), config, False, _cache(tmp_path / 'cache', config))
+    assert _compare_file(task)[1] is True
+    assert len(parsed) == 3
@@ -0,0 +1,138 @@
+import json
+import os
+
+import pytest
+
+from .conftest import SAMPLES_DIR
+from sqlint.cli import _format_file_in_place
+
+
+def _samples(*names):
+    return [os.path.join(SAMPLES_DIR, name) for name in names]
+
+
+def test_profile_aggregates_stats_of_workers_in_check_mode(tmp_path, run_cli):
+    profile_json = str(tmp_path / 'profile.json')
+    files = _samples('query001.sql', 'query002.sql', 'query003.sql', 'query004.sql')
+
+    run_cli(['--profile', '--profile-json', profile_json, '-j', '2', '--check'] + files)
+
+    with open(profile_json) as fp:
+        stats = json.load(fp)
+    assert stats['counters']['files'] == 4
+    assert stats['timers']['read']['calls'] == 4
+    assert stats['timers']['format.lines']['calls'] > 0
+
+
+def test_profile_aggregates_stats_of_workers_in_format_mode(tmp_path, sample_sql, run_cli):
+    sql_file = tmp_path / 'statements.sql'
+    sql_file.write_text(';\n'.join([sample_sql('query001.sql')] * 20) + ';\n')
+    profile_json = str(tmp_path / 'profile.json')
+
+    result = run_cli(['--profile', '--profile-json', profile_json, '-j', '2', '-f', str(sql_file)])
+
+    with open(profile_json) as fp:
+        stats = json.load(fp)
+    assert stats['timers']['format.lines']['calls'] > 1
+    assert stats['timers']['format.lines']['time_ns'] > 0
+    assert stats['counters']['lines'] > 0
+    assert result.output == run_cli(['-f', str(sql_file)]).output
+
+
+def test_formatted_output_passes_check(tmp_path, run_cli):
+    # formatting query002.sql again changes it, because formatter is not idempotent for some statements yet
+    for i, sample in enumerate(_samples('query001.sql', 'query003.sql', 'query004.sql')):
+        formatted = run_cli(['-f', sample]).output
+        sql_file = tmp_path / f'formatted{i}.sql'
+        sql_file.write_text(formatted)
+
+        assert run_cli(['--check', str(sql_file)]).exit_code == 0
+        assert run_cli(['--diff', str(sql_file)]).output == ''
+        assert run_cli(['-f', str(sql_file)]).output == formatted
+
+
+def test_check_reports_output_without_newline_at_end(tmp_path, run_cli):
+    formatted = run_cli(['-f', _samples('query001.sql')[0]]).output
+    sql_file = tmp_path / 'formatted.sql'
+    sql_file.write_text(formatted.rstrip('\n'))
+
+    assert run_cli(['--check', str(sql_file)]).exit_code == 1
+    assert '\\ No newline at end of file' in run_cli(['--diff', str(sql_file)]).output
+
+
+def test_in_place_writes_formatted_output(tmp_path, run_cli):
+    sample = _samples('query001.sql')[0]
+    sql_file = tmp_path / 'query.sql'
+    with open(sample) as fp:
+        sql_file.write_text(fp.read())
+    os.chmod(str(sql_file), 0o640)
+
+    result = run_cli(['--in-place', str(sql_file)])
+
+    assert result.exit_code == 0
+    assert sql_file.read_text() == run_cli(['-f', sample]).output
+    assert os.stat(str(sql_file)).st_mode & 0o7777 == 0o640
+    # temporary file is replaced with the file
+    assert sorted(os.listdir(str(tmp_path))) == ['query.sql']
+
+
+def test_in_place_does_not_touch_formatted_file(tmp_path, run_cli):
+    sql_file = tmp_path / 'query.sql'
+    sql_file.write_text(run_cli(['-f', _samples('query001.sql')[0]]).output)
+    os.utime(str(sql_file), (0, 0))
+
+    run_cli(['--in-place', str(sql_file)])
+
+    assert os.stat(str(sql_file)).st_mtime == 0
+    assert run_cli(['--check', str(sql_file)]).exit_code == 0
+
+
+def test_in_place_removes_temporary_file_on_failure(tmp_path, monkeypatch, make_config):
+    sample = _samples('query001.sql')[0]
+    config = make_config()
+    sql_file = tmp_path / 'query.sql'
+    with open(sample) as fp:
+        sql = fp.read()
+    sql_file.write_text(sql)
+
+    def _replace(src, dst):
+        raise OSError('failed to replace')
+
+    monkeypatch.setattr(os, 'replace', _replace)
+    with pytest.raises(OSError):
+        _format_file_in_place((str(sql_file), config, None))
+
+    assert sql_file.read_text() == sql
+    assert not [name for name in os.listdir(str(tmp_path)) if name.endswith('.tmp')]
+
+
+def test_trace_lists_splitter_decisions(tmp_path, run_cli):
+    sql_file = tmp_path / 'query.sql'
+    sql_file.write_text('select a, b from t1 where a > 1;\n')
+    trace_json = str(tmp_path / 'trace.json')
+
+    result = run_cli(['-f', '--trace-format', trace_json, str(sql_file)])
+
+    with open(trace_json) as fp:
+        events = json.load(fp)['traces'][str(sql_file)]
+    assert [(event['splitter'], event['line']) for event in events if event['event'] == 'split'] == [
+        ('KeywordSplitter', 'select'),
+        ('IdentifierSplitter', 'a'),
+        ('CommaSplitter', ', b'),
+        ('KeywordSplitter', 'from'),
+        ('IdentifierSplitter', 't1'),
+        ('KeywordSplitter', 'where'),
+        ('IdentifierSplitter', 'a > 1;'),
+    ]
+    assert result.output == run_cli(['-f', str(sql_file)]).output
+
+
+def test_trace_does_not_change_formatted_output(tmp_path, run_cli):
+    trace_json = str(tmp_path / 'trace.json')
+
+    for sample in _samples('query001.sql', 'query002.sql', 'query003.sql', 'query004.sql'):
+        for args in [['-f'], ['-f', '--stream']]:
+            traced = run_cli(args + ['--trace-format', trace_json, sample])
+
+            assert traced.exit_code == 0
+            assert traced.output == run_cli(args + [sample]).output
@@ -0,0 +1,144 @@
+import io
+import sys
+import weakref
+
+import pytest
+
+from sqlint.formatter import base, Emitter
+from sqlint.formatter import format as format_tree
+from sqlint.formatter import write
+from sqlint.formatter.formatter import BlankLineFormatter
+from sqlint.parser import Token
+from sqlint.syntax_tree import SyntaxTree
+
+MULTI_STATEMENTS = """CREATE TABLE foo (id INT, name VARCHAR(10));
+INSERT INTO foo VALUES (1, 'a'), (2, 'b');
+INSERT INTO foo (id, name) VALUES (3, 'c');
+"""
+
+
+def _format(sql, config) -> str:
+    return format_tree(SyntaxTree.sqlptree(sql, is_abstract=True), config).sqlftree()
+
+
+def test_long_line_is_not_joined_across_statements(make_config):
+    config = make_config(keyword_style='upper-head', indent_steps=4, comma_position='head', max_line_length=40)
+
+    assert _format(MULTI_STATEMENTS, config) == (
+        "Create\n"
+        "TABLE\n"
+        "\n"
+        "foo\n"
+        "\n"
+        "(id INT, name VARCHAR(10)) ;\n"
+        "INSERT\n"
+        "\n"
+        "Into foo VALUES(1, 'a')\n"
+        ", (2, 'b') ;\n"
+        "INSERT\n"
+        "\n"
+        "Into foo(id, name) VALUES(3, 'c') ;\n")
+
+
+def test_long_line_is_broken_within_max_line_length(make_config):
+    config = make_config(max_line_length=40)
+    sql = 'select ' + ' + '.join(f'f(c{i})' for i in range(20)) + ' from t;\n'
+
+    formatted = _format(sql, config)
+
+    assert all(len(line) <= 40 for line in formatted.splitlines())
+    assert formatted.split() == _format(formatted, config).split()
+
+
+def test_write_is_same_as_format(make_config, sample_sql):
+    config = make_config(max_line_length=40)
+    for name in ['query001.sql', 'query005.sql', 'query010.sql']:
+        sql = sample_sql(name)
+        stream = io.StringIO()
+        write(SyntaxTree.sqlptree(sql, is_abstract=True), config, stream)
+
+        assert stream.getvalue() == _format(sql, config)
+
+
+def test_minified_statements_are_reshaped_without_recursion(make_config):
+    statement = 'select a, b from t1 inner join t2 on t1.id = t2.id where a > 1; '
+    config = make_config()
+    expected = _format(statement, config)
+
+    # each statement is reshaped into more leaves than the limit
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(200)
+    try:
+        formatted = _format(statement * 2000, config)
+    finally:
+        sys.setrecursionlimit(limit)
+
+    assert formatted.count('\n') == expected.count('\n') * 2000
+    assert formatted[:len(expected) * 3] == expected * 3
+
+
+def test_write_releases_emitted_leaves(make_config, monkeypatch):
+    statement = 'select a, b from t1 where a > 1;\n'
+    emitted = []
+
+    class RecordingEmitter(Emitter):
+        def write_leaf(self, leaf):
+            super().write_leaf(leaf)
+            if leaf.tokens:
+                emitted.append((weakref.ref(leaf), self.stream.getvalue()))
+            # leaves emitted before the previous one must have been released
+            assert all(ref() is None for ref, _ in emitted[:-2])
+
+    monkeypatch.setattr(base, 'Emitter', RecordingEmitter)
+    stream = io.StringIO()
+    write(SyntaxTree.sqlptree(statement * 100, is_abstract=True), make_config(), stream)
+
+    # lines are written while the rest of tokens are still being formatted
+    assert len(emitted) > 100
+    expected = _format(statement * 100, make_config())
+    assert expected.startswith(emitted[0][1])
+    assert len(emitted[0][1]) < len(expected) // 100
+    assert stream.getvalue() == expected
+
+
+@pytest.mark.parametrize('keyword_style, expected', [
+    ('lower', ['inner join t2', 'left outer join t3', 'right outer join t4', 'cross join t5', 'full outer join t6']),
+    ('upper-all', ['INNER JOIN t2', 'LEFT OUTER JOIN t3', 'RIGHT OUTER JOIN t4', 'CROSS JOIN t5', 'FULL OUTER JOIN t6']),
+])
+def test_join_is_formatted_with_inner_or_outer(make_config, keyword_style, expected):
+    sql = ('select a from t1 join t2 on t1.id = t2.id left join t3 on t1.id = t3.id '
+           'right join t4 on t1.id = t4.id cross join t5 full outer join t6 on t1.id = t6.id')
+
+    lines = [line.strip() for line in _format(sql, make_config(keyword_style=keyword_style)).splitlines()]
+
+    assert [line for line in lines if line.upper().endswith(('T2', 'T3', 'T4', 'T5', 'T6'))] == expected
+
+
+def test_blank_line_is_inserted_after_with_sequence(make_config):
+    sql = 'with x as (select a from t1), y as (select b from t2) select a from x'
+
+    assert _format(sql, make_config()).endswith(
+        ', y as (\n'
+        '    select\n'
+        '        b\n'
+        '    from\n'
+        '        t2\n'
+        ')\n'
+        '\n'
+        'select\n'
+        '    a\n'
+        'from\n'
+        '    x\n'
+    )
+
+
+def test_insert_blanks_inserts_blank_after_flagged_leaves_and_at_end():
+    root = SyntaxTree(depth=0, line_num=0)
+    leaves = [SyntaxTree(depth=1, line_num=i + 1, tokens=[Token(word=f't{i}', kind=Token.IDENTIFIER)])
+              for i in range(4)]
+    root.leaves.extend(leaves)
+
+    # the flag of the last leaf is ignored, because a blank line is at end anyway
+    BlankLineFormatter.insert_blanks(root, [True, False, True, True])
+
+    assert [leaf.tokens[0].word if leaf.tokens else '' for leaf in root.leaves] == ['t0', '', 't1', 't2', '', 't3', '']
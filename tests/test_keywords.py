@@ -0,0 +1,30 @@
+import pytest
+
+from sqlint.parser.keywords import format as format_keyword, KEYWORD_STYLES, RESERVED_FUNCTIONS, RESERVED_KEYWORDS
+
+
+def _format_without_table(keyword: str, keyword_style: str) -> str:
+    """format() before reserved keywords were looked up in tables"""
+    expected: str = keyword
+
+    if keyword_style == 'lower':
+        expected = keyword.lower()
+    if keyword_style == 'upper-all':
+        expected = keyword.upper()
+    if keyword_style == 'upper-head':
+        expected = f'{keyword[0].upper()}{keyword[1:].lower()}'
+
+    return expected
+
+
+def _written(keyword: str):
+    """keyword written in each style and mixed case"""
+    mixed = ''.join(c.upper() if i % 2 else c.lower() for i, c in enumerate(keyword))
+    return sorted({keyword.lower(), keyword.upper(), keyword.capitalize(), mixed})
+
+
+@pytest.mark.parametrize('keyword_style', KEYWORD_STYLES + ['unknown'])
+@pytest.mark.parametrize('keyword', RESERVED_KEYWORDS + RESERVED_FUNCTIONS + ['not_reserved'])
+def test_format_is_same_as_format_without_table(keyword, keyword_style):
+    for written in _written(keyword):
+        assert format_keyword(written, keyword_style) == _format_without_table(written, keyword_style)
@@ -0,0 +1,120 @@
+import io
+import json
+
+import pytest
+
+from sqlint.checker import check, check_stream, plugin, register
+from sqlint.checker import PluginCode, Prefilter, TokenLocalChecker, Violation
+from sqlint.parser import Token
+from sqlint.reporter import get_reporter
+from sqlint.syntax_tree import SyntaxTree
+
+BANNED_FUNCTION = PluginCode('BANNED_FUNCTION', 'X101', 'function is banned: {actual}')
+SQL = 'select\n    now()\nfrom\n    t1\n'
+
+
+class BannedFunctionChecker(TokenLocalChecker):
+    codes = [BANNED_FUNCTION]
+    token_kinds = (Token.IDENTIFIER, Token.FUNCTION)
+    prefilter = Prefilter(words=['NOW'], codes=[BANNED_FUNCTION])
+
+    @staticmethod
+    def prepare(config, suppressions, index=None):
+        return {'suppressions': suppressions}
+
+    @staticmethod
+    def check_line(node, state):
+        if state['suppressions'].is_suppressed(BANNED_FUNCTION.code, node.line_num):
+            return []
+        return [Violation(node, idx, BANNED_FUNCTION, actual=token.word)
+                for idx, token in enumerate(node.tokens) if token.word.upper().startswith('NOW')]
+
+
+class ReusedCodeChecker(BannedFunctionChecker):
+    codes = [PluginCode('REUSED', 'E101', 'reused code')]
+
+
+class FakeEntryPoint:
+    def __init__(self, name, value):
+        self.name = name
+        self.value = value
+
+    def load(self):
+        if isinstance(self.value, Exception):
+            raise self.value
+        return self.value
+
+
+@pytest.fixture
+def entry_points(monkeypatch):
+    """Returns function replacing entry points of plugins, which are loaded again"""
+
+    def _entry_points(*eps):
+        monkeypatch.setattr(plugin, '_plugins', None)
+        monkeypatch.setattr(plugin, '_iter_entry_points', lambda group: list(eps))
+
+    yield _entry_points
+    # plugins are loaded again from actual entry points
+    plugin._plugins = None
+
+
+def _codes(sql, config):
+    return [v.code.code for v in check(SyntaxTree.sqlptree(sql), config)]
+
+
+def test_plugin_checker_is_loaded_from_entry_point(entry_points, make_config):
+    entry_points(FakeEntryPoint('banned_function', BannedFunctionChecker))
+
+    assert plugin.load_plugins() == [BannedFunctionChecker]
+    assert BANNED_FUNCTION in plugin.get_codes()
+    assert _codes(SQL, make_config()) == ['X101']
+    assert [v.code.code for vs in check_stream(io.StringIO(SQL), make_config()) for v in vs] == ['X101']
+
+
+def test_plugin_code_is_suppressed_by_comment(entry_points, make_config):
+    entry_points(FakeEntryPoint('banned_function', BannedFunctionChecker))
+
+    assert _codes(SQL.replace('now()', 'now()  -- sqlint: disable=X101'), make_config()) == []
+
+
+def test_plugin_code_is_listed_as_sarif_rule(entry_points):
+    entry_points(FakeEntryPoint('banned_function', BannedFunctionChecker))
+    stream = io.StringIO()
+    reporter = get_reporter('sarif', stream)
+    reporter.start()
+    reporter.finish()
+
+    rules = json.loads(stream.getvalue())['runs'][0]['tool']['driver']['rules']
+    assert {'id': 'X101', 'name': 'BANNED_FUNCTION', 'shortDescription': {'text': BANNED_FUNCTION.template}} in rules
+
+
+def test_broken_plugin_is_skipped(entry_points, make_config):
+    entry_points(
+        FakeEntryPoint('broken', ImportError('No module named sqlint_broken')),
+        FakeEntryPoint('not_checker', object),
+        FakeEntryPoint('banned_function', BannedFunctionChecker))
+
+    assert plugin.load_plugins() == [BannedFunctionChecker]
+    assert _codes(SQL, make_config()) == ['X101']
+
+
+def test_plugin_reusing_existing_code_is_skipped(entry_points):
+    entry_points(
+        FakeEntryPoint('reused', ReusedCodeChecker),
+        FakeEntryPoint('banned_function', BannedFunctionChecker),
+        FakeEntryPoint('banned_function_again', type('Again', (BannedFunctionChecker,), {})))
+
+    assert plugin.load_plugins() == [BannedFunctionChecker]
+    with pytest.raises(ValueError, match='E101'):
+        register(ReusedCodeChecker)
+
+
+def test_register_adds_checker_once(entry_points):
+    entry_points()
+
+    register(BannedFunctionChecker)
+    register(BannedFunctionChecker)
+
+    assert plugin.load_plugins() == [BannedFunctionChecker]
+    with pytest.raises(TypeError):
+        register(object)
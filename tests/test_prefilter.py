@@ -0,0 +1,72 @@
+from sqlint.checker import check, Prefilter, SourceIndex
+from sqlint.checker.violation import Code
+from sqlint.parser import Token
+from sqlint.profiler import profiler
+from sqlint.syntax_tree import SyntaxTree
+
+SQL_WITHOUT_JOIN = """select
+    a
+    , b
+from
+    test_table as t1
+"""
+
+SQL_WITH_JOIN = """select
+    a
+from
+    test_table as t1
+    join test_table2 as t2
+        on t1.id = t2.id
+"""
+
+
+def _index(sql):
+    return SourceIndex(SyntaxTree.sqlptree(sql))
+
+
+def _codes(sql, config):
+    return [v.code.code for v in sorted(check(SyntaxTree.sqlptree(sql), config))]
+
+
+def test_prefilter_matches_words_case_insensitively():
+    prefilter = Prefilter(words=['JOIN'])
+
+    assert prefilter.match(_index(SQL_WITH_JOIN))
+    assert not prefilter.match(_index(SQL_WITHOUT_JOIN))
+
+
+def test_prefilter_matches_token_kinds():
+    assert Prefilter(kinds=[Token.COMMA]).match(_index(SQL_WITHOUT_JOIN))
+    assert not Prefilter(kinds=[Token.OPERATOR]).match(_index(SQL_WITHOUT_JOIN))
+
+
+def test_prefilter_does_not_match_codes_suppressed_in_whole_file():
+    prefilter = Prefilter(codes=[Code.COMMA_HEAD, Code.COMMA_END])
+
+    assert prefilter.match(_index(SQL_WITHOUT_JOIN))
+    assert not prefilter.match(_index('-- sqlint: disable=E301,E302\n' + SQL_WITHOUT_JOIN))
+    assert prefilter.match(_index('-- sqlint: disable=E301\n' + SQL_WITHOUT_JOIN))
+
+
+def test_check_skips_rules_which_cannot_match(make_config):
+    profiler.enable()
+    try:
+        check(SyntaxTree.sqlptree(SQL_WITHOUT_JOIN), make_config())
+        counters = dict(profiler.counters)
+    finally:
+        profiler.disable()
+        profiler.reset()
+
+    assert counters['skip.JoinChecker'] == 1
+    assert 'skip.CommaChecker' not in counters
+
+
+def test_prefilters_do_not_change_violations(make_config, sample_sql, monkeypatch):
+    config = make_config()
+    names = [f'query{i:03}.sql' for i in range(1, 13)]
+    expected = [_codes(sample_sql(name), config) for name in names]
+    assert any(expected)
+
+    monkeypatch.setattr(Prefilter, 'match', lambda self, index: True)
+
+    assert [_codes(sample_sql(name), config) for name in names] == expected
@@ -0,0 +1,108 @@
+import io
+import json
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from sqlint import __version__
+from sqlint.reporter import get_reporter
+
+VIOLATIONS = [
+    {'line': 3, 'pos': 8, 'code': 'E207', 'message': 'whitespace must be before binary operator: b+',
+     'fingerprint': '0123456789abcdef'},
+    {'line': 5, 'pos': 1, 'code': 'E403', 'message': 'a <"quoted"> & \'escaped\' message \\ é', },
+]
+FILE = 'dir\\a&b "c".sql'
+
+
+def _report(output_format, files):
+    stream = io.StringIO()
+    reporter = get_reporter(output_format, stream)
+    reporter.start()
+    for file, violations in files:
+        reporter.report(file, violations)
+    reporter.finish()
+
+    return stream.getvalue()
+
+
+def test_text_reporter():
+    assert _report('text', [(FILE, VIOLATIONS[:1]), ('b.sql', [])]) == \
+        'dir\\a&b "c".sql (L3, 8): whitespace must be before binary operator: b+\n'
+
+
+def test_json_lines_reporter():
+    output = _report('jsonl', [(FILE, VIOLATIONS[:1]), ('b.sql', []), ('c.sql', VIOLATIONS[1:])])
+
+    assert output == (
+        '{"file": "dir\\\\a&b \\"c\\".sql", "line": 3, "pos": 8, "code": "E207", '
+        '"message": "whitespace must be before binary operator: b+", "fingerprint": "0123456789abcdef"}\n'
+        '{"file": "c.sql", "line": 5, "pos": 1, "code": "E403", '
+        '"message": "a <\\"quoted\\"> & \'escaped\' message \\\\ \\u00e9"}\n')
+    assert [json.loads(line)['message'] for line in output.splitlines()] == [v['message'] for v in VIOLATIONS]
+
+
+def test_sarif_reporter():
+    log = json.loads(_report('sarif', [(FILE, VIOLATIONS[:1]), ('b.sql', []), ('c.sql', VIOLATIONS[1:])]))
+
+    assert log['version'] == '2.1.0'
+    driver = log['runs'][0]['tool']['driver']
+    assert driver['name'] == 'sqlint'
+    assert driver['version'] == __version__
+    assert {'E207', 'E403'} <= {rule['id'] for rule in driver['rules']}
+    assert log['runs'][0]['results'] == [
+        {
+            'ruleId': 'E207',
+            'level': 'warning',
+            'message': {'text': 'whitespace must be before binary operator: b+'},
+            'locations': [{'physicalLocation': {
+                'artifactLocation': {'uri': 'dir/a&b "c".sql'},
+                'region': {'startLine': 3, 'startColumn': 8}}}],
+            'partialFingerprints': {'sqlint/v1': '0123456789abcdef'},
+        },
+        {
+            'ruleId': 'E403',
+            'level': 'warning',
+            'message': {'text': VIOLATIONS[1]['message']},
+            'locations': [{'physicalLocation': {
+                'artifactLocation': {'uri': 'c.sql'},
+                'region': {'startLine': 5, 'startColumn': 1}}}],
+        },
+    ]
+
+
+def test_sarif_reporter_without_violations():
+    assert json.loads(_report('sarif', []))['runs'][0]['results'] == []
+
+
+def test_checkstyle_reporter():
+    output = _report('checkstyle', [(FILE, VIOLATIONS[:1]), ('b.sql', []), ('c.sql', VIOLATIONS[1:])])
+
+    assert output == (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<checkstyle version="4.3">\n'
+        '<file name=\'dir\\a&amp;b "c".sql\'>\n'
+        '<error line="3" column="8" severity="warning" '
+        'message="whitespace must be before binary operator: b+" source="sqlint.E207"/>\n'
+        '</file>\n'
+        '<file name="c.sql">\n'
+        '<error line="5" column="1" severity="warning" '
+        'message="a &lt;&quot;quoted&quot;&gt; &amp; \'escaped\' message \\ é" source="sqlint.E403"/>\n'
+        '</file>\n'
+        '</checkstyle>\n')
+    root = ET.fromstring(output.encode('utf-8'))
+    assert [f.get('name') for f in root] == [FILE, 'c.sql']
+    assert root[1][0].get('message') == VIOLATIONS[1]['message']
+
+
+def test_checkstyle_reporter_merges_violations_of_a_file_passed_in_several_calls():
+    output = _report('checkstyle', [('a.sql', VIOLATIONS[:1]), ('a.sql', VIOLATIONS[1:])])
+
+    root = ET.fromstring(output)
+    assert len(root) == 1
+    assert [e.get('line') for e in root[0]] == ['3', '5']
+
+
+def test_unknown_output_format():
+    with pytest.raises(ValueError):
+        get_reporter('xml', io.StringIO())
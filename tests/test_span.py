@@ -0,0 +1,35 @@
+import pytest
+
+from sqlint.formatter.span import TokenSpan
+from sqlint.parser import Token
+
+
+def _tokens(*words):
+    return [Token(word=word, kind=Token.IDENTIFIER) for word in words]
+
+
+def test_slice_of_span_shares_tokens():
+    tokens = _tokens('a', 'b', 'c', 'd')
+    span = TokenSpan(tokens)
+
+    own, rest = span[0:1], span[1:]
+
+    assert rest.tokens is tokens
+    assert (own.start, own.stop) == (0, 1)
+    assert (rest.start, rest.stop) == (1, 4)
+    assert list(rest[1:]) == tokens[2:]
+    assert list(rest[2:1]) == []
+
+
+def test_span_is_indexed_relative_to_start():
+    tokens = _tokens('a', 'b', 'c', 'd')
+    span = TokenSpan(tokens, 1, 3)
+
+    assert len(span) == 2
+    assert span[0] is tokens[1]
+    assert span[-1] is tokens[2]
+    assert span.index(tokens[2]) == 1
+    with pytest.raises(IndexError):
+        span[2]
+    with pytest.raises(ValueError):
+        span.index(tokens[3])
@@ -0,0 +1,130 @@
+import io
+
+import pytest
+
+from sqlint.formatter import format_range, write, write_statements, write_stream
+from sqlint.syntax_tree import SyntaxTree
+
+STATEMENTS = """select a, b from t1;
+
+SELECT  c
+  , d from t2;
+select e from t3 where e > 1;
+"""
+
+
+def _apply(source, edits) -> str:
+    lines = source.splitlines(keepends=True)
+    for edit in reversed(edits):
+        lines[edit.start_line-1:edit.end_line-1] = edit.text.splitlines(keepends=True)
+
+    return ''.join(lines)
+
+
+def _format_range(source, config, start_line, end_line):
+    return format_range(SyntaxTree.sqlptree(source, is_abstract=True), config, source, start_line, end_line)
+
+
+def test_format_range_formats_only_statements_in_range(make_config):
+    config = make_config()
+
+    edits = _format_range(STATEMENTS, config, 4, 4)
+
+    assert all(3 <= edit.start_line and edit.end_line <= 5 for edit in edits)
+    assert _apply(STATEMENTS, edits) == (
+        "select a, b from t1;\n"
+        "\n"
+        "select\n"
+        "    c\n"
+        "    , d\n"
+        "from\n"
+        "    t2;\n"
+        "select e from t3 where e > 1;\n")
+
+
+def test_format_range_is_same_as_write_stream(make_config):
+    config = make_config()
+    stream = io.StringIO()
+    write_stream(io.StringIO(STATEMENTS), config, stream)
+
+    formatted = STATEMENTS
+    for line in [5, 3, 1]:
+        formatted = _apply(formatted, _format_range(formatted, config, line, line))
+
+    assert formatted == stream.getvalue()
+
+
+def test_format_range_expands_range_to_statements(make_config):
+    config = make_config()
+
+    edits = _format_range(STATEMENTS, config, 2, 3)
+
+    assert edits[0].start_line >= 1
+    assert _apply(STATEMENTS, edits).endswith("    t2;\nselect e from t3 where e > 1;\n")
+
+
+def test_format_range_returns_no_edits_for_formatted_statements(make_config):
+    config = make_config()
+    stream = io.StringIO()
+    write_stream(io.StringIO(STATEMENTS), config, stream)
+    formatted = stream.getvalue()
+
+    for line in range(1, len(formatted.splitlines()) + 1):
+        assert _format_range(formatted, config, line, line) == []
+
+
+def test_format_range_rejects_invalid_range(make_config):
+    with pytest.raises(ValueError):
+        _format_range(STATEMENTS, make_config(), 3, 2)
+
+
+def test_format_range_rejects_range_after_end_of_source(make_config):
+    with pytest.raises(ValueError):
+        _format_range(STATEMENTS, make_config(), 6, 6)
+
+
+def test_format_range_clamps_end_line_to_end_of_source(make_config):
+    config = make_config()
+
+    assert _format_range(STATEMENTS, config, 4, 100) == _format_range(STATEMENTS, config, 4, 5)
+
+
+def test_write_statements_in_parallel_is_same_as_write(make_config):
+    config = make_config()
+    # a statement ending with a comma, and a comment following ";"
+    sql = (STATEMENTS + 'select f, g,\nfrom t4;\nselect h from t5; -- comment\n') * 20
+
+    expected = io.StringIO()
+    write(SyntaxTree.sqlptree(sql, is_abstract=True), config, expected)
+    stream = io.StringIO()
+    write_statements(SyntaxTree.sqlptree(sql, is_abstract=True), config, stream, jobs=4)
+
+    assert stream.getvalue() == expected.getvalue()
+
+
+def test_write_stream_is_same_as_write_of_each_statement(make_config):
+    config = make_config()
+    statements = ['select a, b from t1;\n', 'SELECT  c\n  , d from t2;\n', '-- comment\nselect e from t3 where e > 1;\n',
+                  'create table t4 (id int, name varchar(10));\n', 'select f from t5\n']
+
+    expected = []
+    for statement in statements:
+        stream = io.StringIO()
+        write(SyntaxTree.sqlptree(statement, is_abstract=True), config, stream)
+        expected.append(stream.getvalue())
+    stream = io.StringIO()
+    write_stream(io.StringIO(''.join(statements)), config, stream)
+
+    assert stream.getvalue() == ''.join(expected)
+
+
+def test_write_stream_splits_rows_broken_at_top_level_comma(make_config):
+    # rows of VALUES are broken by long line splitting, and a comma is followed by "(" at top level
+    rows = [f"({i}, '{chr(ord('a') + i)}')" for i in range(15)]
+    sql = f'insert into t1 values {", ".join(rows)};\n'
+
+    stream = io.StringIO()
+    write_stream(io.StringIO(sql), make_config(), stream)
+
+    assert ''.join(stream.getvalue().split()) == ''.join(sql.split())
+    assert max(len(line) for line in stream.getvalue().splitlines()) < len(sql)
@@ -0,0 +1,37 @@
+import io
+
+import pytest
+
+from sqlint.checker import base, check, check_stream, get_checkers
+from sqlint.syntax_tree import SyntaxTree
+
+SAMPLES = [f'query{i:03}.sql' for i in range(1, 13)]
+
+
+def _key(violation):
+    return violation.line_num, violation.pos, violation.code.code
+
+
+@pytest.mark.parametrize('name', SAMPLES)
+def test_check_stream_reports_token_local_subset_of_check(make_config, sample_sql, monkeypatch, name):
+    config = make_config()
+    sql = sample_sql(name)
+    checkers = get_checkers()
+    token_local = [c for c in checkers if c.is_token_local]
+    assert 0 < len(token_local) < len(checkers)
+
+    monkeypatch.setattr(base, 'get_checkers', lambda: token_local)
+    expected = sorted(_key(v) for v in check(SyntaxTree.sqlptree(sql), config))
+    streamed = [_key(v) for violations in check_stream(io.StringIO(sql), config) for v in violations]
+
+    assert sorted(streamed) == expected
+
+
+def test_check_stream_yields_violations_line_by_line(make_config):
+    sql = 'select\n    a ,b\nfrom\n    t1  as x\n'
+
+    result = [[_key(v) for v in violations] for violations in check_stream(io.StringIO(sql), make_config())]
+
+    assert len(result) == 6
+    assert all(line == key[0] for line, violations in enumerate(result[:-1], start=1) for key in violations)
+    assert any(result[1]) and any(result[3])
@@ -0,0 +1,112 @@
+import io
+
+from sqlint.checker import check, check_stream
+from sqlint.parser import parse, SuppressionIndex, StreamingSuppressionIndex, parse_lines
+from sqlint.syntax_tree import SyntaxTree
+
+SQL = """select
+    a,b  -- sqlint: disable=E202
+    , c,d
+-- sqlint: disable-next-line
+from   t1
+where  x =  1
+-- sqlint: disable=E201
+    and  y = 2
+    and  z = 3
+-- sqlint: enable=E201
+    and  w = 4
+"""
+
+
+def _index(sql):
+    suppressions = SuppressionIndex()
+    parse(sql, suppressions)
+
+    return suppressions
+
+
+def _violations(sql, config):
+    return [(v.line_num, v.code.code) for v in sorted(check(SyntaxTree.sqlptree(sql), config))]
+
+
+def _stream_violations(sql, config):
+    return [(v.line_num, v.code.code) for violations in check_stream(io.StringIO(sql), config) for v in violations]
+
+
+def test_trailing_disable_suppresses_only_its_line():
+    suppressions = _index(SQL)
+
+    assert suppressions.is_suppressed('E202', 2)
+    assert not suppressions.is_suppressed('E202', 3)
+    assert not suppressions.is_suppressed('E201', 2)
+
+
+def test_disable_next_line_suppresses_all_codes():
+    suppressions = _index(SQL)
+
+    assert suppressions.is_suppressed('E201', 5)
+    assert suppressions.is_suppressed('E301', 5)
+    assert not suppressions.is_suppressed('E201', 6)
+
+
+def test_disable_suppresses_lines_until_enable():
+    suppressions = _index(SQL)
+
+    assert [suppressions.is_suppressed('E201', line) for line in range(6, 12)] == \
+        [False, True, True, True, True, False]
+    assert not suppressions.is_suppressed('E206', 8)
+
+
+def test_disable_without_enable_suppresses_until_end_of_file():
+    suppressions = _index('select\n-- sqlint: disable=E201\n    a\n' + '\n' * 100)
+
+    assert not suppressions.is_suppressed('E201', 1)
+    assert suppressions.is_suppressed('E201', 3)
+    assert suppressions.is_suppressed('E201', 100)
+    assert not suppressions.is_suppressed_all('E201')
+    assert _index('-- sqlint: disable=E201\nselect a\n').is_suppressed_all('E201')
+
+
+def test_directive_in_string_literal_is_ignored():
+    suppressions = _index("select\n    a\nwhere\n    b = '-- sqlint: disable'\n    and  c = 1\n")
+
+    assert not suppressions
+    assert not suppressions.is_suppressed('E201', 5)
+
+
+def test_check_skips_suppressed_violations(make_config):
+    config = make_config()
+    violations = _violations(SQL, config)
+
+    assert (2, 'E202') not in violations
+    assert (3, 'E202') in violations
+    assert (5, 'E201') not in violations
+    assert (8, 'E201') not in violations
+    assert (11, 'E201') in violations
+    assert violations == [v for v in _violations(SQL.replace('sqlint:', 'note:'), config)
+                          if not _index(SQL).is_suppressed(v[1], v[0])]
+
+
+def test_check_does_not_skip_violations_by_string_literal(make_config):
+    sql = "select\n    a\nwhere\n    x = '-- sqlint: disable'\n    and  y = 1\n"
+
+    assert (5, 'E201') in _violations(sql, make_config())
+
+
+def test_streaming_index_is_same_as_built_index(make_config):
+    streaming = StreamingSuppressionIndex()
+    lines = []
+    for line_num, _ in enumerate(parse_lines(io.StringIO(SQL), streaming), start=1):
+        lines.append([code for code in ['E201', 'E202', 'E301'] if streaming.is_suppressed(code, line_num)])
+        streaming.discard(line_num)
+
+    built = _index(SQL)
+    assert lines == [[code for code in ['E201', 'E202', 'E301'] if built.is_suppressed(code, line_num)]
+                     for line_num in range(1, len(lines) + 1)]
+
+
+def test_streaming_check_skips_suppressed_violations(make_config):
+    config = make_config()
+
+    assert (8, 'E201') not in _stream_violations(SQL, config)
+    assert (11, 'E201') in _stream_violations(SQL, config)